@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""bench_broadcast.py - Measure the latency of broadcasting a keystroke
+
+Creates terminals running cat, puts them all in one group and times
+Terminator.broadcast_key() for 1, 10 and 100 receiving terminals, both by
+replaying key events and by writing directly to the child (the
+broadcast_feed_child option).
+
+Run from the top of the source tree with a display available, e.g.:
+    xvfb-run python benchmarks/bench_broadcast.py [keystrokes]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terminatorlib.util import timer
+
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('Vte', '2.91')
+from gi.repository import Gdk, GLib, Gtk, Vte
+
+TARGETS = [1, 10, 100]
+
+def make_event(char):
+    """Build a key press event for a printable character"""
+    event = Gdk.Event.new(Gdk.EventType.KEY_PRESS)
+    event.key.keyval = Gdk.unicode_to_keyval(ord(char))
+    event.key.string = char
+    event.key.length = 1
+    event.key.state = 0
+    event.key.is_modifier = 0
+    return(event.key)
+
+def drain():
+    """Let the main loop write out everything that has been queued"""
+    while Gtk.events_pending():
+        Gtk.main_iteration_do(False)
+
+def time_broadcast(terminator, source, events):
+    """Return the mean time per broadcast keystroke in microseconds"""
+    start = timer()
+    for event in events:
+        terminator.broadcast_key(source, event)
+    elapsed = timer() - start
+    drain()
+    return(elapsed / len(events) * 1000000)
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    from terminatorlib.terminator import Terminator
+    from terminatorlib.terminal import Terminal
+
+    terminator = Terminator()
+    terminator.set_origcwd(os.getcwd())
+    terminator.groupsend = terminator.groupsend_type['group']
+    terminator.create_group('bench')
+
+    terminals = []
+    for _i in range(max(TARGETS) + 1):
+        terminal = Terminal()
+        terminal.vte.spawn_sync(Vte.PtyFlags.DEFAULT, None, ['/bin/cat'],
+                                None, GLib.SpawnFlags.DEFAULT, None, None,
+                                None)
+        terminals.append(terminal)
+    source = terminals[0]
+    source.set_group(None, 'bench')
+
+    events = [make_event(char) for char in 'terminator' * (count // 10)]
+
+    print('%d keystrokes, mean latency per keystroke' % len(events))
+    for targets in TARGETS:
+        for terminal in terminals[1:targets + 1]:
+            terminal.set_group(None, 'bench')
+        results = []
+        for feed_child in [False, True]:
+            terminator.config['broadcast_feed_child'] = feed_child
+            results.append(time_broadcast(terminator, source, events))
+        print('  %3d targets: key events %8.1f us   feed_child %8.1f us' % (
+            targets, results[0], results[1]))
+
+    terminator.config['broadcast_feed_child'] = False
+
+if __name__ == '__main__':
+    main()
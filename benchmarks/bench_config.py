@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""bench_config.py - Measure the cost of config lookups during reconfigure
+
+Builds a number of terminals and times Terminal.reconfigure() on all of them,
+once with the resolved per-profile view of ConfigBase and once with the
+original chain of section lookups patched back in.
+
+Run from the top of the source tree with a display available, e.g.:
+    xvfb-run python benchmarks/bench_config.py [terminals] [rounds]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terminatorlib.config import ConfigBase
+from terminatorlib.util import timer
+
+def chained_get_item(self, key, profile='default', plugin=None, default=None):
+    """The pre-resolved-view implementation of ConfigBase.get_item"""
+    if profile not in self.profiles:
+        profile = 'default'
+
+    if key in self.global_config:
+        return(self.global_config[key])
+    elif key in self.profiles[profile]:
+        return(self.profiles[profile][key])
+    elif key == 'keybindings':
+        return(self.keybindings)
+    elif plugin and plugin in self.plugins and key in self.plugins[plugin]:
+        return(self.plugins[plugin][key])
+    elif default:
+        return default
+    else:
+        raise KeyError('ConfigBase::get_item: unknown key %s' % key)
+
+def time_reconfigure(terminals, rounds):
+    """Return the best wall time of reconfiguring every terminal"""
+    best = None
+    for _round in range(rounds):
+        start = timer()
+        for terminal in terminals:
+            terminal.reconfigure()
+        elapsed = timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return(best)
+
+def time_lookups(config, keys, rounds):
+    """Return the best wall time of looking up every key 1000 times"""
+    best = None
+    for _round in range(rounds):
+        start = timer()
+        for _i in range(1000):
+            for key in keys:
+                config[key]
+        elapsed = timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return(best)
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    from terminatorlib.terminator import Terminator
+    from terminatorlib.terminal import Terminal
+    from terminatorlib.config import Config
+
+    terminator = Terminator()
+    terminator.set_origcwd(os.getcwd())
+    terminals = [Terminal() for _i in range(count)]
+    config = Config()
+    keys = list(config.base.profiles['default'].keys())
+
+    resolved_get_item = ConfigBase.get_item
+    results = []
+    for name, get_item in [('chained', chained_get_item),
+                           ('resolved', resolved_get_item)]:
+        ConfigBase.get_item = get_item
+        results.append((name, time_reconfigure(terminals, rounds),
+                        time_lookups(config, keys, rounds)))
+    ConfigBase.get_item = resolved_get_item
+
+    print('%d terminals, best of %d rounds' % (count, rounds))
+    for name, reconfigure, lookups in results:
+        print('  %-9s reconfigure: %8.2f ms   %d lookups: %8.2f ms' % (
+            name, reconfigure * 1000, len(keys) * 1000, lookups * 1000))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""bench_dim.py - Measure drawing speed with inactive terminals dimmed
+
+Puts a grid of terminals in a window, keeps all of them busy with output and
+counts the frames the window paints in a fixed time, once for each value of
+the inactive_dim_mode option. Every terminal but one is unfocused, so all
+but one are dimmed.
+
+Run from the top of the source tree with a display available, e.g.:
+    xvfb-run python benchmarks/bench_dim.py [panes] [seconds]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terminatorlib.util import timer
+
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('Vte', '2.91')
+from gi.repository import GLib, Gtk
+
+MODES = ['overlay', 'palette']
+LINE = b'\x1b[32mterminator\x1b[0m ' * 6 + b'\r\n'
+
+def measure(mode, panes, seconds):
+    """Return the frames per second painted with panes busy terminals"""
+    from terminatorlib.terminator import Terminator
+    from terminatorlib.terminal import Terminal
+
+    terminator = Terminator()
+    terminator.set_origcwd(os.getcwd())
+    terminator.config['inactive_dim_mode'] = mode
+
+    window = Gtk.Window()
+    window.set_default_size(1200, 900)
+    grid = Gtk.Grid(row_homogeneous=True, column_homogeneous=True)
+    window.add(grid)
+
+    columns = max(int(panes ** 0.5), 1)
+    terminals = []
+    for index in range(panes):
+        terminal = Terminal()
+        grid.attach(terminal, index % columns, index // columns, 1, 1)
+        terminals.append(terminal)
+    window.show_all()
+    for terminal in terminals:
+        terminal.vte.dim(True)
+    terminals[0].vte.dim(False)
+
+    frames = [0]
+    def on_after_paint(_clock):
+        frames[0] += 1
+
+    def on_tick():
+        for terminal in terminals:
+            terminal.vte.feed(LINE * 4)
+        return(True)
+
+    while Gtk.events_pending():
+        Gtk.main_iteration_do(False)
+    clock = window.get_frame_clock()
+    handler = clock.connect('after-paint', on_after_paint)
+    source = GLib.timeout_add(5, on_tick)
+
+    start = timer()
+    while timer() - start < seconds:
+        Gtk.main_iteration_do(True)
+    elapsed = timer() - start
+
+    GLib.source_remove(source)
+    clock.disconnect(handler)
+    window.destroy()
+    return(frames[0] / elapsed)
+
+def main():
+    """Run the benchmark"""
+    panes = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print('%d busy panes, %d dimmed, %.1fs per mode' % (panes, panes - 1,
+                                                      seconds))
+    for mode in MODES:
+        print('  %-8s %6.1f fps' % (mode, measure(mode, panes, seconds)))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""bench_keys.py - Measure the cost of looking up keybindings while typing
+
+Every key press is looked up in Keybindings before it reaches the shell, by
+the window and then by the terminal, and when broadcasting with key events
+again by every terminal it is sent to. This types a paragraph of text
+through Keybindings.lookup, with and without its cache of translated key
+events, as if to one terminal and broadcast to a number of them.
+
+Run from the top of the source tree with a display available, e.g.:
+    xvfb-run python benchmarks/bench_keys.py [broadcast terminals] [repeats]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terminatorlib.util import timer
+
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('Gdk', '3.0')
+from gi.repository import Gdk
+
+TEXT = 'The quick brown fox jumps over the lazy dog; ls -la | grep FOO\n'
+
+def make_events(keymap, text):
+    """Return a key press event for each character of text which can be
+    typed on the current keymap"""
+    events = []
+    for char in text:
+        keyval = Gdk.unicode_to_keyval(ord(char))
+        if char == '\n':
+            keyval = Gdk.KEY_Return
+        found, keys = keymap.get_entries_for_keyval(keyval)
+        if not found:
+            continue
+        event = Gdk.Event.new(Gdk.EventType.KEY_PRESS)
+        event.key.keyval = keyval
+        event.key.hardware_keycode = keys[0].keycode
+        event.key.group = keys[0].group
+        if keys[0].level == 1:
+            event.key.state = Gdk.ModifierType.SHIFT_MASK
+        events.append(event)
+    return(events)
+
+def time_typing(keybindings, events, lookups, cached, repeats):
+    """Return the mean time spent looking up each key press in
+    microseconds"""
+    start = timer()
+    for _i in range(repeats):
+        for event in events:
+            for _j in range(lookups):
+                if not cached:
+                    keybindings._cache.clear()
+                keybindings.lookup(event)
+    elapsed = timer() - start
+    return(elapsed / (repeats * len(events)) * 1000000)
+
+def main():
+    """Run the benchmark"""
+    targets = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    from terminatorlib.config import Config
+    from terminatorlib.keybindings import Keybindings
+
+    keybindings = Keybindings()
+    keybindings.configure(Config()['keybindings'])
+    events = make_events(keybindings.keymap, TEXT)
+
+    print('%d key presses, mean lookup time per key press' %
+          (repeats * len(events)))
+    # The window and the focused terminal each look every key press up, and
+    # broadcast key events are looked up again by each target terminal
+    for name, lookups in [('typing:', 2),
+                          ('broadcast to %d:' % targets, 2 + targets - 1)]:
+        results = [time_typing(keybindings, events, lookups, cached, repeats)
+                   for cached in [False, True]]
+        print('  %-18s uncached %8.2f us   cached %8.2f us' % (
+            name, results[0], results[1]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""bench_nav.py - Measure the latency of moving between panes
+
+Splits a window into a grid of terminals and moves focus around it with
+Window.navigate_terminal, as Alt+arrow does. Each move is timed using the
+window's cached layout of its visible terminals, and again with the cache
+thrown away before each move, which is how every move used to work.
+
+Run from the top of the source tree with a display available, e.g.:
+    xvfb-run python benchmarks/bench_nav.py [grid size] [moves]
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terminatorlib.util import timer
+
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('Vte', '2.91')
+from gi.repository import Gtk
+
+DIRECTIONS = ['left', 'right', 'up', 'down', 'next', 'prev']
+
+def split(maker, parent, count, vertical, make_child):
+    """Split parent into count equal parts along one axis"""
+    if count == 1:
+        make_child(parent)
+        return
+    paned = maker.make('VPaned' if vertical else 'HPaned')
+    parent.add(paned)
+    paned.ratio = float(count // 2) / count
+    split(maker, paned, count // 2, vertical, make_child)
+    split(maker, paned, count - count // 2, vertical, make_child)
+
+def build_grid(maker, window, size):
+    """Fill window with a size x size grid of terminals"""
+    def make_row(parent):
+        split(maker, parent, size, False,
+              lambda cell: cell.add(maker.make('Terminal')))
+    split(maker, window, size, True, make_row)
+
+def time_moves(window, moves, cached):
+    """Return the mean time taken by each move in microseconds"""
+    terminal = window.get_focussed_terminal()
+    elapsed = 0
+    for direction in moves:
+        if not cached:
+            window.invalidate_navigation()
+        start = timer()
+        window.navigate_terminal(terminal, direction)
+        elapsed += timer() - start
+        # Finding where focus went isn't part of the move
+        terminal = window.get_focussed_terminal() or terminal
+    return(elapsed / len(moves) * 1000000)
+
+def main():
+    """Run the benchmark"""
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    from terminatorlib.factory import Factory
+    from terminatorlib.terminator import Terminator
+
+    terminator = Terminator()
+    terminator.set_origcwd(os.getcwd())
+    maker = Factory()
+    window = maker.make('Window')
+    window.set_default_size(1600, 1200)
+    build_grid(maker, window, size)
+    window.show_all()
+    while Gtk.events_pending():
+        Gtk.main_iteration_do(False)
+    window.get_descendants()[1][0].grab_focus()
+
+    moves = [random.choice(DIRECTIONS) for _i in range(count)]
+    results = [time_moves(window, moves, cached) for cached in [False, True]]
+    print('%dx%d grid, %d moves, mean time per move' % (size, size, count))
+    print('  uncached %8.2f us   cached %8.2f us' % (results[0], results[1]))
+
+if __name__ == '__main__':
+    main()
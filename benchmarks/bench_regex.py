@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""bench_regex.py - Measure the cost of URL matching when making terminals
+
+Times creating terminals with no URL handler plugins and with every URL
+handler plugin enabled. Each is timed with the shared cache of compiled
+match regexes, and again with the cache emptied before each terminal, which
+is how every terminal used to compile its own regexes.
+
+Run from the top of the source tree with a display available, e.g.:
+    xvfb-run python benchmarks/bench_regex.py [terminals]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terminatorlib.util import timer
+
+def time_creation(count, cached):
+    """Return the mean time to make a terminal in milliseconds"""
+    from terminatorlib import regex
+    from terminatorlib.terminal import Terminal
+
+    terminals = []
+    start = timer()
+    for _i in range(count):
+        if not cached:
+            regex.MATCH_REGEX_CACHE.clear()
+            regex.MATCH_GREGEX_CACHE.clear()
+        terminals.append(Terminal())
+    elapsed = timer() - start
+    for terminal in terminals:
+        terminal.close()
+    return(elapsed / count * 1000)
+
+def set_url_plugins(enabled):
+    """Enable or disable every URL handler plugin"""
+    from terminatorlib.plugin import PluginRegistry
+
+    registry = PluginRegistry()
+    registry.load_plugins()
+    for name, plugin in registry.available_plugins.items():
+        if 'url_handler' not in plugin.capabilities:
+            continue
+        if enabled and name not in registry.instances:
+            registry.enable(name)
+        elif not enabled and name in registry.instances:
+            registry.disable(name)
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    from terminatorlib.terminator import Terminator
+
+    terminator = Terminator()
+    terminator.set_origcwd(os.getcwd())
+
+    print('%d terminals, mean time to make one' % count)
+    for plugins in [False, True]:
+        set_url_plugins(plugins)
+        results = [time_creation(count, cached) for cached in [False, True]]
+        print('  %-21s uncached %7.2f ms   cached %7.2f ms' % (
+            'all URL plugins:' if plugins else 'no URL plugins:',
+            results[0], results[1]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""bench_tree.py - Measure walks of the widget tree in a large layout
+
+Builds a window split into a number of panes and times the walks which ask
+the Factory for the type of every widget they visit: enumerate_descendants,
+get_visible_terminals and describe_layout. Each is timed with the Factory's
+terminator_type tags, and again with the module importing isinstance() the
+Factory used before them.
+
+Run from the top of the source tree with a display available, e.g.:
+    xvfb-run python benchmarks/bench_tree.py [panes] [repeats]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from terminatorlib.util import timer
+
+MODULES = {}
+
+def import_isinstance(_factory, product, classtype):
+    """Factory.isinstance as it was, looking the class up by module"""
+    from terminatorlib.factory import Factory
+    type_key = 'terminatorlib.%s' % Factory.types[classtype]
+    if type_key not in MODULES:
+        MODULES[type_key] = __import__(type_key, None, None, [''])
+    return(isinstance(product, getattr(MODULES[type_key], classtype)))
+
+def import_type(factory, product):
+    """Factory.type as it was, trying each type in turn"""
+    for atype in factory.types:
+        if atype in ['Container', 'Paned']:
+            continue
+        if factory.isinstance(product, atype):
+            return(atype)
+    return(None)
+
+def build(maker, parent, panes, vertical=False):
+    """Split parent into panes terminals"""
+    if panes == 1:
+        parent.add(maker.make('Terminal'))
+        return
+    paned = maker.make('VPaned' if vertical else 'HPaned')
+    parent.add(paned)
+    build(maker, paned, panes // 2, not vertical)
+    build(maker, paned, panes - panes // 2, not vertical)
+
+def time_walks(window, repeats):
+    """Return the mean time of each walk in milliseconds"""
+    from terminatorlib.util import enumerate_descendants
+
+    walks = [('enumerate_descendants', lambda: enumerate_descendants(window)),
+             ('get_visible_terminals', window.get_visible_terminals),
+             ('describe_layout', lambda: window.describe_layout(0, '', {}, 0))]
+    results = []
+    for name, walk in walks:
+        start = timer()
+        for _i in range(repeats):
+            walk()
+        results.append((name, (timer() - start) / repeats * 1000))
+    return(results)
+
+def main():
+    """Run the benchmark"""
+    panes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    from terminatorlib.factory import Factory
+    from terminatorlib.terminator import Terminator
+
+    terminator = Terminator()
+    terminator.set_origcwd(os.getcwd())
+    maker = Factory()
+    window = maker.make('Window')
+    build(maker, window, panes)
+
+    tagged = time_walks(window, repeats)
+    (isinstance_tagged, type_tagged) = (Factory.isinstance, Factory.type)
+    Factory.isinstance = import_isinstance
+    Factory.type = import_type
+    try:
+        imported = time_walks(window, repeats)
+    finally:
+        Factory.isinstance = isinstance_tagged
+        Factory.type = type_tagged
+
+    print('%d panes, mean time per walk' % panes)
+    for (name, before), (_name, after) in zip(imported, tagged):
+        print('  %-22s imports %8.3f ms   tags %8.3f ms' % (name, before,
+                                                            after))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""bulkpaste.py - Chunked, flow controlled pasting into many terminals"""
+
+import select
+from gi.repository import GObject
+
+from .config import Config
+from .util import dbg, err
+
+class BulkPaste(object):
+    """Feed one payload to a set of terminals a chunk at a time from the main
+    loop. A terminal only gets its next chunk once its pty can accept more
+    input, so a slow remote end holds back that terminal and nothing else.
+
+    This is only rough back-pressure. VTE buffers what feed_child() is given
+    and writes it to the pty itself, and polling the pty can't see that
+    buffer, so the pace is really set by bulk_paste_chunk_size and
+    bulk_paste_interval. Terminals which close part way through are dropped.
+
+    Note that unlike Vte.Terminal.paste_clipboard(), the text is fed to the
+    child as-is, so bracketed paste mode is not used."""
+    pending = None
+    chunk_size = None
+    interval = None
+    source = None
+
+    def __init__(self, text, terminals):
+        """Class initialiser"""
+        config = Config()
+        self.chunk_size = max(config['bulk_paste_chunk_size'], 1)
+        self.interval = max(config['bulk_paste_interval'], 0)
+
+        if isinstance(text, bytes):
+            # Python 2 gives us the clipboard as UTF-8 bytes
+            text = text.decode('utf-8', 'replace')
+        # Match what VTE does with line endings when pasting
+        text = text.replace('\r\n', '\r').replace('\n', '\r')
+        # Chunks are cut on character boundaries, so each one is valid UTF-8
+        chunks = [text[offset:offset + self.chunk_size].encode('utf-8')
+                  for offset in range(0, len(text), self.chunk_size)]
+        self.pending = [[terminal, chunks, 0] for terminal in terminals]
+
+    def start(self):
+        """Start feeding the terminals"""
+        if not self.pending or not self.pending[0][1]:
+            return
+        dbg('BulkPaste::start: %d chunks for %d terminals',
+                len(self.pending[0][1]), len(self.pending))
+        if self.on_tick():
+            self.source = GObject.timeout_add(self.interval, self.on_tick)
+
+    def writable(self, terminal):
+        """Check whether the pty of a terminal can take more input. Returns
+        None if the terminal has closed or has no child"""
+        if terminal.vte is None:
+            return(None)
+        pty = terminal.vte.get_pty()
+        if pty is None:
+            return(None)
+        try:
+            _readable, writable, _error = select.select([], [pty.get_fd()],
+                                                        [], 0)
+        except (OSError, ValueError) as ex:
+            err('BulkPaste::writable: unable to poll pty: %s' % ex)
+            return(None)
+        return(bool(writable))
+
+    def on_tick(self):
+        """Send the next chunk to every terminal which is ready for it"""
+        remaining = []
+        for item in self.pending:
+            terminal, chunks, index = item
+            ready = self.writable(terminal)
+            if ready is None:
+                dbg('BulkPaste::on_tick: %s has closed or has no child', terminal)
+                continue
+            if ready:
+                terminal.vte.feed_child(chunks[index])
+                item[2] = index = index + 1
+            if index < len(chunks):
+                remaining.append(item)
+
+        self.pending = remaining
+        if not remaining:
+            dbg('BulkPaste::on_tick: paste complete')
+            self.source = None
+            return(False)
+        return(True)
@@ -66,6 +66,12 @@ KeyError: 'ConfigBase::get_item: unknown key algo'
 >>> config.options_set({})
 >>> config.options_get()
 {}
+>>> generation = config.base.generation
+>>> config['focus'] = 'mouse'
+>>> config.base.generation > generation
+True
+>>> config['focus']
+'mouse'
 >>> 
 
 """
@@ -91,9 +97,11 @@ DEFAULTS = {
             'extra_styling'         : True,
             'tab_position'          : 'top',
             'broadcast_default'     : 'group',
+            'broadcast_feed_child'  : False,
             'close_button_on_tab'   : True,
             'hide_tabbar'           : False,
             'scroll_tabbar'         : False,
+            'lazy_tabs'             : False,
             'homogeneous_tabbar'    : True,
             'hide_from_taskbar'     : False,
             'always_on_top'         : False,
@@ -104,6 +112,7 @@ DEFAULTS = {
             'disable_real_transparency' : False,
             'title_at_bottom'       : False,
             'title_hide_sizetext'   : False,
+            'title_update_rate'     : 30,
             'title_transmit_fg_color' : '#ffffff',
             'title_transmit_bg_color' : '#c80003',
             'title_receive_fg_color' : '#ffffff',
@@ -111,6 +120,7 @@ DEFAULTS = {
             'title_inactive_fg_color' : '#000000',
             'title_inactive_bg_color' : '#c0bebf',
             'inactive_color_offset': 0.8,
+            'inactive_dim_mode'     : 'overlay',
             'fast_resize_step': 50,
             'enabled_plugins'       : ['LaunchpadBugURLHandler',
                                        'LaunchpadCodeURLHandler',
@@ -121,6 +131,10 @@ DEFAULTS = {
             'title_font'            : 'Sans 9',
             'putty_paste_style'     : False,
             'putty_paste_style_source_clipboard': False,
+            'bulk_paste_chunk_size' : 4096,
+            'bulk_paste_interval'   : 10,
+            'spawn_pool_size'       : 0,
+            'output_watch_rate'     : 10,
             'smart_copy'            : True,
             'clear_select_on_copy'  : False,
             'line_height'           : 1.0,
@@ -147,6 +161,7 @@ DEFAULTS = {
             'close_term'       : '<Shift><Control>w',
             'copy'             : '<Shift><Control>c',
             'paste'            : '<Shift><Control>v',
+            'paste_to_group'   : '',
             'toggle_scrollbar' : '<Shift><Control>s',
             'search'           : '<Shift><Control>f',
             'page_up'          : '',
@@ -284,16 +299,12 @@ class Config(object):
     """Class to provide a slightly richer config API above ConfigBase"""
     base = None
     profile = None
-    system_mono_font = None
-    system_prop_font = None
-    system_focus = None
     inhibited = None
     
     def __init__(self, profile='default'):
         self.base = ConfigBase()
         self.set_profile(profile)
         self.inhibited = False
-        self.connect_gsetting_callbacks()
 
     def __getitem__(self, key, default=None):
         """Look up a configuration item"""
@@ -318,6 +329,7 @@ class Config(object):
         if profile not in self.base.profiles:
             dbg('Config::set_profile: %s does not exist, creating' % profile)
             self.base.profiles[profile] = copy(DEFAULTS['profiles']['default'])
+            self.base.invalidate()
 
     def add_profile(self, profile):
         """Add a new profile"""
@@ -332,6 +344,7 @@ class Config(object):
             self.set_profile('default')
         if profile in self.base.profiles:
             del(self.base.profiles[profile])
+            self.base.invalidate()
         options = self.options_get()
         if options and options.profile == profile:
             options.profile = None
@@ -342,6 +355,7 @@ class Config(object):
         if profile in self.base.profiles:
             self.base.profiles[newname] = self.base.profiles[profile]
             del(self.base.profiles[profile])
+            self.base.invalidate()
             if profile == self.profile:
                 self.profile = newname
 
@@ -372,69 +386,17 @@ class Config(object):
         """List all configured layouts"""
         return(list(self.base.layouts.keys()))
 
-    def connect_gsetting_callbacks(self):
-        """Get system settings and create callbacks for changes"""
-        dbg("GSetting connects for system changes")
-        # Have to preserve these to self, or callbacks don't happen
-        self.gsettings_interface=Gio.Settings.new('org.gnome.desktop.interface')
-        self.gsettings_interface.connect("changed::font-name", self.on_gsettings_change_event)
-        self.gsettings_interface.connect("changed::monospace-font-name", self.on_gsettings_change_event)
-        self.gsettings_wm=Gio.Settings.new('org.gnome.desktop.wm.preferences')
-        self.gsettings_wm.connect("changed::focus-mode", self.on_gsettings_change_event)
-
     def get_system_prop_font(self):
         """Look up the system font"""
-        if self.system_prop_font is not None:
-            return(self.system_prop_font)
-        elif 'org.gnome.desktop.interface' not in Gio.Settings.list_schemas():
-            return
-        else:
-            gsettings=Gio.Settings.new('org.gnome.desktop.interface')
-            value = gsettings.get_value('font-name')
-            if value:
-                self.system_prop_font = value.get_string()
-            else:
-                self.system_prop_font = "Sans 10"
-            return(self.system_prop_font)
+        return(SystemSettings().get_prop_font())
 
     def get_system_mono_font(self):
         """Look up the system font"""
-        if self.system_mono_font is not None:
-            return(self.system_mono_font)
-        elif 'org.gnome.desktop.interface' not in Gio.Settings.list_schemas():
-            return
-        else:
-            gsettings=Gio.Settings.new('org.gnome.desktop.interface')
-            value = gsettings.get_value('monospace-font-name')
-            if value:
-                self.system_mono_font = value.get_string()
-            else:
-                self.system_mono_font = "Mono 10"
-            return(self.system_mono_font)
+        return(SystemSettings().get_mono_font())
 
     def get_system_focus(self):
         """Look up the system focus setting"""
-        if self.system_focus is not None:
-            return(self.system_focus)
-        elif 'org.gnome.desktop.interface' not in Gio.Settings.list_schemas():
-            return
-        else:
-            gsettings=Gio.Settings.new('org.gnome.desktop.wm.preferences')
-            value = gsettings.get_value('focus-mode')
-            if value:
-                self.system_focus = value.get_string()
-            return(self.system_focus)
-
-    def on_gsettings_change_event(self, settings, key):
-        """Handle a gsetting change event"""
-        dbg('GSetting change event received. Invalidating caches')
-        self.system_focus = None
-        self.system_font = None
-        self.system_mono_font = None
-        # Need to trigger a reconfigure to change active terminals immediately
-        if "Terminator" not in globals():
-            from .terminator import Terminator
-        Terminator().reconfigure()
+        return(SystemSettings().get_focus())
 
     def save(self):
         """Cause ConfigBase to save our config to file"""
@@ -489,6 +451,87 @@ class Config(object):
         """Set a layout"""
         return(self.base.set_layout(layout, tree))
 
+class SystemSettings(Borg):
+    """Class to watch the desktop settings we follow, once per process. Values
+    are cached until the desktop tells us they have changed, at which point
+    all the terminals are reconfigured once"""
+    schemas = None
+    interface = None
+    wm = None
+    mono_font = None
+    prop_font = None
+    focus = None
+
+    def __init__(self):
+        """Class initialiser"""
+        Borg.__init__(self, self.__class__.__name__)
+        self.prepare_attributes()
+
+    def prepare_attributes(self):
+        """Set up our watchers if we don't have them yet"""
+        if self.schemas is None:
+            self.schemas = {}
+            dbg("GSetting connects for system changes")
+            # Have to preserve these to self, or callbacks don't happen
+            self.interface = self.get_settings('org.gnome.desktop.interface')
+            if self.interface is not None:
+                self.interface.connect("changed::font-name",
+                                       self.on_change_event)
+                self.interface.connect("changed::monospace-font-name",
+                                       self.on_change_event)
+            self.wm = self.get_settings('org.gnome.desktop.wm.preferences')
+            if self.wm is not None:
+                self.wm.connect("changed::focus-mode", self.on_change_event)
+
+    def get_settings(self, schema):
+        """Return a Gio.Settings for a schema, or None if it isn't installed"""
+        if schema not in self.schemas:
+            source = Gio.SettingsSchemaSource.get_default()
+            self.schemas[schema] = source is not None and \
+                    source.lookup(schema, True) is not None
+        if not self.schemas[schema]:
+            return(None)
+        return(Gio.Settings.new(schema))
+
+    def get_prop_font(self):
+        """Look up the system font"""
+        if self.prop_font is None and self.interface is not None:
+            value = self.interface.get_value('font-name')
+            if value:
+                self.prop_font = value.get_string()
+            else:
+                self.prop_font = "Sans 10"
+        return(self.prop_font)
+
+    def get_mono_font(self):
+        """Look up the system monospace font"""
+        if self.mono_font is None and self.interface is not None:
+            value = self.interface.get_value('monospace-font-name')
+            if value:
+                self.mono_font = value.get_string()
+            else:
+                self.mono_font = "Mono 10"
+        return(self.mono_font)
+
+    def get_focus(self):
+        """Look up the system focus setting"""
+        if self.focus is None and self.wm is not None:
+            value = self.wm.get_value('focus-mode')
+            if value:
+                self.focus = value.get_string()
+        return(self.focus)
+
+    def on_change_event(self, settings, key):
+        """Handle a gsetting change event"""
+        dbg('GSetting change event received for %s. Invalidating caches', key)
+        self.prop_font = None
+        self.mono_font = None
+        self.focus = None
+        # Need to trigger a reconfigure to change active terminals immediately.
+        # Several keys often change together, so this is coalesced
+        from .terminator import Terminator
+        Terminator().queue_reconfigure(force=True)
+
 class ConfigBase(Borg):
     """Class to provide access to our user configuration"""
     loaded = None
@@ -500,6 +543,8 @@ class ConfigBase(Borg):
     plugins = None
     layouts = None
     command_line_options = None
+    generation = None
+    resolved = None
 
     def __init__(self):
         """Class initialiser"""
@@ -513,6 +558,10 @@ class ConfigBase(Borg):
 
     def prepare_attributes(self):
         """Set up our borg environment"""
+        if self.generation is None:
+            self.generation = 0
+        if self.resolved is None:
+            self.resolved = {}
         if self.loaded is None:
             self.loaded = False
         if self.whined is None:
@@ -522,11 +571,14 @@ class ConfigBase(Borg):
                              'layouts', 'plugins']
         if self.global_config is None:
             self.global_config = copy(DEFAULTS['global_config'])
+            self.invalidate()
         if self.profiles is None:
             self.profiles = {}
             self.profiles['default'] = copy(DEFAULTS['profiles']['default'])
+            self.invalidate()
         if self.keybindings is None:
             self.keybindings = copy(DEFAULTS['keybindings'])
+            self.invalidate()
         if self.plugins is None:
             self.plugins = {}
         if self.layouts is None:
@@ -690,12 +742,32 @@ class ConfigBase(Borg):
                             section_name)
 
         self.loaded = True
+        self.invalidate()
 
     def reload(self):
         """Force a reload of the base config"""
         self.loaded = False
+        self.invalidate()
         self.load()
 
+    def invalidate(self):
+        """Throw away the resolved profile views, they will be rebuilt on the
+        next lookup. This must be called whenever a config section is changed
+        other than via set_item()"""
+        self.generation += 1
+        self.resolved = {}
+
+    def resolve_profile(self, profile):
+        """Build a flattened view of every key visible from a profile, in the
+        same order of precedence used by get_item()"""
+        dbg('ConfigBase::resolve_profile: resolving %s (generation %d)',
+                profile, self.generation)
+        view = {'keybindings': self.keybindings}
+        view.update(self.profiles[profile])
+        view.update(self.global_config)
+        self.resolved[profile] = view
+        return(view)
+
     def save(self):
         """Save the config to a file"""
         dbg('ConfigBase::save: saving config')
@@ -752,25 +824,43 @@ class ConfigBase(Borg):
         except Exception as ex:
             err('ConfigBase::save: Unable to save config: %s' % ex)
 
+    def get_resolved(self, profile):
+        """Return the flattened view of every key visible from a profile"""
+        view = self.resolved.get(profile)
+        if view is None:
+            view = self.resolve_profile(profile)
+        return(view)
+
     def get_item(self, key, profile='default', plugin=None, default=None):
         """Look up a configuration item"""
+        if plugin is None:
+            view = self.resolved.get(profile)
+            if view is None:
+                if profile in self.profiles:
+                    view = self.resolve_profile(profile)
+                else:
+                    view = self.resolved.get('default') or \
+                            self.resolve_profile('default')
+            if key in view:
+                return(view[key])
+
         if profile not in self.profiles:
             # Hitting this generally implies a bug
             profile = 'default'
 
         if key in self.global_config:
-            dbg('ConfigBase::get_item: %s found in globals: %s' %
-                    (key, self.global_config[key]))
+            dbg('ConfigBase::get_item: %s found in globals: %s',
+                    key, self.global_config[key])
             return(self.global_config[key])
         elif key in self.profiles[profile]:
-            dbg('ConfigBase::get_item: %s found in profile %s: %s' % (
-                    key, profile, self.profiles[profile][key]))
+            dbg('ConfigBase::get_item: %s found in profile %s: %s',
+                    key, profile, self.profiles[profile][key])
             return(self.profiles[profile][key])
         elif key == 'keybindings':
             return(self.keybindings)
         elif plugin and plugin in self.plugins and key in self.plugins[plugin]:
-            dbg('ConfigBase::get_item: %s found in plugin %s: %s' % (
-                    key, plugin, self.plugins[plugin][key]))
+            dbg('ConfigBase::get_item: %s found in plugin %s: %s',
+                    key, plugin, self.plugins[plugin][key])
             return(self.plugins[plugin][key])
         elif default:
             return default
@@ -779,15 +869,18 @@ class ConfigBase(Borg):
 
     def set_item(self, key, value, profile='default', plugin=None):
         """Set a configuration item"""
-        dbg('ConfigBase::set_item: Setting %s=%s (profile=%s, plugin=%s)' %
-                (key, value, profile, plugin))
+        dbg('ConfigBase::set_item: Setting %s=%s (profile=%s, plugin=%s)',
+                key, value, profile, plugin)
 
         if key in self.global_config:
             self.global_config[key] = value
+            self.invalidate()
         elif key in self.profiles[profile]:
             self.profiles[profile][key] = value
+            self.invalidate()
         elif key == 'keybindings':
             self.keybindings = value
+            self.invalidate()
         elif plugin is not None:
             if plugin not in self.plugins:
                 self.plugins[plugin] = {}
@@ -816,6 +909,7 @@ class ConfigBase(Borg):
         if profile in self.profiles:
             return(False)
         self.profiles[profile] = copy(DEFAULTS['profiles']['default'])
+        self.invalidate()
         return(True)
 
     def add_layout(self, name, layout):
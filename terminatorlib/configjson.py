@@ -162,6 +162,7 @@ class ConfigJson(object):
             profile = self.get_profile(configjson['profile'], config.base.profiles['default'])
             if profile:
                 config.base.profiles[JSON_PROFILE_NAME] = profile
+                config.base.invalidate()
                 self.profile_to_use = JSON_PROFILE_NAME
         
         if 'layout' in configjson:
@@ -14,6 +14,7 @@ from .signalman import Signalman
 # pylint: disable-msg=R0921
 class Container(object):
     """Base class for Terminator Containers"""
+    terminator_type = 'Container'
 
     terminator = None
     immutable = None
@@ -54,10 +55,22 @@ class Container(object):
         self.cnxids.new(widget, signal, handler, *args)
         return
 
+    def connect_children(self, widget, signals):
+        """Register several signals for a child in one go. signals maps each
+        signal name to a handler, or to a list of a handler and its args"""
+        self.cnxids.new_batch(widget, signals)
+
     def disconnect_child(self, widget):
         """De-register the signals for a child"""
         self.cnxids.remove_widget(widget)
 
+    def descendants_changed(self):
+        """Tell our Window that the widgets beneath it have changed, so it
+        rebuilds its index of them when it is next asked"""
+        window = self.get_toplevel()
+        if Factory().isinstance(window, 'Window'):
+            window.invalidate_descendants()
+
     def get_offspring(self):
         """Return a list of direct child widgets, if any"""
         return(self.children)
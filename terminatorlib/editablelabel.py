@@ -59,6 +59,9 @@ class EditableLabel(Gtk.EventBox):
 
     def set_text(self, text, force=False):
         """set the text of the label"""
+        if text == self._autotext and not force:
+            # Nothing has changed
+            return
         self._autotext = text
         if not self._custom or force:
             self._label.set_text(text) 
@@ -122,7 +125,7 @@ class EditableLabel(Gtk.EventBox):
         label = self._label.get_text ()
         if entry == '':
             self._custom = False
-            self.set_text (self._autotext)
+            self.set_text (self._autotext, force=True)
         elif entry != label:
             self._custom = True
             self._label.set_text (entry)
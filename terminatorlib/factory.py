@@ -21,6 +21,19 @@ True
 from .borg import Borg
 from .util import dbg, err, inject_uuid
 
+# Each class we make names its type in a terminator_type class attribute.
+# This maps those names to every type an instance of that class counts as,
+# so checking a type needs no imports and no isinstance() calls
+KINDS = {'Terminal': frozenset(['Terminal']),
+         'TabPlaceholder': frozenset(['TabPlaceholder']),
+         'Container': frozenset(['Container']),
+         'Paned': frozenset(['Paned', 'Container']),
+         'HPaned': frozenset(['HPaned', 'Paned', 'Container']),
+         'VPaned': frozenset(['VPaned', 'Paned', 'Container']),
+         'Notebook': frozenset(['Notebook', 'Container']),
+         'Window': frozenset(['Window', 'Container'])}
+NOKIND = frozenset()
+
 # pylint: disable-msg=R0201
 # pylint: disable-msg=W0613
 class Factory(Borg):
@@ -30,11 +43,10 @@ class Factory(Borg):
              'HPaned': 'paned',
              'Paned': 'paned',
              'Notebook': 'notebook',
+             'TabPlaceholder': 'tabplaceholder',
              'Container': 'container',
              'Window': 'window'}
     types_keys = list(types.keys())
-    instance_types = {}
-    instance_types_keys = []
 
     def __init__(self):
         """Class initialiser"""
@@ -47,38 +59,18 @@ class Factory(Borg):
 
     def isinstance(self, product, classtype):
         """Check if a given product is a particular type of object"""
-        if classtype in self.types_keys:
-            # This is now very ugly, but now it's fast :-)
-            # Someone with real Python skills should fix this to be less insane.
-            # Optimisations:
-            # - swap order of imports, otherwise we throw ImportError
-            #   almost every time
-            # - cache everything we can
-            try:
-                type_key = 'terminatorlib.%s' % self.types[classtype]
-                if type_key not in self.instance_types_keys:
-                    self.instance_types[type_key] = __import__(type_key, None, None, [''])
-                    self.instance_types_keys.append(type_key)
-                module = self.instance_types[type_key]
-            except ImportError:
-                type_key = self.types[classtype]
-                if type_key not in self.instance_types_keys:
-                    self.instance_types[type_key] = __import__(type_key, None, None, [''])
-                    self.instance_types_keys.append(type_key)
-                module = self.instance_types[type_key]
-            return(isinstance(product, getattr(module, classtype)))
-        else:
+        if classtype not in KINDS:
             err('Factory::isinstance: unknown class type: %s' % classtype)
             return(False)
+        kind = getattr(product, 'terminator_type', None)
+        return(classtype in KINDS.get(kind, NOKIND))
 
     def type(self, product):
         """Determine the type of an object we've previously created"""
-        for atype in self.types:
-            # Skip over generic types
-            if atype in ['Container', 'Paned']:
-                continue
-            if self.isinstance(product, atype):
-                return(atype)
+        kind = getattr(product, 'terminator_type', None)
+        # Skip over generic types
+        if kind in KINDS and kind not in ['Container', 'Paned']:
+            return(kind)
         return(None)
 
     def make(self, product, **kwargs):
@@ -119,3 +111,8 @@ class Factory(Borg):
         from . import notebook
         return(notebook.Notebook(kwargs['window']))
 
+    def make_tabplaceholder(self, **kwargs):
+        """Make a TabPlaceholder"""
+        from . import tabplaceholder
+        return(tabplaceholder.TabPlaceholder(kwargs['layout']))
+
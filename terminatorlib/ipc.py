@@ -2,6 +2,8 @@
 # GPL v2 only
 """ipc.py - DBus server and API calls"""
 
+import io
+import os
 import sys
 import hashlib
 from gi.repository import Gdk
@@ -12,6 +14,7 @@ from .borg import Borg
 from .terminator import Terminator
 from .config import Config
 from .factory import Factory
+from .plugin import PluginRegistry
 from .util import dbg, err, enumerate_descendants
 
 CONFIG = Config()
@@ -197,6 +200,29 @@ class DBusService(Borg, dbus.service.Object):
                 if terminal in terms:
                     return root_widget.get_tab_label(tab_child).get_label()
 
+    @dbus.service.method(BUS_NAME)
+    def paste_to_group(self, uuid=None, path=''):
+        """Paste the clipboard, or the contents of a file, into a terminal
+        and every terminal it is broadcasting to"""
+        terminal = self.terminator.find_terminal_by_uuid(uuid)
+        if not terminal:
+            return "ERROR: Terminal with supplied UUID not found"
+        if not path:
+            terminal.paste_to_group()
+            return ""
+        try:
+            with io.open(path, 'r', errors='replace') as pastefile:
+                text = pastefile.read()
+        except (IOError, OSError) as ex:
+            return "ERROR: Unable to read %s: %s" % (path, ex)
+        terminal.paste_to_group(text)
+        return ""
+
+    @dbus.service.method(BUS_NAME)
+    def get_plugin_stats(self):
+        """Return how often, and for how long, each plugin has been called"""
+        return PluginRegistry().format_stats()
+
 def with_proxy(func):
     """Decorator function to connect to the session dbus bus"""
     dbg('dbus client call: %s' % func.__name__)
@@ -272,3 +298,17 @@ def get_tab_title(session, uuid, options):
     """Call the dbus method to return the title of a tab"""
     print(session.get_tab_title(uuid))
 
+@with_proxy
+def paste_to_group(session, uuid, options):
+    """Call the dbus method to paste into a terminal and its group"""
+    path = options.get('file', '')
+    if path:
+        path = os.path.abspath(path)
+    result = session.paste_to_group(uuid, path)
+    if result:
+        print(result)
+
+@with_proxy
+def get_plugin_stats(session, options):
+    """Call the dbus method to return plugin call statistics"""
+    print(session.get_plugin_stats())
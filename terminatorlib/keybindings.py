@@ -22,6 +22,7 @@ keyboard shortcuts.
 """
 
 import re
+import weakref
 from gi.repository import Gtk, Gdk
 from .util import err
 
@@ -29,6 +30,18 @@ class KeymapError(Exception):
     """Custom exception for errors in keybinding configurations"""
 
 MODIFIER = re.compile('<([^<]+)>')
+# Most translated key events to remember in Keybindings.lookup
+CACHE_SIZE = 1024
+# Every Keybindings still alive, whose caches a keyboard layout change clears
+INSTANCES = weakref.WeakSet()
+
+def on_keys_changed(keymap):
+    """Tell every Keybindings that the keyboard layout has changed. This is
+    connected to the keymap once, so short lived instances (e.g. the one in
+    the preferences window) don't leave handlers behind"""
+    for keybindings in list(INSTANCES):
+        keybindings.on_keys_changed(keymap)
+
 class Keybindings:
     """Class to handle loading and lookup of Terminator keybindings"""
 
@@ -47,11 +60,23 @@ class Keybindings:
     keys = None
     _masks = None
     _lookup = None
+    _cache = None
+    _keys_changed_handler = None
 
     def __init__(self):
+        self._cache = {}
         self.keymap = Gdk.Keymap.get_default()
+        if Keybindings._keys_changed_handler is None:
+            Keybindings._keys_changed_handler = self.keymap.connect(
+                'keys-changed', on_keys_changed)
+        INSTANCES.add(self)
         self.configure({})
 
+    def on_keys_changed(self, _keymap):
+        """The keyboard layout has changed, so key events translate
+        differently"""
+        self._cache.clear()
+
     def configure(self, bindings):
         """Accept new bindings and reconfigure with them"""
         self.keys = bindings
@@ -61,6 +86,7 @@ class Keybindings:
         """Parse bindings and mangle into an appropriate form"""
         self._lookup = {}
         self._masks = 0
+        self._cache.clear()
         for action, bindings in list(self.keys.items()):
             if not isinstance(bindings, tuple):
                 bindings = (bindings,)
@@ -114,16 +140,28 @@ class Keybindings:
             raise KeymapError("Unhandled modifier '<%s>'" % modifier)
 
     def lookup(self, event):
-        """Translate a keyboard event into a mapped key"""
+        """Translate a keyboard event into a mapped key. Results are cached,
+        since the same few keys are pressed over and over"""
+        state = event.get_state()
+        key = (event.hardware_keycode,
+               int(state & ~Gdk.ModifierType.LOCK_MASK), event.group)
+        try:
+            return self._cache[key][2]
+        except KeyError:
+            pass
+
         try:
             _found, keyval, _egp, _lvl, consumed = self.keymap.translate_keyboard_state(
                                               event.hardware_keycode, 
-                                              Gdk.ModifierType(event.get_state() & ~Gdk.ModifierType.LOCK_MASK),
+                                              Gdk.ModifierType(state & ~Gdk.ModifierType.LOCK_MASK),
                                               event.group)
         except TypeError:
             err ("keybindings.lookup failed to translate keyboard event: %s" % 
                      dir(event))
             return None
-        mask = (event.get_state() & ~consumed) & self._masks
-        return self._lookup.get(mask, self.empty).get(keyval, None)
-
+        mask = (state & ~consumed) & self._masks
+        action = self._lookup.get(mask, self.empty).get(keyval, None)
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = (keyval, consumed, action)
+        return action
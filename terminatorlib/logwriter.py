@@ -0,0 +1,284 @@
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""logwriter.py - Write terminal logs from a background thread
+
+Text given to a LogWriter is put on a bounded queue and written by a thread
+of its own, so a slow disk never holds up the GTK main loop. If the queue is
+full the text is dropped, counted, and a note of how much was lost is written
+to the log once the writer catches up. Logs can be rotated by size and/or
+age, rotated files can be compressed, and the writer can fsync the log as it
+goes.
+
+>>> import os, tempfile
+>>> logdir = tempfile.mkdtemp()
+>>> path = os.path.join(logdir, 'test.log')
+>>> writer = LogWriter(path, rotate_size=10, rotate_keep=2)
+>>> for line in ['one\\n', 'two\\n', 'three\\n', 'four\\n']:
+...     writer.write(line)
+...     writer.sync()
+>>> writer.close()
+>>> writer.wait()
+>>> sorted(os.listdir(logdir))
+['test.log', 'test.log.1', 'test.log.2']
+>>> open(path).read()
+'four\\n'
+>>> writer.get_stats()['rotations']
+2
+>>> writer.get_stats()['dropped']
+0
+
+"""
+
+import bz2
+import gzip
+import os
+import shutil
+import threading
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from .util import dbg, err, monotonic
+
+# Compressors for rotated logs, and the extension each adds
+COMPRESSORS = {'gzip': (gzip.open, '.gz'),
+               'bz2': (bz2.BZ2File, '.bz2')}
+try:
+    import lzma
+    COMPRESSORS['xz'] = (lzma.open, '.xz')
+except ImportError:
+    pass
+
+FSYNC_POLICIES = ['never', 'interval', 'always']
+
+class LogWriter(object):
+    """Writes text to a log file from a background thread"""
+    path = None
+    rotate_size = None
+    rotate_interval = None
+    rotate_keep = None
+    compress = None
+    fsync = None
+    fsync_interval = None
+
+    queue = None
+    thread = None
+    lock = None
+    logfile = None
+    opened = None
+    size = None
+    last_fsync = None
+    unsynced = None
+    stats = None
+    lost = None
+    stopping = None
+
+    def __init__(self, path, queue_size=1000, rotate_size=0,
+                 rotate_interval=0, rotate_keep=5, compress=None,
+                 fsync='never', fsync_interval=5.0):
+        """Class initialiser. The log file is opened here, so any error
+        opening it is raised to the caller"""
+        if compress is not None and compress not in COMPRESSORS:
+            raise ValueError('Unknown log compression: %s' % compress)
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError('Unknown log fsync policy: %s' % fsync)
+        self.path = path
+        self.rotate_size = rotate_size
+        self.rotate_interval = rotate_interval
+        self.rotate_keep = max(rotate_keep, 1)
+        self.compress = compress
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+
+        self.logfile = open(path, 'wb')
+        self.opened = monotonic()
+        self.size = 0
+        self.last_fsync = self.opened
+        self.unsynced = False
+        self.lock = threading.Lock()
+        self.stats = {'written': 0, 'dropped': 0, 'dropped_chunks': 0,
+                      'rotations': 0, 'errors': 0, 'queued_max': 0}
+        self.lost = 0
+        self.stopping = False
+
+        self.queue = queue.Queue(max(queue_size, 1))
+        self.thread = threading.Thread(target=self.run,
+                                       name='LogWriter %s' % path)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def write(self, text):
+        """Queue some text to be written. This never blocks: if the writer
+        has fallen too far behind, the text is dropped and counted"""
+        if not text or self.stopping:
+            return
+        data = text
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8', 'replace')
+        try:
+            self.queue.put_nowait(data)
+        except queue.Full:
+            with self.lock:
+                self.stats['dropped'] += len(data)
+                self.stats['dropped_chunks'] += 1
+                self.lost += len(data)
+            return
+        depth = self.queue.qsize()
+        if depth > self.stats['queued_max']:
+            self.stats['queued_max'] = depth
+
+    def sync(self):
+        """Wait until everything queued so far has been written"""
+        self.queue.join()
+
+    def close(self):
+        """Ask the thread to write everything queued, close the log and stop.
+        This returns straight away, use wait() to know when it is done"""
+        self.stopping = True
+        try:
+            self.queue.put_nowait(None)
+        except queue.Full:
+            # The thread is busy and will see self.stopping once it has
+            # caught up
+            pass
+
+    def wait(self, timeout=None):
+        """Wait for the thread to stop after close(). Don't call this from
+        the GTK main loop"""
+        self.thread.join(timeout)
+
+    def get_stats(self):
+        """Return a copy of the writer's counters"""
+        with self.lock:
+            stats = dict(self.stats)
+        stats['queued'] = self.queue.qsize()
+        return(stats)
+
+    def run(self):
+        """Thread loop, writing whatever has been queued"""
+        running = True
+        while running:
+            try:
+                chunks = [self.queue.get(timeout=self.get_wait())]
+            except queue.Empty:
+                chunks = []
+            # Take everything else waiting so it goes out in one write
+            while True:
+                try:
+                    chunks.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in chunks or self.stopping:
+                running = False
+            data = b''.join([chunk for chunk in chunks if chunk is not None])
+
+            try:
+                self.write_data(data, closing=not running)
+            except (IOError, OSError, ValueError) as ex:
+                # ValueError is raised by a log that couldn't be reopened
+                err('LogWriter::run: Unable to write %s: %s' % (self.path, ex))
+                with self.lock:
+                    self.stats['errors'] += 1
+                    self.stats['dropped'] += len(data)
+            for _chunk in chunks:
+                self.queue.task_done()
+
+        try:
+            self.logfile.close()
+        except (IOError, OSError) as ex:
+            err('LogWriter::run: Unable to close %s: %s' % (self.path, ex))
+        dbg('LogWriter::run: Stopped writing %s', self.path)
+
+    def get_wait(self):
+        """How long the thread can sleep before it has timed work to do"""
+        waits = []
+        now = monotonic()
+        if self.rotate_interval > 0 and self.size > 0:
+            waits.append(self.opened + self.rotate_interval - now)
+        if self.fsync == 'interval' and self.unsynced:
+            waits.append(self.last_fsync + self.fsync_interval - now)
+        if not waits:
+            return(None)
+        return(max(min(waits), 0.01))
+
+    def write_data(self, data, closing=False):
+        """Write data to the log, rotating it first if it is due, then fsync
+        as configured. Only called from the writer thread"""
+        with self.lock:
+            lost = self.lost
+            self.lost = 0
+        if lost:
+            data = ('\n[Logger: %d bytes of output were not logged]\n' %
+                    lost).encode('utf-8') + data
+
+        now = monotonic()
+        if self.size > 0 and \
+           ((self.rotate_interval > 0 and
+             now - self.opened >= self.rotate_interval) or
+            (self.rotate_size > 0 and
+             self.size + len(data) > self.rotate_size)):
+            self.rotate()
+
+        if data:
+            self.logfile.write(data)
+            self.logfile.flush()
+            self.size += len(data)
+            self.unsynced = True
+            with self.lock:
+                self.stats['written'] += len(data)
+
+        if self.unsynced and (closing or self.fsync == 'always' or
+           (self.fsync == 'interval' and
+            now - self.last_fsync >= self.fsync_interval)):
+            if self.fsync != 'never':
+                os.fsync(self.logfile.fileno())
+            self.last_fsync = now
+            self.unsynced = False
+
+
+    def rotated_path(self, index):
+        """Return the name of the index'th rotated log"""
+        path = '%s.%d' % (self.path, index)
+        if self.compress is not None:
+            path += COMPRESSORS[self.compress][1]
+        return(path)
+
+    def rotate(self):
+        """Move the current log aside and start a new one. Only called from
+        the writer thread. If the rotation fails part way through, logging
+        carries on at the end of whatever is left at the log's path"""
+        dbg('LogWriter::rotate: Rotating %s', self.path)
+        rotated = False
+        try:
+            if self.fsync != 'never' and self.unsynced:
+                os.fsync(self.logfile.fileno())
+            self.logfile.close()
+
+            oldest = self.rotated_path(self.rotate_keep)
+            if os.path.exists(oldest):
+                os.remove(oldest)
+            for index in range(self.rotate_keep - 1, 0, -1):
+                if os.path.exists(self.rotated_path(index)):
+                    os.rename(self.rotated_path(index),
+                              self.rotated_path(index + 1))
+
+            if self.compress is None:
+                os.rename(self.path, self.rotated_path(1))
+            else:
+                opener = COMPRESSORS[self.compress][0]
+                with open(self.path, 'rb') as source:
+                    with opener(self.rotated_path(1), 'wb') as target:
+                        shutil.copyfileobj(source, target)
+                os.remove(self.path)
+            rotated = True
+        finally:
+            if self.logfile.closed:
+                self.logfile = open(self.path, 'ab')
+            self.opened = monotonic()
+            self.size = os.fstat(self.logfile.fileno()).st_size
+            self.last_fsync = self.opened
+            if rotated:
+                self.unsynced = False
+                with self.lock:
+                    self.stats['rotations'] += 1
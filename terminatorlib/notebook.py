@@ -18,10 +18,12 @@ from .util import err, dbg, enumerate_descendants, make_uuid
 
 class Notebook(Container, Gtk.Notebook):
     """Class implementing a Gtk.Notebook container"""
+    terminator_type = 'Notebook'
     window = None
     last_active_term = None
     pending_on_tab_switch = None
     pending_on_tab_switch_args = None
+    deferred_spawns = None
 
     def __init__(self, window):
         """Class initialiser"""
@@ -33,10 +35,13 @@ class Notebook(Container, Gtk.Notebook):
         GObject.GObject.__init__(self)
         self.terminator = Terminator()
         self.window = window
+        self.deferred_spawns = set()
         GObject.type_register(Notebook)
         self.register_signals(Notebook)
         self.connect('switch-page', self.deferred_on_tab_switch)
         self.connect('scroll-event', self.on_scroll_event)
+        for signal in ['page-added', 'page-removed', 'page-reordered']:
+            self.connect(signal, lambda *args: self.descendants_changed())
         self.configure()
 
         child = window.get_child()
@@ -115,10 +120,18 @@ class Notebook(Container, Gtk.Notebook):
                 self.split_axis(page, False)
             num = num + 1
 
+        active_page = int(layout.get('active_page', 0))
+        maker = Factory()
         num = 0
         for child_key in keys:
             page = self.get_nth_page(num)
-            if not page:
+            if not page and self.config['lazy_tabs'] and num != active_page \
+               and children[child_key]['type'] == 'Terminal':
+                # Make the Terminal when this tab is first shown
+                page = maker.make('TabPlaceholder',
+                                  layout=children[child_key])
+                self.newtab(widget=page)
+            elif not page:
                 # This page does not yet exist, so make it
                 self.newtab(children[child_key])
                 page = self.get_nth_page(num)
@@ -127,7 +140,8 @@ class Notebook(Container, Gtk.Notebook):
                 if labeltext and labeltext != "None":
                     label = self.get_tab_label(page)
                     label.set_custom_label(labeltext)
-            page.create_layout(children[child_key])
+            if not maker.isinstance(page, 'TabPlaceholder'):
+                page.create_layout(children[child_key])
 
             if  layout.get('last_active_term',  None):
                 self.last_active_term[page] = make_uuid(layout['last_active_term'][num])
@@ -164,7 +178,7 @@ class Notebook(Container, Gtk.Notebook):
             sibling.set_cwd(cwd)
             if self.config['always_split_with_profile']:
                 sibling.force_set_profile(None, widget.get_profile())
-            sibling.spawn_child()
+            sibling.spawn_child(pooled=True)
             if widget.group and self.config['split_to_group']:
                 sibling.set_group(None, widget.group)
         elif self.config['always_split_with_profile']:
@@ -205,6 +219,11 @@ class Notebook(Container, Gtk.Notebook):
             err('%s not found in Notebook. Actual parent is: %s' % 
                     (widget, widget.get_parent()))
             return(False)
+        if widget in self.deferred_spawns:
+            # The page is being moved or rearranged, so its terminals can't
+            # wait for it to be shown. Pages being closed are dropped from
+            # deferred_spawns before they get here
+            self.spawn_deferred(widget)
         self.remove_page(page_num)
         self.disconnect_child(widget)
         return(True)
@@ -249,7 +268,7 @@ class Notebook(Container, Gtk.Notebook):
                 widget.set_cwd(cwd)
             if profile and self.config['always_split_with_profile']:
                 widget.force_set_profile(None, profile)
-            widget.spawn_child(debugserver=debugtab)
+            widget.spawn_child(debugserver=debugtab, pooled=True)
         elif profile and self.config['always_split_with_profile']:
             widget.force_set_profile(None, profile)
 
@@ -270,13 +289,7 @@ class Notebook(Container, Gtk.Notebook):
                    'navigate': top_window.navigate_terminal}
 
         if maker.isinstance(widget, 'Terminal'):
-            for signal in signals:
-                args = []
-                handler = signals[signal]
-                if isinstance(handler, list):
-                    args = handler[1:]
-                    handler = handler[0]
-                self.connect_child(widget, signal, handler, *args)
+            self.connect_children(widget, signals)
 
         if metadata and 'tabnum' in metadata:
             tabpos = metadata['tabnum']
@@ -311,11 +324,35 @@ class Notebook(Container, Gtk.Notebook):
         self.child_set_property(widget, 'tab-fill', True)
 
         self.set_tab_reorderable(widget, True)
-        self.set_current_page(tabpos)
+        if not maker.isinstance(widget, 'TabPlaceholder'):
+            self.set_current_page(tabpos)
         self.show_all()
         if maker.isinstance(term_widget, 'Terminal'):
             widget.grab_focus()
 
+    def materialise(self, placeholder):
+        """Replace a TabPlaceholder with the Terminal it stands in for"""
+        dbg('Notebook::materialise: making Terminal for %s' % placeholder)
+        maker = Factory()
+        metadata = self.get_child_metadata(placeholder)
+        terminal = maker.make('Terminal')
+        if placeholder.uuid is not None:
+            self.terminator.reindex_terminal(terminal, placeholder.uuid)
+        terminal.create_layout(placeholder.layout)
+        last_active = self.last_active_term.pop(placeholder, None)
+        self.remove(placeholder)
+        self.newtab(widget=terminal, metadata=metadata)
+        if last_active is not None:
+            self.last_active_term[terminal] = last_active
+        terminal.spawn_child()
+        return(terminal)
+
+    def closeterm(self, widget):
+        """Handle the closure of a terminal, which has no need to be started
+        if its tab was never shown"""
+        self.deferred_spawns.discard(widget)
+        return(Container.closeterm(self, widget))
+
     def wrapcloseterm(self, widget):
         """A child terminal has closed"""
         dbg('Notebook::wrapcloseterm: called on %s' % widget)
@@ -354,11 +391,20 @@ class Notebook(Container, Gtk.Notebook):
             # page below, which child.close() implicitly does
             del(label)
             return
+        elif maker.isinstance(child, 'TabPlaceholder'):
+            dbg('Notebook::closetab: child is a TabPlaceholder')
+            nb.last_active_term.pop(child, None)
+            nb.deferred_spawns.discard(child)
+            nb.remove(child)
+            nb.hoover()
+            return
         elif maker.isinstance(child, 'Container'):
             dbg('Notebook::closetab: child is a Container')
             result = self.construct_confirm_close(self.window, _('tab'))
 
             if result == Gtk.ResponseType.ACCEPT:
+                # Don't start anything in the tab just to close it again
+                nb.deferred_spawns.discard(child)
                 containers = None
                 objects = None
                 containers, objects = enumerate_descendants(child)
@@ -426,6 +472,9 @@ class Notebook(Container, Gtk.Notebook):
         if self.get_n_pages() == 1:
             dbg('Last page, removing self')
             child = self.get_nth_page(0)
+            if Factory().isinstance(child, 'TabPlaceholder'):
+                self.materialise(child)
+                child = self.get_nth_page(0)
             self.remove_page(0)
             parent = self.get_parent()
             parent.remove(self)
@@ -472,6 +521,8 @@ class Notebook(Container, Gtk.Notebook):
 
     def deferred_on_tab_switch(self, notebook, page,  page_num,  data=None):
         """Prime a single idle tab switch signal, using the most recent set of params"""
+        # A different set of terminals is about to be visible
+        self.window.invalidate_navigation()
         tabs_last_active_term = self.last_active_term.get(self.get_nth_page(page_num),  None)
         data = {'tabs_last_active_term':tabs_last_active_term}
         
@@ -483,12 +534,37 @@ class Notebook(Container, Gtk.Notebook):
 
     def do_deferred_on_tab_switch(self):
         """Perform the latest tab switch signal, and resetting the pending flag"""
-        self.on_tab_switch(*self.pending_on_tab_switch_args)
+        args = self.pending_on_tab_switch_args
+        # Reset first, materialising a placeholder switches tab again and
+        # that switch must be queued rather than folded into this one
         self.pending_on_tab_switch = False
         self.pending_on_tab_switch_args = None
+        self.on_tab_switch(*args)
+
+    def defer_spawn(self, page):
+        """Start the terminals in a page when it is first shown"""
+        self.deferred_spawns.add(page)
+
+    def spawn_deferred(self, page):
+        """Start any terminals in a page which haven't been started yet"""
+        self.deferred_spawns.discard(page)
+        maker = Factory()
+        if maker.isinstance(page, 'Terminal'):
+            terminals = [page]
+        else:
+            terminals = enumerate_descendants(page)[1]
+        dbg('Notebook::spawn_deferred: %d terminals' % len(terminals))
+        for terminal in terminals:
+            if not terminal.pid and not terminal.spawning:
+                terminal.spawn_child()
 
     def on_tab_switch(self, notebook, page,  page_num,  data=None):
         """Do the real work for a tab switch"""
+        if page in self.deferred_spawns:
+            self.spawn_deferred(page)
+        if page.get_parent() is self and \
+           Factory().isinstance(page, 'TabPlaceholder'):
+            self.materialise(page)
         tabs_last_active_term = data['tabs_last_active_term']
         if tabs_last_active_term:
             term = self.terminator.find_terminal_by_uuid(tabs_last_active_term.urn)
@@ -585,7 +661,7 @@ class TabLabel(Gtk.HBox):
 
     def set_custom_label(self, text):
         """Set a permanent label as if the user had edited it"""
-        self.label.set_text(text)
+        self.label.set_text(text, force=True)
         self.label.set_custom()
 
     def get_custom_label(self):
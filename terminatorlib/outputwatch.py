@@ -0,0 +1,176 @@
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""outputwatch.py - Shared watching of terminal output
+
+Anything that wants to know when a terminal produces output (e.g. the logger
+and activity plugins) subscribes here instead of connecting to VTE's
+contents-changed signal itself. Each terminal is watched with one handler,
+changes are batched up to output_watch_rate times a second, and the text
+appended since the last batch is read from VTE once and given to every
+subscriber that asked for it.
+"""
+
+from gi.repository import GObject
+
+from .borg import Borg
+from .config import Config
+from .util import dbg, err, monotonic
+
+class TerminalWatch(object):
+    """The state of watching one terminal"""
+    terminal = None
+    vte = None
+    subscribers = None
+    handlers = None
+    position = None
+    source = None
+    last_flush = None
+    dirty = None
+
+    def __init__(self, terminal):
+        """Class initialiser"""
+        self.terminal = terminal
+        self.vte = terminal.get_vte()
+        self.subscribers = {}
+        self.last_flush = 0
+        self.dirty = False
+
+    def wants_text(self):
+        """Whether any subscriber wants the text of the output"""
+        for (_callback, wants_text) in self.subscribers.values():
+            if wants_text:
+                return(True)
+        return(False)
+
+    def read_text(self):
+        """Return the text appended since we last looked"""
+        col, row = self.vte.get_cursor_position()
+        if self.position is None or self.position == (col, row):
+            self.position = (col, row)
+            return('')
+        last_col, last_row = self.position
+        content = self.vte.get_text_range(last_row, last_col, row, col,
+                                          lambda *a: True)[0]
+        self.position = (col, row)
+        # Don't include the last char which is always '\n'
+        return(content[:-1])
+
+class OutputWatch(Borg):
+    """Watches terminals on behalf of any number of subscribers"""
+    watches = None
+    next_id = None
+    interval = None
+
+    def __init__(self):
+        """Class initialiser"""
+        Borg.__init__(self, self.__class__.__name__)
+        self.prepare_attributes()
+
+    def prepare_attributes(self):
+        """Initialise anything that isn't already"""
+        if self.watches is None:
+            self.watches = {}
+        if self.next_id is None:
+            self.next_id = 0
+        if self.interval is None:
+            self.reconfigure()
+
+    def reconfigure(self):
+        """Read the minimum time between flushes from the config"""
+        self.interval = 1.0 / max(float(Config()['output_watch_rate']), 0.1)
+
+    def subscribe(self, terminal, callback, wants_text=False):
+        """Call callback(terminal, text) after a terminal has produced output.
+        text is the output since the last call if wants_text is True, and
+        None otherwise. Returns an id to unsubscribe with"""
+        watch = self.watches.get(terminal)
+        if watch is None:
+            dbg('OutputWatch::subscribe: watching %s', terminal)
+            watch = TerminalWatch(terminal)
+            watch.handlers = [watch.vte.connect('contents-changed',
+                                                self.on_contents_changed,
+                                                watch),
+                              watch.vte.connect('destroy', self.on_destroy,
+                                                watch)]
+            self.watches[terminal] = watch
+
+        if wants_text and not watch.wants_text():
+            # Start reading text from where the output is now
+            col, row = watch.vte.get_cursor_position()
+            watch.position = (col, row)
+
+        self.next_id += 1
+        watch.subscribers[self.next_id] = (callback, wants_text)
+        return(self.next_id)
+
+    def unsubscribe(self, terminal, subscription):
+        """Stop calling a subscriber"""
+        watch = self.watches.get(terminal)
+        if watch is None or subscription not in watch.subscribers:
+            err('OutputWatch::unsubscribe: %s is not subscribed to %s' %
+                    (subscription, terminal))
+            return
+        del(watch.subscribers[subscription])
+        if not watch.subscribers:
+            self.unwatch(watch)
+
+    def unwatch(self, watch):
+        """Stop watching a terminal"""
+        dbg('OutputWatch::unwatch: no longer watching %s', watch.terminal)
+        for handler in watch.handlers:
+            watch.vte.disconnect(handler)
+        if watch.source is not None:
+            GObject.source_remove(watch.source)
+            watch.source = None
+        del(self.watches[watch.terminal])
+
+    def on_destroy(self, _vte, watch):
+        """A terminal we are watching has gone away. Its VTE can still be
+        read here, so give the subscribers any output they haven't had"""
+        self.flush(watch.terminal)
+        watch.subscribers = {}
+        if watch.source is not None:
+            GObject.source_remove(watch.source)
+            watch.source = None
+        self.watches.pop(watch.terminal, None)
+
+    def on_contents_changed(self, _vte, watch):
+        """A terminal has output something. Schedule a flush, no sooner than
+        the configured rate allows"""
+        watch.dirty = True
+        if watch.source is not None:
+            return
+        delay = watch.last_flush + self.interval - monotonic()
+        if delay <= 0:
+            watch.source = GObject.idle_add(self.on_flush, watch)
+        else:
+            watch.source = GObject.timeout_add(int(delay * 1000) + 1,
+                                               self.on_flush, watch)
+
+    def on_flush(self, watch):
+        """Timer callback to flush a terminal's changes"""
+        watch.source = None
+        self.flush(watch.terminal)
+        return(False)
+
+    def flush(self, terminal):
+        """Tell the subscribers of a terminal about any output it has produced
+        since the last flush"""
+        watch = self.watches.get(terminal)
+        if watch is None or not watch.dirty:
+            return
+        if watch.source is not None:
+            GObject.source_remove(watch.source)
+            watch.source = None
+        watch.last_flush = monotonic()
+        watch.dirty = False
+
+        text = None
+        if watch.wants_text():
+            text = watch.read_text()
+        for (callback, wants_text) in list(watch.subscribers.values()):
+            try:
+                callback(terminal, text if wants_text else None)
+            except Exception as ex:
+                err('OutputWatch::flush: subscriber %s failed: %s' %
+                        (callback, ex))
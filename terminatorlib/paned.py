@@ -15,6 +15,7 @@ from .container import Container
 # pylint: disable-msg=E1101
 class Paned(Container):
     """Base class for Paned Containers"""
+    terminator_type = 'Paned'
 
     position = None
     maker = None
@@ -52,7 +53,7 @@ class Paned(Container):
             sibling.set_cwd(cwd)
             if self.config['always_split_with_profile']:
                 sibling.force_set_profile(None, widget.get_profile())
-            sibling.spawn_child()
+            sibling.spawn_child(pooled=True)
             if widget.group and self.config['split_to_group']:
                 sibling.set_group(None, widget.group)
         elif self.config['always_split_with_profile']:
@@ -89,6 +90,7 @@ class Paned(Container):
             self.children.append(widget)
         else:
             raise ValueError('Paned widgets can only have two children')
+        self.descendants_changed()
 
         if self.maker.isinstance(widget, 'Terminal'):
             top_window = self.get_toplevel()
@@ -113,13 +115,7 @@ class Paned(Container):
                     'rotate-cw': [top_window.rotate, True],
                     'rotate-ccw': [top_window.rotate, False]}
 
-            for signal in signals:
-                args = []
-                handler = signals[signal]
-                if isinstance(handler, list):
-                    args = handler[1:]
-                    handler = handler[0]
-                self.connect_child(widget, signal, handler, *args)
+            self.connect_children(widget, signals)
 
             if metadata and \
                'had_focus' in metadata and \
@@ -241,6 +237,7 @@ class Paned(Container):
 
     def remove(self, widget):
         """Remove a widget from the container"""
+        self.descendants_changed()
         Gtk.Paned.remove(self, widget)
         self.disconnect_child(widget)
         self.children.remove(widget)
@@ -509,6 +506,8 @@ class Paned(Container):
 
 class HPaned(Paned, Gtk.HPaned):
     """Merge Gtk.HPaned into our base Paned Container"""
+    terminator_type = 'HPaned'
+
     def __init__(self):
         """Class initialiser"""
         Paned.__init__(self)
@@ -527,6 +526,8 @@ class HPaned(Paned, Gtk.HPaned):
 
 class VPaned(Paned, Gtk.VPaned):
     """Merge Gtk.VPaned into our base Paned Container"""
+    terminator_type = 'VPaned'
+
     def __init__(self):
         """Class initialiser"""
         Paned.__init__(self)
@@ -27,8 +27,9 @@ import sys
 import os
 from . import borg
 from .config import Config
-from .util import dbg, err, get_config_dir
+from .util import dbg, err, get_config_dir, timer
 from .terminator import Terminator
+from .pluginmanifest import PluginManifest
 
 class Plugin(object):
     """Definition of our base plugin class"""
@@ -48,6 +49,10 @@ class PluginRegistry(borg.Borg):
     instances = None
     path = None
     done = None
+    manifest = None
+    plugin_files = None
+    capabilities = None
+    stats = None
 
     def __init__(self):
         """Class initialiser"""
@@ -69,56 +74,131 @@ class PluginRegistry(borg.Borg):
             self.done = False
         if not self.available_plugins:
             self.available_plugins = {}
+        if not self.manifest:
+            self.manifest = PluginManifest()
+        if not self.capabilities:
+            self.capabilities = {}
+        if not self.stats:
+            self.stats = {}
 
     def load_plugins(self):
-        """Load all plugins present in the plugins/ directory in our module"""
+        """Load the enabled plugins present in our plugin directories"""
         if self.done:
             dbg('PluginRegistry::load_plugins: Already loaded')
             return
 
         config = Config()
+        self.scan_plugins()
 
-        for plugindir in self.path:
-            sys.path.insert(0, plugindir)
-            try:
-                files = os.listdir(plugindir)
-            except OSError:
-                sys.path.remove(plugindir)
+        for item in config['enabled_plugins']:
+            if item not in self.plugin_files:
+                dbg('plugin %s not found, skipping' % item)
                 continue
-            for plugin in files:
-                if plugin == '__init__.py':
-                    continue
-                pluginpath = os.path.join(plugindir, plugin)
-                if os.path.isfile(pluginpath) and plugin[-3:] == '.py':
-                    dbg('PluginRegistry::load_plugins: Importing plugin %s' % 
-                        plugin)
-                    try:
-                        module = __import__(plugin[:-3], None, None, [''])
-                        for item in getattr(module, 'AVAILABLE'):
-                            if item not in list(self.available_plugins.keys()):
-                                func = getattr(module, item)
-                                self.available_plugins[item] = func
-
-                            if item not in config['enabled_plugins']:
-                                dbg('plugin %s not enabled, skipping' % item)
-                                continue
-                            if item not in self.instances:
-                                self.instances[item] = func()
-                    except Exception as ex:
-                        err('PluginRegistry::load_plugins: Importing plugin %s \
-failed: %s' % (plugin, ex))
+            if item not in self.instances:
+                func = self.get_plugin_class(item)
+                if func is not None:
+                    self.add_instance(item, func)
 
         self.done = True
 
+    def scan_plugins(self):
+        """Find out which plugins are available, from the manifest"""
+        self.plugin_files = self.manifest.scan(self.path, self.import_plugin)
+
+    def import_plugin(self, pluginpath):
+        """Import a plugin file, record the classes it makes available and
+        return its details for the manifest"""
+        (plugindir, plugin) = os.path.split(pluginpath)
+        if plugindir not in sys.path:
+            sys.path.insert(0, plugindir)
+        dbg('PluginRegistry::import_plugin: Importing plugin %s' % plugin)
+        try:
+            module = __import__(plugin[:-3], None, None, [''])
+            available = list(getattr(module, 'AVAILABLE'))
+        except Exception as ex:
+            err('PluginRegistry::import_plugin: Importing plugin %s \
+failed: %s' % (plugin, ex))
+            return(None)
+
+        capabilities = {}
+        for item in available:
+            func = getattr(module, item)
+            if item not in list(self.available_plugins.keys()):
+                self.available_plugins[item] = func
+            capabilities[item] = list(func.capabilities or [])
+        details = {'available': available, 'capabilities': capabilities}
+        self.manifest.update(pluginpath, details)
+        return(details)
+
+    def get_plugin_class(self, plugin):
+        """Return the class of a plugin, importing it if necessary"""
+        if plugin not in self.available_plugins:
+            if self.plugin_files is None:
+                self.scan_plugins()
+            if plugin in self.plugin_files:
+                self.import_plugin(self.plugin_files[plugin])
+        if plugin not in self.available_plugins:
+            err('PluginRegistry::get_plugin_class: %s is not available' %
+                    plugin)
+            return(None)
+        return(self.available_plugins[plugin])
+
+    def add_instance(self, plugin, func):
+        """Create an instance of a plugin class and index its capabilities"""
+        if plugin in self.instances:
+            self.remove_instance(plugin)
+        start = timer()
+        instance = func()
+        self.record('%s.__init__' % plugin, timer() - start)
+        self.instances[plugin] = instance
+        for capability in instance.capabilities or []:
+            self.capabilities.setdefault(capability, []).append(instance)
+
+    def remove_instance(self, plugin):
+        """Forget an instance of a plugin"""
+        instance = self.instances.pop(plugin)
+        for capability in instance.capabilities or []:
+            plugins = self.capabilities.get(capability, [])
+            if instance in plugins:
+                plugins.remove(instance)
+            if not plugins:
+                self.capabilities.pop(capability, None)
+        return(instance)
+
     def get_plugins_by_capability(self, capability):
         """Return a list of plugins with a particular capability"""
-        result = []
-        dbg('PluginRegistry::get_plugins_by_capability: searching %d plugins \
-for %s' % (len(self.instances), capability))
-        for plugin in self.instances:
-            if capability in self.instances[plugin].capabilities:
-                result.append(self.instances[plugin])
-        return result
+        return(list(self.capabilities.get(capability, [])))
+
+    def call(self, instance, method, *args):
+        """Call a method of a plugin, recording how long it took"""
+        start = timer()
+        try:
+            return(getattr(instance, method)(*args))
+        finally:
+            self.record('%s.%s' % (instance.__class__.__name__, method),
+                        timer() - start)
+
+    def record(self, name, elapsed):
+        """Add a call to the statistics for a plugin method"""
+        stats = self.stats.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+
+    def get_stats(self):
+        """Return the number of calls, total time and longest time taken, in
+        seconds, by each plugin method we have called"""
+        return(dict([(name, tuple(stats)) for name, stats in
+                     self.stats.items()]))
+
+    def format_stats(self):
+        """Return the plugin statistics as text, slowest first"""
+        lines = []
+        for name, stats in sorted(self.stats.items(),
+                                  key=lambda item: item[1][1], reverse=True):
+            lines.append('%-40s %6d calls %10.2f ms total %9.2f ms peak' %
+                         (name, stats[0], stats[1] * 1000, stats[2] * 1000))
+        return('\n'.join(lines))
 
     def get_all_plugins(self):
         """Return all plugins"""
@@ -126,8 +206,11 @@ for %s' % (len(self.instances), capability))
 
     def get_available_plugins(self):
         """Return a list of all available plugins whether they are enabled or
-        disabled"""
-        return(list(self.available_plugins.keys()))
+        disabled. This comes from the manifest, so disabled plugins are not
+        imported"""
+        if self.plugin_files is None:
+            self.scan_plugins()
+        return(list(self.plugin_files.keys()))
 
     def is_enabled(self, plugin):
         """Return a boolean value indicating whether a plugin is enabled or
@@ -139,13 +222,15 @@ for %s' % (len(self.instances), capability))
         if plugin in self.instances:
             err("Cannot enable plugin %s, already enabled" % plugin)
         dbg("Enabling %s" % plugin)
-        self.instances[plugin] = self.available_plugins[plugin]()
+        func = self.get_plugin_class(plugin)
+        if func is not None:
+            self.add_instance(plugin, func)
 
     def disable(self, plugin):
         """Disable a plugin"""
         dbg("Disabling %s" % plugin)
-        self.instances[plugin].unload()
-        del(self.instances[plugin])
+        self.call(self.instances[plugin], 'unload')
+        self.remove_instance(plugin)
 
 # This is where we should define a base class for each type of plugin we
 # support
@@ -0,0 +1,252 @@
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""pluginmanifest.py - Cached index of the plugins on disk
+
+The manifest records, for each plugin file, its mtime, the class names it
+lists in AVAILABLE and the capabilities of those classes. It is read from the
+plugin sources without importing them, so only enabled plugins need to be
+imported at startup. It is kept in the config dir and only files which have
+changed since it was written are read again.
+"""
+
+import ast
+import json
+import os
+import tempfile
+
+from .util import dbg, err, get_config_dir
+
+MANIFEST_VERSION = 1
+
+# Capabilities of the plugin base classes in plugin.py, for classes which
+# inherit them rather than setting their own
+BASE_CAPABILITIES = {'Plugin': [],
+                     'URLHandler': ['url_handler'],
+                     'MenuItem': ['terminal_menu']}
+
+# Older Pythons have no ast.Constant or AsyncFunctionDef, newer ones no ast.Str
+CONSTANT_NODE = getattr(ast, 'Constant', None)
+STR_NODE = getattr(ast, 'Str', None)
+SCOPE_NODES = tuple([getattr(ast, name) for name in
+                     ['FunctionDef', 'AsyncFunctionDef', 'ClassDef']
+                     if hasattr(ast, name)])
+
+try:
+    STRING_TYPES = basestring
+except NameError:
+    STRING_TYPES = str
+
+def literal_string(node):
+    """Return the value of a string literal, or None if it isn't one"""
+    if CONSTANT_NODE is not None and isinstance(node, CONSTANT_NODE):
+        value = node.value
+    elif STR_NODE is not None and isinstance(node, STR_NODE):
+        value = node.s
+    else:
+        return(None)
+    if not isinstance(value, STRING_TYPES):
+        return(None)
+    return(value)
+
+def literal_strings(node):
+    """Return the strings in a list/tuple literal, or None if it isn't one"""
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        return(None)
+    strings = []
+    for element in node.elts:
+        value = literal_string(element)
+        if value is None:
+            return(None)
+        strings.append(value)
+    return(strings)
+
+def module_statements(body):
+    """Yield the statements which run at import time, looking inside if, try
+    and with blocks but not into functions or classes"""
+    for node in body:
+        yield node
+        if isinstance(node, SCOPE_NODES):
+            continue
+        for field in ['body', 'orelse', 'finalbody']:
+            for child in module_statements(getattr(node, field, [])):
+                yield child
+        for handler in getattr(node, 'handlers', []):
+            for child in module_statements(handler.body):
+                yield child
+
+def scan_source(path):
+    """Read a plugin's AVAILABLE and capabilities from its source. Returns
+    None if they can't be worked out without importing it"""
+    try:
+        with open(path, 'r') as pluginfile:
+            tree = ast.parse(pluginfile.read(), path)
+    except (IOError, OSError, SyntaxError, ValueError) as ex:
+        err('PluginManifest::scan_source: Unable to read %s: %s' % (path, ex))
+        return(None)
+
+    available = []
+    classes = {}
+    for node in module_statements(tree.body):
+        if isinstance(node, ast.ClassDef):
+            classes[node.name] = node
+        elif isinstance(node, ast.Assign) and \
+             any(isinstance(target, ast.Name) and target.id == 'AVAILABLE'
+                 for target in node.targets):
+            names = literal_strings(node.value)
+            if names is None:
+                return(None)
+            # AVAILABLE may be set differently in try/except branches, so
+            # list everything it might contain
+            available.extend([name for name in names if name not in available])
+
+    def class_capabilities(name, seen):
+        """Find the capabilities of a class in this file"""
+        if name in seen:
+            return(None)
+        seen.add(name)
+        if name not in classes:
+            return(BASE_CAPABILITIES.get(name))
+        for node in classes[name].body:
+            if isinstance(node, ast.Assign) and \
+               any(isinstance(target, ast.Name) and
+                   target.id == 'capabilities' for target in node.targets):
+                return(literal_strings(node.value))
+        for base in classes[name].bases:
+            if isinstance(base, ast.Attribute):
+                base = base.attr
+            elif isinstance(base, ast.Name):
+                base = base.id
+            else:
+                continue
+            capabilities = class_capabilities(base, seen)
+            if capabilities is not None:
+                return(capabilities)
+        return(None)
+
+    capabilities = {}
+    for name in available:
+        found = class_capabilities(name, set())
+        if found is None:
+            return(None)
+        capabilities[name] = found
+    return({'available': available, 'capabilities': capabilities})
+
+class PluginManifest(object):
+    """Index of plugin files, their classes and capabilities"""
+    filename = None
+    entries = None
+
+    def __init__(self, filename=None):
+        """Class initialiser"""
+        if filename is None:
+            filename = os.path.join(get_config_dir(), 'plugins.json')
+        self.filename = filename
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        """Read the manifest from disk, if it exists"""
+        try:
+            with open(self.filename, 'r') as manifestfile:
+                manifest = json.load(manifestfile)
+        except (IOError, OSError, ValueError) as ex:
+            dbg('PluginManifest::load: Unable to read %s: %s' %
+                    (self.filename, ex))
+            return
+        if not isinstance(manifest, dict) or \
+           manifest.get('version') != MANIFEST_VERSION:
+            dbg('PluginManifest::load: Ignoring old manifest')
+            return
+        self.entries = manifest.get('plugins', {})
+
+    def save(self):
+        """Write the manifest to disk. It is written to a temporary file
+        which is then renamed over the old one, so another instance never
+        reads a half written manifest"""
+        dirname = os.path.dirname(self.filename)
+        tmpname = None
+        try:
+            try:
+                os.makedirs(dirname)
+            except OSError:
+                if not os.path.isdir(dirname):
+                    raise
+            tmpfd, tmpname = tempfile.mkstemp(dir=dirname, prefix='.plugins.')
+            with os.fdopen(tmpfd, 'w') as manifestfile:
+                json.dump({'version': MANIFEST_VERSION,
+                           'plugins': self.entries}, manifestfile, indent=1)
+            os.rename(tmpname, self.filename)
+        except (IOError, OSError) as ex:
+            err('PluginManifest::save: Unable to write %s: %s' %
+                    (self.filename, ex))
+            if tmpname is not None and os.path.exists(tmpname):
+                os.remove(tmpname)
+
+    def update(self, path, details):
+        """Record what a plugin file provides, e.g. after importing it"""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return
+        details = dict(details)
+        details['mtime'] = mtime
+        if self.entries.get(path) != details:
+            self.entries[path] = details
+            self.save()
+
+    def scan(self, plugindirs, importer):
+        """Bring the manifest up to date with the plugin directories. importer
+        is called with the path of any plugin whose source can't be read
+        statically, and should return its details. Returns a dict mapping
+        each available class name to the path of the file providing it"""
+        changed = False
+        seen = set()
+        for plugindir in plugindirs:
+            try:
+                files = sorted(os.listdir(plugindir))
+            except OSError:
+                continue
+            for plugin in files:
+                if plugin == '__init__.py' or plugin[-3:] != '.py':
+                    continue
+                path = os.path.join(plugindir, plugin)
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
+                seen.add(path)
+                entry = self.entries.get(path)
+                if entry is not None and entry.get('mtime') == mtime:
+                    continue
+
+                dbg('PluginManifest::scan: Reading %s' % path)
+                details = scan_source(path)
+                if details is None:
+                    details = importer(path)
+                if details is None:
+                    details = {'available': [], 'capabilities': {}}
+                details['mtime'] = mtime
+                self.entries[path] = details
+                changed = True
+
+        for path in list(self.entries.keys()):
+            if path not in seen:
+                del(self.entries[path])
+                changed = True
+        if changed:
+            self.save()
+
+        plugins = {}
+        for plugindir in plugindirs:
+            for path in sorted(self.entries.keys()):
+                if os.path.dirname(path) != plugindir:
+                    continue
+                for name in self.entries[path]['available']:
+                    if name not in plugins:
+                        plugins[name] = path
+        return(plugins)
+
+    def get_capabilities(self, path, name):
+        """Return the capabilities recorded for a plugin class"""
+        entry = self.entries.get(path, {})
+        return(entry.get('capabilities', {}).get(name, []))
@@ -2,15 +2,17 @@
 # GPL v2 only
 """activitywatch.py - Terminator Plugin to watch a terminal for activity"""
 
-import time
+import math
 import gi
 from gi.repository import Gtk
 from gi.repository import GObject
+from gi.repository import GLib
 
 from terminatorlib.config import Config
 import terminatorlib.plugin as plugin
+from terminatorlib.outputwatch import OutputWatch
 from terminatorlib.translation import _
-from terminatorlib.util import err, dbg
+from terminatorlib.util import err, dbg, monotonic
 from terminatorlib.version import APP_NAME
 
 try:
@@ -31,12 +33,123 @@ watch_interval = int(config.plugin_get('InactivityWatch', 'watch_interval',
 hush_period = float(config.plugin_get('ActivityWatch', 'hush_period',
                                         10.0))
 
+class NotificationBatch(object):
+    """Shows one notification for every terminal added to it since the last
+    time it was shown, reusing the same notification each time"""
+    message = None
+    notification = None
+    pending = None
+    source = None
+
+    def __init__(self, message):
+        self.message = message
+        self.pending = []
+
+    def add(self, terminal):
+        """Include a terminal in the next notification"""
+        if terminal not in self.pending:
+            self.pending.append(terminal)
+        if self.source is None:
+            self.source = GObject.idle_add(self.show)
+
+    def discard(self, terminal):
+        """Forget a terminal which hasn't been notified about yet"""
+        if terminal in self.pending:
+            self.pending.remove(terminal)
+
+    def show(self):
+        """Show a notification listing the pending terminals"""
+        self.source = None
+        if not self.pending:
+            return False
+        body = self.message % ', '.join([terminal.get_window_title()
+                                         for terminal in self.pending])
+        self.pending = []
+        if self.notification is None:
+            self.notification = Notify.Notification.new(_('Terminator'), body,
+                                                        'terminator')
+        else:
+            self.notification.update(_('Terminator'), body, 'terminator')
+        try:
+            self.notification.show()
+        except GLib.Error as ex:
+            err('NotificationBatch::show: Unable to notify: %s' % ex)
+        return False
+
+class TimerWheel(object):
+    """Tracks when terminals were last active and calls back with those
+    which have been quiet for a period. Deadlines are kept in slots of one
+    tick each, so one timer serves every terminal and activity only has to
+    update a timestamp"""
+    period = None
+    tick = None
+    callback = None
+    last_activities = None
+    slots = None
+    scheduled = None
+    source = None
+
+    def __init__(self, period, tick, callback):
+        self.period = period
+        self.tick = tick
+        self.callback = callback
+        self.last_activities = {}
+        self.slots = {}
+        self.scheduled = {}
+
+    def touch(self, terminal):
+        """Record activity in a terminal"""
+        now = monotonic()
+        self.last_activities[terminal] = now
+        if terminal not in self.scheduled:
+            self.schedule(terminal, now + self.period)
+
+    def remove(self, terminal):
+        """Stop tracking a terminal"""
+        self.last_activities.pop(terminal, None)
+        slot = self.scheduled.pop(terminal, None)
+        if slot is not None:
+            self.slots[slot].discard(terminal)
+            if not self.slots[slot]:
+                del(self.slots[slot])
+
+    def schedule(self, terminal, deadline):
+        """Check a terminal again in the first tick after deadline"""
+        slot = int(math.ceil(deadline / self.tick))
+        self.slots.setdefault(slot, set()).add(terminal)
+        self.scheduled[terminal] = slot
+        if self.source is None:
+            self.source = GObject.timeout_add(int(self.tick * 1000),
+                                              self.on_tick)
+
+    def on_tick(self):
+        """Find the terminals which have gone quiet since the last tick"""
+        now = monotonic()
+        current = int(now / self.tick)
+        quiet = []
+        for slot in sorted([slot for slot in self.slots if slot <= current]):
+            for terminal in self.slots.pop(slot):
+                del(self.scheduled[terminal])
+                deadline = self.last_activities[terminal] + self.period
+                if deadline <= now:
+                    # Only notify once until there is more activity
+                    del(self.last_activities[terminal])
+                    quiet.append(terminal)
+                else:
+                    self.schedule(terminal, deadline)
+        if quiet:
+            self.callback(quiet)
+        if not self.slots:
+            self.source = None
+            return False
+        return True
+
 class ActivityWatch(plugin.MenuItem):
     """Add custom commands to the terminal menu"""
     capabilities = ['terminal_menu']
     watches = None
     last_notifies = None
-    timers = None
+    notifications = None
 
     def __init__(self):
         plugin.MenuItem.__init__(self)
@@ -44,8 +157,8 @@ class ActivityWatch(plugin.MenuItem):
             self.watches = {}
         if not self.last_notifies:
             self.last_notifies = {}
-        if not self.timers:
-            self.timers = {}
+        if not self.notifications:
+            self.notifications = NotificationBatch(_('Activity in: %s'))
 
         Notify.init(APP_NAME.capitalize())
 
@@ -62,56 +175,59 @@ class ActivityWatch(plugin.MenuItem):
 
     def watch(self, _widget, terminal):
         """Watch a terminal"""
-        vte = terminal.get_vte()
-        self.watches[terminal] = vte.connect('contents-changed', 
-                                             self.notify, terminal)
+        self.watches[terminal] = (
+            OutputWatch().subscribe(terminal, self.notify),
+            terminal.get_vte().connect('destroy', self.on_destroy, terminal))
 
     def unwatch(self, _widget, terminal):
         """Stop watching a terminal"""
-        vte = terminal.get_vte()
-        vte.disconnect(self.watches[terminal])
-        del(self.watches[terminal])
+        subscription, handler = self.watches[terminal]
+        OutputWatch().unsubscribe(terminal, subscription)
+        terminal.get_vte().disconnect(handler)
+        self.forget(terminal)
 
-    def notify(self, _vte, terminal):
-        """Notify that a terminal did something"""
-        show_notify = False
+    def on_destroy(self, _vte, terminal):
+        """A watched terminal has gone away. OutputWatch drops our
+        subscription itself"""
+        self.forget(terminal)
+
+    def forget(self, terminal):
+        """Drop everything we know about a terminal"""
+        self.watches.pop(terminal, None)
+        self.last_notifies.pop(terminal, None)
+        self.notifications.discard(terminal)
 
+    def notify(self, terminal, _text):
+        """Notify that a terminal did something"""
         # Don't notify if the user is already looking at this terminal.
         if terminal.vte.has_focus():
             return True
 
-        note = Notify.Notification.new(_('Terminator'), _('Activity in: %s') % 
-                                  terminal.get_window_title(), 'terminator')
-
-        this_time = time.mktime(time.gmtime())
-        if terminal not in self.last_notifies:
-            show_notify = True
-        else:
-            last_time = self.last_notifies[terminal]
-            if this_time - last_time > hush_period:
-                show_notify = True
-
-        if show_notify == True:
-            note.show()
-            self.last_notifies[terminal] = this_time
+        this_time = monotonic()
+        last_time = self.last_notifies.get(terminal)
+        if last_time is not None and this_time - last_time <= hush_period:
+            return True
 
+        self.last_notifies[terminal] = this_time
+        self.notifications.add(terminal)
         return True
 
 class InactivityWatch(plugin.MenuItem):
     """Add custom commands to notify when a terminal goes inactive"""
     capabilities = ['terminal_menu']
     watches = None
-    last_activities = None
-    timers = None
+    wheel = None
+    notifications = None
 
     def __init__(self):
         plugin.MenuItem.__init__(self)
         if not self.watches:
             self.watches = {}
-        if not self.last_activities:
-            self.last_activities = {}
-        if not self.timers:
-            self.timers = {}
+        if not self.wheel:
+            self.wheel = TimerWheel(inactive_period, watch_interval / 1000.0,
+                                    self.on_silence)
+        if not self.notifications:
+            self.notifications = NotificationBatch(_('Silence in: %s'))
 
         Notify.init(APP_NAME.capitalize())
 
@@ -128,39 +244,33 @@ class InactivityWatch(plugin.MenuItem):
 
     def watch(self, _widget, terminal):
         """Watch a terminal"""
-        vte = terminal.get_vte()
-        self.watches[terminal] = vte.connect('contents-changed',
-                                             self.reset_timer, terminal)
-        timeout_id = GObject.timeout_add(watch_interval, self.check_times, terminal)
-        self.timers[terminal] = timeout_id
-        dbg('timer %s added for %s' %(timeout_id, terminal))
+        self.watches[terminal] = (
+            OutputWatch().subscribe(terminal, self.reset_timer),
+            terminal.get_vte().connect('destroy', self.on_destroy, terminal))
 
     def unwatch(self, _vte, terminal):
         """Unwatch a terminal"""
-        vte = terminal.get_vte()
-        vte.disconnect(self.watches[terminal])
-        del(self.watches[terminal])
-        GObject.source_remove(self.timers[terminal])
-        del(self.timers[terminal])
+        subscription, handler = self.watches[terminal]
+        OutputWatch().unsubscribe(terminal, subscription)
+        terminal.get_vte().disconnect(handler)
+        self.forget(terminal)
 
-    def reset_timer(self, _vte, terminal):
-        """Reset the last-changed time for a terminal"""
-        time_now = time.mktime(time.gmtime())
-        self.last_activities[terminal] = time_now
-        dbg('reset activity time for %s' % terminal)
-
-    def check_times(self, terminal):
-        """Check if this terminal has gone silent"""
-        time_now = time.mktime(time.gmtime())
-        if terminal not in self.last_activities:
-            dbg('Terminal %s has no last activity' % terminal)
-            return True
+    def on_destroy(self, _vte, terminal):
+        """A watched terminal has gone away"""
+        self.forget(terminal)
 
-        dbg('seconds since last activity: %f (%s)' % (time_now - self.last_activities[terminal], terminal))
-        if time_now - self.last_activities[terminal] >= inactive_period:
-            del(self.last_activities[terminal])
-            note = Notify.Notification.new(_('Terminator'), _('Silence in: %s') % 
-                                         terminal.get_window_title(), 'terminator')
-            note.show()
+    def forget(self, terminal):
+        """Drop everything we know about a terminal"""
+        self.watches.pop(terminal, None)
+        self.wheel.remove(terminal)
+        self.notifications.discard(terminal)
 
-        return True
+    def reset_timer(self, terminal, _text):
+        """Reset the last-changed time for a terminal"""
+        self.wheel.touch(terminal)
+
+    def on_silence(self, terminals):
+        """Notify about terminals which have gone silent"""
+        for terminal in terminals:
+            dbg('Terminal %s has gone silent' % terminal)
+            self.notifications.add(terminal)
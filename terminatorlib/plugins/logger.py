@@ -7,11 +7,28 @@ terminals """
 import os
 import sys
 from gi.repository import Gtk
+from terminatorlib.config import Config
+from terminatorlib.logwriter import LogWriter
 import terminatorlib.plugin as plugin
+from terminatorlib.outputwatch import OutputWatch
 from terminatorlib.translation import _
 
 AVAILABLE = ['Logger']
 
+def get_writer_options():
+    """Read the LogWriter settings from the plugin's config section"""
+    config = Config()
+    compress = config.plugin_get('Logger', 'compress', 'none')
+    return({'queue_size': int(config.plugin_get('Logger', 'queue_size', 1000)),
+            'rotate_size': int(config.plugin_get('Logger', 'rotate_size', 0)),
+            'rotate_interval': float(config.plugin_get('Logger',
+                                                       'rotate_interval', 0)),
+            'rotate_keep': int(config.plugin_get('Logger', 'rotate_keep', 5)),
+            'compress': None if compress == 'none' else compress,
+            'fsync': config.plugin_get('Logger', 'fsync', 'never'),
+            'fsync_interval': float(config.plugin_get('Logger',
+                                                      'fsync_interval', 5))})
+
 class Logger(plugin.MenuItem):
     """ Add custom command to the terminal menu"""
     capabilities = ['terminal_menu']
@@ -35,30 +52,18 @@ class Logger(plugin.MenuItem):
             item = Gtk.MenuItem.new_with_mnemonic(_('Stop _Logger'))
             item.connect("activate", self.stop_logger, terminal)
             item.set_has_tooltip(True)
-            item.set_tooltip_text("Saving at '" + self.loggers[vte_terminal]["filepath"] + "'")
+            tooltip = "Saving at '" + self.loggers[vte_terminal]["filepath"] + "'"
+            dropped = self.loggers[vte_terminal]["fd"].get_stats()['dropped']
+            if dropped:
+                tooltip += "\n" + _("%d bytes could not be logged") % dropped
+            item.set_tooltip_text(tooltip)
         menuitems.append(item)
         
-    def write_content(self, terminal, row_start, col_start, row_end, col_end):
-        """ Final function to write a file """
-        content = terminal.get_text_range(row_start, col_start, row_end, col_end,
-                                          lambda *a: True)
-        content = content[0]
-        fd = self.loggers[terminal]["fd"]
-        # Don't write the last char which is always '\n'
-        fd.write(content[:-1])
-        self.loggers[terminal]["col"] = col_end
-        self.loggers[terminal]["row"] = row_end
-
-    def save(self, terminal):
-        """ 'contents-changed' callback """
-        last_saved_col = self.loggers[terminal]["col"]
-        last_saved_row = self.loggers[terminal]["row"]
-        (col, row) = terminal.get_cursor_position()
-        # Save only when buffer is nearly full,
-        # for the sake of efficiency
-        if row - last_saved_row < terminal.get_row_count():
-            return
-        self.write_content(terminal, last_saved_row, last_saved_col, row, col)
+    def save(self, terminal, content):
+        """ OutputWatch callback with the text output since the last call.
+        It is queued for the LogWriter's thread, so this never blocks """
+        fd = self.loggers[terminal.get_vte()]["fd"]
+        fd.write(content)
         
     def start_logger(self, _widget, Terminal):
         """ Handle menu item callback by saving text to a file"""
@@ -74,22 +79,23 @@ class Logger(plugin.MenuItem):
             try:
                 logfile = os.path.join(savedialog.get_current_folder(),
                                        savedialog.get_filename())
-                fd = open(logfile, 'w+')
+                fd = LogWriter(logfile, **get_writer_options())
                 # Save log file path, 
-                # associated file descriptor, signal handler id
-                # and last saved col,row positions respectively.
+                # associated LogWriter and OutputWatch subscription
                 vte_terminal = Terminal.get_vte()
-                (col, row) = vte_terminal.get_cursor_position()
-
                 self.loggers[vte_terminal] = {"filepath":logfile,
-                                              "handler_id":0, "fd":fd,
-                                              "col":col, "row":row}
-                # Add contents-changed callback
-                self.loggers[vte_terminal]["handler_id"] = vte_terminal.connect('contents-changed', self.save)
+                                              "subscription":0, "fd":fd}
+                # Have OutputWatch send us new output
+                self.loggers[vte_terminal]["subscription"] = OutputWatch().subscribe(
+                    Terminal, self.save, wants_text=True)
+                # Stop logging if the terminal is closed
+                self.loggers[vte_terminal]["handler"] = vte_terminal.connect(
+                    'destroy', self.on_destroy)
             except:
                 e = sys.exc_info()[1]
                 error = Gtk.MessageDialog(None, Gtk.DialogFlags.MODAL, Gtk.MessageType.ERROR,
-                                          Gtk.ButtonsType.OK, e.strerror)
+                                          Gtk.ButtonsType.OK,
+                                          getattr(e, 'strerror', None) or str(e))
                 error.set_transient_for(savedialog)
                 error.run()
                 error.destroy()
@@ -97,13 +103,18 @@ class Logger(plugin.MenuItem):
 
     def stop_logger(self, _widget, terminal):
         vte_terminal = terminal.get_vte()
-        last_saved_col = self.loggers[vte_terminal]["col"]
-        last_saved_row = self.loggers[vte_terminal]["row"]
-        (col, row) = vte_terminal.get_cursor_position()
-        if last_saved_col != col or last_saved_row != row:
-            # Save unwritten bufer to the file
-            self.write_content(vte_terminal, last_saved_row, last_saved_col, row, col)
+        # Save unwritten buffer to the file
+        watcher = OutputWatch()
+        watcher.flush(terminal)
         fd = self.loggers[vte_terminal]["fd"]
         fd.close()
-        vte_terminal.disconnect(self.loggers[vte_terminal]["handler_id"])
+        watcher.unsubscribe(terminal, self.loggers[vte_terminal]["subscription"])
+        vte_terminal.disconnect(self.loggers[vte_terminal]["handler"])
         del(self.loggers[vte_terminal])
+
+    def on_destroy(self, vte_terminal):
+        """ A logged terminal has gone away, so finish its log. OutputWatch
+        drops the subscription itself """
+        logger = self.loggers.pop(vte_terminal, None)
+        if logger is not None:
+            logger["fd"].close()
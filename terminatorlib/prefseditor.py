@@ -121,6 +121,7 @@ class PrefsEditor:
                         'close_term'       : _('Close terminal'),
                         'copy'             : _('Copy selected text'),
                         'paste'            : _('Paste clipboard'),
+                        'paste_to_group'   : _('Paste clipboard to broadcast targets in chunks'),
                         'toggle_scrollbar' : _('Show/Hide the scrollbar'),
                         'search'           : _('Search terminal scrollback'),
                         'page_up'          : _('Scroll upwards one page'),
@@ -228,7 +229,7 @@ class PrefsEditor:
     def on_closebutton_clicked(self, _button):
         """Close the window"""
         terminator = Terminator()
-        terminator.reconfigure()
+        terminator.queue_reconfigure()
         self.window.destroy()
         self.calling_window.preventHide = False
         del(self)
@@ -1011,7 +1012,7 @@ class PrefsEditor:
             self.config['foreground_color'] = fg
             self.config.save()
             terminator = Terminator()
-            terminator.reconfigure()
+            terminator.queue_reconfigure()
         dialog.destroy()
 
     def on_foreground_colorpicker_color_change(self, widget, color):
@@ -1019,7 +1020,7 @@ class PrefsEditor:
         self.config['foreground_color'] = rgba2hex(widget)
         self.config.save()
         terminator = Terminator()
-        terminator.reconfigure()
+        terminator.queue_reconfigure()
 
     def on_background_colorbutton_draw(self, widget, cr):
         width = widget.get_allocated_width()
@@ -1042,7 +1043,7 @@ class PrefsEditor:
             self.config['background_color'] = orig
             self.config.save()
             terminator = Terminator()
-            terminator.reconfigure()
+            terminator.queue_reconfigure()
         dialog.destroy()
 
     def on_background_colorpicker_color_change(self, widget, color):
@@ -1050,7 +1051,7 @@ class PrefsEditor:
         self.config['background_color'] = rgba2hex(widget)
         self.config.save()
         terminator = Terminator()
-        terminator.reconfigure()
+        terminator.queue_reconfigure()
 
     def get_palette_widget(self, palette_id):
         """Returns the palette widget for the given palette ID."""
@@ -1119,7 +1120,7 @@ class PrefsEditor:
             def on_color_set(_, color):
                 # The color is set, so save the palette config and refresh Terminator
                 self.replace_palette_color(palette_id, dialog.get_rgba().to_color())
-                terminator.reconfigure()
+                terminator.queue_reconfigure()
             dialog.connect('notify::rgba', on_color_set)
 
             # Show the dialog
@@ -1127,7 +1128,7 @@ class PrefsEditor:
             if res != Gtk.ResponseType.OK:
                 # User cancelled the color change, so reset to the original.
                 self.replace_palette_color(palette_id, orig)
-                terminator.reconfigure()
+                terminator.queue_reconfigure()
         finally:
             if dialog:
                 dialog.destroy()
@@ -1763,6 +1764,8 @@ class PrefsEditor:
         binding = liststore.get_value(liststore.get_iter(path), 0)
         accel = Gtk.accelerator_name(key, mods)
         self.config['keybindings'][binding] = accel
+        # Changed in place, so tell the config its resolved views are stale
+        self.config.base.invalidate()
         self.config.save()
 
     def on_cellrenderer_accel_cleared(self, liststore, path):
@@ -1772,6 +1775,7 @@ class PrefsEditor:
 
         binding = liststore.get_value(liststore.get_iter(path), 0)
         self.config['keybindings'][binding] = ""
+        self.config.base.invalidate()
         self.config.save()
 
     def on_open_manual(self,  widget):
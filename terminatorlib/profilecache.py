@@ -0,0 +1,137 @@
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""profilecache.py - Parsed render resources shared by all terminals of a
+profile"""
+
+import gi
+gi.require_version('Vte', '2.91')
+from gi.repository import Gdk, Pango, Vte
+
+from .borg import Borg
+from .util import dbg, err
+
+def erase_binding(name):
+    """Convert a backspace_binding/delete_binding value to a Vte constant"""
+    try:
+        if name == 'ascii-del':
+            return(Vte.ERASE_ASCII_DELETE)
+        elif name == 'control-h':
+            return(Vte.ERASE_ASCII_BACKSPACE)
+        elif name == 'escape-sequence':
+            return(Vte.ERASE_DELETE_SEQUENCE)
+        else:
+            return(Vte.ERASE_AUTO)
+    except AttributeError:
+        if name == 'ascii-del':
+            return(2)
+        elif name == 'control-h':
+            return(1)
+        elif name == 'escape-sequence':
+            return(3)
+        else:
+            return(0)
+
+def parse_color(spec):
+    """Parse a colour string into a new Gdk.RGBA"""
+    color = Gdk.RGBA()
+    color.parse(spec)
+    return(color)
+
+def dim_color(color, bgcolor, offset):
+    """Blend a colour towards a background colour. This matches what painting
+    the background over the colour with an alpha of (1 - offset) looks like"""
+    dimmed = Gdk.RGBA()
+    dimmed.red = color.red * offset + bgcolor.red * (1 - offset)
+    dimmed.green = color.green * offset + bgcolor.green * (1 - offset)
+    dimmed.blue = color.blue * offset + bgcolor.blue * (1 - offset)
+    dimmed.alpha = color.alpha
+    return(dimmed)
+
+class ProfileResources(object):
+    """The parsed form of a profile's colours, fonts and bindings. These
+    objects are shared between terminals and must not be modified"""
+    fontname = None
+    font = None
+    fgcolor = None
+    bgcolor = None
+    palette = None
+    cursor_color = None
+    cursor_shape = None
+    backspace_binding = None
+    delete_binding = None
+    dimmed = None
+
+    def __init__(self, config, fontname):
+        """Class initialiser"""
+        self.dimmed = {}
+        self.fontname = fontname
+        if fontname:
+            self.font = Pango.FontDescription(fontname)
+
+        # When using theme colours these depend on the widget's style, so
+        # the terminal has to look them up itself
+        if not config['use_theme_colors']:
+            self.fgcolor = parse_color(config['foreground_color'])
+            self.bgcolor = parse_color(config['background_color'])
+            if config['background_type'] in ['transparent', 'image']:
+                self.bgcolor.alpha = config['background_darkness']
+            else:
+                self.bgcolor.alpha = 1
+
+        self.palette = [parse_color(color) for color in
+                        config['palette'].split(':') if color]
+
+        if not config['cursor_color_fg']:
+            self.cursor_color = parse_color(config['cursor_color'])
+        try:
+            self.cursor_shape = getattr(Vte.CursorShape,
+                                        config['cursor_shape'].upper())
+        except AttributeError:
+            err('unknown cursor shape: %s' % config['cursor_shape'])
+            self.cursor_shape = Vte.CursorShape.BLOCK
+
+        self.backspace_binding = erase_binding(config['backspace_binding'])
+        self.delete_binding = erase_binding(config['delete_binding'])
+
+    def get_dimmed(self, fgcolor, bgcolor, offset):
+        """Return the foreground colour and palette dimmed towards bgcolor,
+        for terminals which don't have focus"""
+        key = (fgcolor.to_string(), bgcolor.to_string(), offset)
+        if key not in self.dimmed:
+            self.dimmed[key] = (dim_color(fgcolor, bgcolor, offset),
+                                [dim_color(color, bgcolor, offset)
+                                 for color in self.palette])
+        return(self.dimmed[key])
+
+class ProfileCache(Borg):
+    """Cache of ProfileResources, one per profile, rebuilt whenever the
+    config generation or the system font changes"""
+    resources = None
+
+    def __init__(self):
+        """Class initialiser"""
+        Borg.__init__(self, self.__class__.__name__)
+        self.prepare_attributes()
+
+    def prepare_attributes(self):
+        """Initialise anything that isn't already"""
+        if self.resources is None:
+            self.resources = {}
+
+    def get(self, config):
+        """Return the ProfileResources for the profile of a Config"""
+        profile = config.get_profile()
+        if config['use_system_font'] == True:
+            fontname = config.get_system_mono_font()
+        else:
+            fontname = config['font']
+        key = (config.base.generation, fontname)
+
+        cached = self.resources.get(profile)
+        if cached is not None and cached[0] == key:
+            return(cached[1])
+
+        dbg('ProfileCache::get: parsing resources for %s', profile)
+        resources = ProfileResources(config, fontname)
+        self.resources[profile] = (key, resources)
+        return(resources)
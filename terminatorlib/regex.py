@@ -20,3 +20,29 @@ if hasattr(Vte, 'REGEX_FLAGS_DEFAULT'):
     FLAGS_PCRE2 = (Vte.REGEX_FLAGS_DEFAULT | PCRE2_MULTILINE)
 else:
     FLAGS_PCRE2 = None
+
+# Compiled regexes are immutable, so every terminal can share them. These are
+# keyed by (pattern, flags), and a PCRE2 pattern VTE can't compile is cached
+# as None so we go straight to GLib next time
+MATCH_REGEX_CACHE = {}
+MATCH_GREGEX_CACHE = {}
+
+def match_regex(pattern, flags):
+    """Return a Vte.Regex for matching pattern, or None if it won't compile"""
+    key = (pattern, flags)
+    if key not in MATCH_REGEX_CACHE:
+        try:
+            MATCH_REGEX_CACHE[key] = Vte.Regex.new_for_match(pattern,
+                                                             len(pattern),
+                                                             flags)
+        except GLib.Error:
+            # happens when PCRE2 support is not builtin (Ubuntu < 19.10)
+            MATCH_REGEX_CACHE[key] = None
+    return(MATCH_REGEX_CACHE[key])
+
+def match_gregex(pattern, flags):
+    """Return a GLib.Regex for matching pattern"""
+    key = (pattern, flags)
+    if key not in MATCH_GREGEX_CACHE:
+        MATCH_GREGEX_CACHE[key] = GLib.Regex.new(pattern, flags, 0)
+    return(MATCH_GREGEX_CACHE[key])
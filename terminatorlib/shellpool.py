@@ -0,0 +1,128 @@
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""shellpool.py - A small pool of pre-spawned shells, so that new tabs and
+splits can attach to a running shell instead of waiting for fork/exec"""
+
+import gi
+gi.require_version('Vte', '2.91')
+from gi.repository import GLib, GObject, Vte
+
+from .borg import Borg
+from .config import Config
+from .util import dbg, err, make_uuid
+
+class PooledShell(object):
+    """A shell running on a pty that no terminal is displaying yet"""
+    key = None
+    pty = None
+    pid = None
+    uuid = None
+    watch = None
+
+    def __init__(self, key):
+        """Class initialiser"""
+        self.key = key
+        self.uuid = make_uuid()
+
+class ShellPool(Borg):
+    """Pool of pre-spawned shells, keyed on everything that affects how the
+    shell was started: its working directory, arguments and environment"""
+    shells = None
+
+    def __init__(self):
+        """Class initialiser"""
+        Borg.__init__(self, self.__class__.__name__)
+        self.prepare_attributes()
+
+    def prepare_attributes(self):
+        """Initialise anything that isn't already"""
+        if self.shells is None:
+            self.shells = []
+
+    def get_size(self):
+        """Return the configured pool size, or 0 if we can't pool"""
+        if not hasattr(Vte.Pty, 'spawn_async'):
+            return(0)
+        return(max(Config()['spawn_pool_size'], 0))
+
+    def take(self, cwd, args, envv):
+        """Return a ready shell matching the supplied details, if we have one.
+        The caller must use the shell's uuid for its terminal"""
+        key = (cwd, tuple(args), tuple(envv))
+        for shell in self.shells:
+            if shell.key == key and shell.pid is not None and shell.pid > 0:
+                self.shells.remove(shell)
+                GLib.source_remove(shell.watch)
+                dbg('ShellPool::take: using pooled shell %d', shell.pid)
+                return(shell)
+        return(None)
+
+    def fill(self, cwd, args, envv):
+        """Top up the pool with shells matching the supplied details, once the
+        main loop is idle"""
+        size = self.get_size()
+        if size == 0:
+            return
+        key = (cwd, tuple(args), tuple(envv))
+        # Only keep shells for the most recently used details
+        for shell in [shell for shell in self.shells if shell.key != key]:
+            self.discard(shell)
+        for _i in range(len(self.shells), size):
+            shell = PooledShell(key)
+            self.shells.append(shell)
+            GObject.idle_add(self.spawn, shell)
+
+    def spawn(self, shell):
+        """Start a shell for the pool"""
+        if shell not in self.shells:
+            return(False)
+        cwd, args, envv = shell.key
+        envv = list(envv) + ['TERMINATOR_UUID=%s' % shell.uuid.urn]
+        try:
+            shell.pty = Vte.Pty.new_sync(Vte.PtyFlags.DEFAULT, None)
+            shell.pty.spawn_async(cwd, list(args), envv,
+                                  GLib.SpawnFlags.FILE_AND_ARGV_ZERO |
+                                  GLib.SpawnFlags.DO_NOT_REAP_CHILD,
+                                  None, None, -1, None, self.on_spawned,
+                                  shell)
+        except GLib.Error as ex:
+            err('ShellPool::spawn: unable to start shell: %s' % ex)
+            self.shells.remove(shell)
+        return(False)
+
+    def on_spawned(self, _pty, result, shell):
+        """A pooled shell has started"""
+        try:
+            _success, pid = shell.pty.spawn_finish(result)
+        except GLib.Error as ex:
+            err('ShellPool::on_spawned: unable to start shell: %s' % ex)
+            if shell in self.shells:
+                self.shells.remove(shell)
+            return
+        if pid <= 0:
+            err('ShellPool::on_spawned: shell started without a pid')
+            if shell in self.shells:
+                self.shells.remove(shell)
+            shell.pty.close()
+            return
+        dbg('ShellPool::on_spawned: pooled shell %d is ready', pid)
+        shell.pid = pid
+        shell.watch = GLib.child_watch_add(GLib.PRIORITY_DEFAULT, pid,
+                                           self.on_exited, shell)
+        if shell not in self.shells:
+            self.discard(shell)
+
+    def on_exited(self, pid, _status, shell):
+        """A pooled shell exited before anyone used it"""
+        dbg('ShellPool::on_exited: pooled shell %d exited', pid)
+        GLib.spawn_close_pid(pid)
+        shell.watch = None
+        if shell in self.shells:
+            self.shells.remove(shell)
+
+    def discard(self, shell):
+        """Close the pty of a shell we no longer want, which hangs it up"""
+        if shell in self.shells:
+            self.shells.remove(shell)
+        if shell.pty is not None and shell.pid is not None:
+            shell.pty.close()
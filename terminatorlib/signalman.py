@@ -2,58 +2,102 @@
 # GPL v2 only
 """Simple management of Gtk Widget signal handlers"""
 
+import weakref
+
 from .util import dbg, err
 
+# Every Signalman still alive, so census() can count across all of them
+SIGNALMEN = weakref.WeakSet()
+
+def census():
+    """Return the number of connected handlers tracked by all Signalmen,
+    by widget type. Useful for spotting leaks in long running sessions"""
+    counts = {}
+    for signalman in list(SIGNALMEN):
+        for name, count in signalman.census().items():
+            counts[name] = counts.get(name, 0) + count
+    return(counts)
+
 class Signalman(object):
-    """Class providing glib signal tracking and management"""
+    """Class providing glib signal tracking and management. Widgets are held
+    weakly, so a widget which is finalised without remove_widget being
+    called on it is forgotten along with its handlers"""
 
     cnxids = None
 
     def __init__(self):
         """Class initialiser"""
-        self.cnxids = {}
+        self.cnxids = weakref.WeakKeyDictionary()
+        SIGNALMEN.add(self)
 
     def __del__(self):
         """Class destructor. This is only used to check for stray signals"""
-        if len(list(self.cnxids.keys())) > 0:
-            dbg('Remaining signals: %s' % self.cnxids)
+        if len(self.cnxids) > 0:
+            dbg('Remaining signals: %s', dict(self.cnxids))
 
     def new(self, widget, signal, handler, *args):
         """Register a new signal on a widget"""
         if widget not in self.cnxids:
-            dbg('creating new bucket for %s' % type(widget))
+            dbg('creating new bucket for %s', type(widget))
             self.cnxids[widget] = {}
 
         if signal in self.cnxids[widget]:
             err('%s already has a handler for %s' % (id(widget), signal))
 
         self.cnxids[widget][signal] = widget.connect(signal, handler, *args)
-        dbg('connected %s::%s to %s' % (type(widget), signal, handler))
+        dbg('connected %s::%s to %s', type(widget), signal, handler)
         return(self.cnxids[widget][signal])
 
+    def new_batch(self, widget, signals):
+        """Register several signals on a widget. signals maps each signal
+        name to a handler, or to a list of a handler and its extra args.
+        Returns a dict of the handler IDs by signal name"""
+        if widget not in self.cnxids:
+            self.cnxids[widget] = {}
+        bucket = self.cnxids[widget]
+
+        cnxids = {}
+        for signal, handler in signals.items():
+            args = []
+            if isinstance(handler, list):
+                args = handler[1:]
+                handler = handler[0]
+            if signal in bucket:
+                err('%s already has a handler for %s' % (id(widget), signal))
+            cnxids[signal] = widget.connect(signal, handler, *args)
+        bucket.update(cnxids)
+        dbg('connected %d signals for %s', len(cnxids), type(widget))
+        return(cnxids)
+
     def remove_signal(self, widget, signal):
         """Remove a signal handler"""
-        if widget not in self.cnxids:
-            dbg('%s is not registered' % widget)
-            return
-        if signal not in self.cnxids[widget]:
-            dbg('%s not registered for %s' % (signal, type(widget)))
+        self.remove_signals(widget, [signal])
+
+    def remove_signals(self, widget, signals):
+        """Remove several signal handlers from a widget"""
+        bucket = self.cnxids.get(widget)
+        if bucket is None:
+            dbg('%s is not registered', widget)
             return
-        dbg('removing %s::%s' % (type(widget), signal))
-        widget.disconnect(self.cnxids[widget][signal])
-        del(self.cnxids[widget][signal])
-        if len(list(self.cnxids[widget].keys())) == 0:
+        for signal in signals:
+            if signal not in bucket:
+                dbg('%s not registered for %s', signal, type(widget))
+                continue
+            widget.disconnect(bucket.pop(signal))
+        dbg('removed %s::%s', type(widget), signals)
+        if not bucket:
             dbg('no more signals for widget')
             del(self.cnxids[widget])
 
     def remove_widget(self, widget):
         """Remove all signal handlers for a widget"""
-        if widget not in self.cnxids:
-            dbg('%s not registered' % widget)
+        bucket = self.cnxids.pop(widget, None)
+        if bucket is None:
+            dbg('%s not registered', widget)
             return
-        signals = list(self.cnxids[widget].keys())
-        for signal in signals:
-            self.remove_signal(widget, signal)
+        for cnxid in bucket.values():
+            widget.disconnect(cnxid)
+        dbg('removed %d signals for %s', len(bucket), type(widget))
 
     def remove_all(self):
         """Remove all signal handlers for all widgets"""
@@ -61,3 +105,10 @@ class Signalman(object):
         for widget in widgets:
             self.remove_widget(widget)
 
+    def census(self):
+        """Return the number of connected handlers by widget type"""
+        counts = {}
+        for widget, bucket in list(self.cnxids.items()):
+            name = type(widget).__name__
+            counts[name] = counts.get(name, 0) + len(bucket)
+        return(counts)
@@ -0,0 +1,40 @@
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""tabplaceholder.py - classes for tabs whose Terminal hasn't been made yet"""
+
+from gi.repository import GObject, Gtk
+
+from .util import make_uuid
+
+class TabPlaceholder(Gtk.Box):
+    """Stands in for a Terminal in a Notebook tab until the tab is first
+    shown. It holds the layout the Terminal will be created from, so it can
+    also describe itself when the layout is saved"""
+    terminator_type = 'TabPlaceholder'
+    layout = None
+    uuid = None
+
+    def __init__(self, layout):
+        """Class initialiser"""
+        GObject.GObject.__init__(self)
+        self.layout = layout
+        if 'uuid' in layout and layout['uuid'] != '':
+            self.uuid = make_uuid(layout['uuid'])
+        else:
+            # Hand written layouts don't have UUIDs
+            self.uuid = make_uuid()
+
+    def describe_layout(self, count, parent, global_layout, child_order):
+        """Describe our layout, which is the one we were created with"""
+        layout = {}
+        for key in self.layout:
+            if key != 'children':
+                layout[key] = self.layout[key]
+        layout['type'] = 'Terminal'
+        layout['parent'] = parent
+        layout['order'] = child_order
+        layout['uuid'] = self.uuid
+        name = 'terminal%d' % count
+        count = count + 1
+        global_layout[name] = layout
+        return(count)
@@ -16,9 +16,12 @@ try:
 except ImportError:
     from urllib import unquote as urlunquote
 
-from .util import dbg, err, spawn_new_terminator, make_uuid, manual_lookup, display_manager
+from .util import dbg, err, spawn_new_terminator, make_uuid, manual_lookup, display_manager, monotonic
 from . import util
 from .config import Config
+from .profilecache import ProfileCache
+from .bulkpaste import BulkPaste
+from .shellpool import ShellPool
 from .cwd import get_pid_cwd
 from .factory import Factory
 from .terminator import Terminator
@@ -42,6 +45,12 @@ class Overpaint(Vte.Terminal):
     def dim(self,b):
         self.overpaint = b
 
+    def set_dim_colors(self, colors, offset, _resources):
+        """Set our colours and how much to dim them when we're inactive"""
+        self.set_colors(*colors)
+        self.dim_p = offset
+        self.dim_l = round(1.0 - self.dim_p,3)
+
     def do_draw(self,cr):
         ### get_color_background_for_draw is not available in older 
         ### versions of vte
@@ -58,9 +67,37 @@ class Overpaint(Vte.Terminal):
             cr.rectangle(0.0,0.0,self.get_allocated_width(),self.get_allocated_height())
             cr.paint()
 
+class PaletteDim(Vte.Terminal):
+    """A VTE which dims itself by switching to a dimmed set of colours when
+    it loses focus. Unlike Overpaint it doesn't override do_draw, so drawing
+    never calls back into Python. Only the foreground colour and the 16
+    colour palette can be dimmed this way, 256 colour and truecolor text is
+    drawn as it is"""
+    dimmed = None
+    colors = None
+    dim_colors = None
+
+    def dim(self, dimmed):
+        """Switch between our normal and dimmed colours"""
+        if dimmed == self.dimmed:
+            return
+        self.dimmed = dimmed
+        if self.colors is not None:
+            self.set_colors(*(self.dim_colors if dimmed else self.colors))
+
+    def set_dim_colors(self, colors, offset, resources):
+        """Set our colours and work out the dimmed versions of them"""
+        fgcolor, bgcolor, palette = colors
+        dim_fgcolor, dim_palette = resources.get_dimmed(fgcolor, bgcolor,
+                                                        offset)
+        self.colors = colors
+        self.dim_colors = (dim_fgcolor, bgcolor, dim_palette)
+        self.set_colors(*(self.dim_colors if self.dimmed else self.colors))
+
 # pylint: disable-msg=R0904
 class Terminal(Gtk.VBox):
     """Class implementing the VTE widget and its wrappings"""
+    terminator_type = 'Terminal'
 
     __gsignals__ = {
         'close-term': (GObject.SignalFlags.RUN_LAST, None, ()),
@@ -118,6 +155,12 @@ class Terminal(Gtk.VBox):
     command = None
     clipboard = None
     pid = None
+    spawning = None
+    closed = None
+    pending_title_change = None
+    title_change_source = None
+    last_title_change = None
+    last_title = None
 
     matches = None
     regex_flags = None
@@ -148,6 +191,7 @@ class Terminal(Gtk.VBox):
         self.connect('enumerate', self.terminator.do_enumerate)
         self.connect('focus-in', self.terminator.focus_changed)
         self.connect('focus-out', self.terminator.focus_left)
+        self.connect('size-allocate', self.on_size_allocate)
 
         self.matches = {}
         self.cnxids = Signalman()
@@ -159,8 +203,13 @@ class Terminal(Gtk.VBox):
         self.clipboard = Gtk.Clipboard.get(Gdk.SELECTION_CLIPBOARD)
 
         self.pending_on_vte_size_allocate = False
+        self.pending_title_change = False
+        self.last_title_change = 0
 
-        self.vte = Overpaint()
+        if self.config['inactive_dim_mode'] == 'palette':
+            self.vte = PaletteDim()
+        else:
+            self.vte = Overpaint()
         self.vte.dim(False)
         self.queue_draw()
         self.background_image = None
@@ -275,9 +324,13 @@ class Terminal(Gtk.VBox):
     def close(self):
         """Close ourselves"""
         dbg('close: called')
+        self.closed = True
         self.cnxids.remove_widget(self.vte)
+        if self.title_change_source is not None:
+            GObject.source_remove(self.title_change_source)
+            self.title_change_source = None
         self.emit('close-term')
-        if self.pid is not None:
+        if self.pid is not None and self.pid > 0:
             try:
                 dbg('close: killing %d' % self.pid)
                 os.kill(self.pid, signal.SIGHUP)
@@ -307,16 +360,13 @@ class Terminal(Gtk.VBox):
     def _add_regex(self, name, re):
         match = -1
         if regex.FLAGS_PCRE2:
-            try:
-                reg = Vte.Regex.new_for_match(re, len(re), self.regex_flags or regex.FLAGS_PCRE2)
+            reg = regex.match_regex(re, self.regex_flags or regex.FLAGS_PCRE2)
+            if reg is not None:
                 match = self.vte.match_add_regex(reg, 0)
-            except GLib.Error:
-                # happens when PCRE2 support is not builtin (Ubuntu < 19.10)
-                pass
 
         # try the "old" glib regex
         if match < 0:
-            reg = GLib.Regex.new(re, self.regex_flags or regex.FLAGS_GLIB, 0)
+            reg = regex.match_gregex(re, self.regex_flags or regex.FLAGS_GLIB)
             match = self.vte.match_add_gregex(reg, 0)
 
         self.matches[name] = match
@@ -411,10 +461,11 @@ class Terminal(Gtk.VBox):
 
         self.scrollbar.connect('button-press-event', self.on_buttonpress)
 
-        self.cnxids.new(self.vte, 'key-press-event', self.on_keypress)
-        self.cnxids.new(self.vte, 'button-press-event', self.on_buttonpress)
-        self.cnxids.new(self.vte, 'scroll-event', self.on_mousewheel)
-        self.cnxids.new(self.vte, 'popup-menu', self.popup_menu)
+        self.cnxids.new_batch(self.vte, {
+            'key-press-event': self.on_keypress,
+            'button-press-event': self.on_buttonpress,
+            'scroll-event': self.on_mousewheel,
+            'popup-menu': self.popup_menu})
 
         srcvtetargets = [("vte", Gtk.TargetFlags.SAME_APP, self.TARGET_TYPE_VTE)]
         dsttargets = [("vte", Gtk.TargetFlags.SAME_APP, self.TARGET_TYPE_VTE),
@@ -470,8 +521,8 @@ class Terminal(Gtk.VBox):
         if self.composite_support:
             self.cnxids.new(self.vte, 'composited-changed', self.reconfigure)
 
-        self.cnxids.new(self.vte, 'window-title-changed', lambda x:
-            self.emit('title-change', self.get_window_title()))
+        self.cnxids.new(self.vte, 'window-title-changed',
+            self.deferred_on_window_title_changed)
         self.cnxids.new(self.vte, 'grab-focus', self.on_vte_focus)
         self.cnxids.new(self.vte, 'focus-in-event', self.on_vte_focus_in)
         self.cnxids.new(self.vte, 'focus-out-event', self.on_vte_focus_out)
@@ -629,7 +680,7 @@ class Terminal(Gtk.VBox):
             # already in this group, no action needed
             return
         dbg('Terminal::set_group: Setting group to %s' % name)
-        self.group = name
+        self.terminator.set_terminal_group(self, name)
         self.titlebar.set_group_label(name)
         self.terminator.group_hoover()
 
@@ -646,9 +697,8 @@ class Terminal(Gtk.VBox):
     def ungroup(self, _widget, data):
         """Remove a group"""
         # FIXME: Could we emit and have Terminator do this?
-        for term in self.terminator.terminals:
-            if term.group == data:
-                term.set_group(None, None)
+        for term in self.terminator.get_group_terms(data):
+            term.set_group(None, None)
         self.terminator.group_hoover()
 
     def set_groupsend(self, _widget, value):
@@ -666,110 +716,129 @@ class Terminal(Gtk.VBox):
         """Toggle the autocleangroups mode"""
         self.config['autoclean_groups'] = not self.config['autoclean_groups']
 
-    def reconfigure(self, _widget=None):
-        """Reconfigure our settings"""
-        dbg('Terminal::reconfigure')
+    def reconfigure(self, _widget=None, keys=None):
+        """Reconfigure our settings. If keys is given, only the settings
+        depending on those config keys are reapplied"""
+        dbg('Terminal::reconfigure: %s', keys)
         self.cnxids.remove_signal(self.vte, 'realize')
 
+        def changed(*names):
+            """Whether any of the named config keys need applying"""
+            return(keys is None or not keys.isdisjoint(names))
+
         # Handle child command exiting
-        self.cnxids.remove_signal(self.vte, 'child-exited')
+        if changed('exit_action'):
+            self.cnxids.remove_signal(self.vte, 'child-exited')
 
-        if self.config['exit_action'] == 'restart':
-            self.cnxids.new(self.vte, 'child-exited', self.spawn_child, True)
-        elif self.config['exit_action'] in ('close', 'left'):
-            self.cnxids.new(self.vte, 'child-exited',
-                                            lambda x, y: self.emit('close-term'))
+            if self.config['exit_action'] == 'restart':
+                self.cnxids.new(self.vte, 'child-exited', self.spawn_child, True)
+            elif self.config['exit_action'] in ('close', 'left'):
+                self.cnxids.new(self.vte, 'child-exited',
+                                                lambda x, y: self.emit('close-term'))
 
-        if self.custom_encoding != True:
+        if self.custom_encoding != True and changed('encoding'):
             self.vte.set_encoding(self.config['encoding'])
         # Word char support was missing from vte 0.38, silently skip this setting
-        if hasattr(self.vte, 'set_word_char_exceptions'):
+        if hasattr(self.vte, 'set_word_char_exceptions') and changed('word_chars'):
             self.vte.set_word_char_exceptions(self.config['word_chars'])
-        self.vte.set_mouse_autohide(self.config['mouse_autohide'])
-
-        backspace = self.config['backspace_binding']
-        delete = self.config['delete_binding']
-
-        try:
-            if backspace == 'ascii-del':
-                backbind = Vte.ERASE_ASCII_DELETE
-            elif backspace == 'control-h':
-                backbind = Vte.ERASE_ASCII_BACKSPACE
-            elif backspace == 'escape-sequence':
-                backbind = Vte.ERASE_DELETE_SEQUENCE
-            else:
-                backbind = Vte.ERASE_AUTO
-        except AttributeError:
-            if backspace == 'ascii-del':
-                backbind = 2
-            elif backspace == 'control-h':
-                backbind = 1
-            elif backspace == 'escape-sequence':
-                backbind = 3
+        if changed('mouse_autohide'):
+            self.vte.set_mouse_autohide(self.config['mouse_autohide'])
+
+        resources = ProfileCache().get(self.config)
+
+        if changed('backspace_binding', 'delete_binding'):
+            self.vte.set_backspace_binding(resources.backspace_binding)
+            self.vte.set_delete_binding(resources.delete_binding)
+
+        if not self.custom_font_size and changed('use_system_font', 'font'):
+            if resources.font is not None:
+                self.set_font(resources.font)
+        if changed('allow_bold', 'line_height', 'bold_is_bright'):
+            self.vte.set_allow_bold(self.config['allow_bold'])
+            if hasattr(self.vte,'set_cell_height_scale'): 
+                self.vte.set_cell_height_scale(self.config['line_height'])
+            if hasattr(self.vte, 'set_bold_is_bright'):
+                self.vte.set_bold_is_bright(self.config['bold_is_bright'])
+
+        if changed('use_theme_colors', 'foreground_color', 'background_color',
+                   'background_type', 'background_darkness', 'palette',
+                   'inactive_color_offset'):
+            self.reconfigure_colors(resources)
+
+        if changed('cursor_color_fg', 'cursor_color'):
+            self.set_cursor_color()
+        if changed('cursor_shape'):
+            self.vte.set_cursor_shape(resources.cursor_shape)
+
+        if changed('cursor_blink'):
+            if self.config['cursor_blink'] == True:
+                self.vte.set_cursor_blink_mode(Vte.CursorBlinkMode.ON)
             else:
-                backbind = 0
+                self.vte.set_cursor_blink_mode(Vte.CursorBlinkMode.OFF)
 
-        try:
-            if delete == 'ascii-del':
-                delbind = Vte.ERASE_ASCII_DELETE
-            elif delete == 'control-h':
-                delbind = Vte.ERASE_ASCII_BACKSPACE
-            elif delete == 'escape-sequence':
-                delbind = Vte.ERASE_DELETE_SEQUENCE
+        if changed('force_no_bell', 'audible_bell', 'urgent_bell', 'icon_bell',
+                   'visible_bell'):
+            if self.config['force_no_bell'] == True:
+                self.vte.set_audible_bell(False)
+                self.cnxids.remove_signal(self.vte, 'bell')
             else:
-                delbind = Vte.ERASE_AUTO
-        except AttributeError:
-            if delete == 'ascii-del':
-                delbind = 2
-            elif delete == 'control-h':
-                delbind = 1
-            elif delete == 'escape-sequence':
-                delbind = 3
+                self.vte.set_audible_bell(self.config['audible_bell'])
+                self.cnxids.remove_signal(self.vte, 'bell')
+                if self.config['urgent_bell'] == True or \
+                   self.config['icon_bell'] == True or \
+                   self.config['visible_bell'] == True:
+                    try:
+                        self.cnxids.new(self.vte, 'bell', self.on_bell)
+                    except TypeError:
+                        err('bell signal unavailable with this version of VTE')
+
+        if changed('scrollback_infinite', 'scrollback_lines'):
+            if self.config['scrollback_infinite'] == True:
+                scrollback_lines = -1
             else:
-                delbind = 0
-
-        self.vte.set_backspace_binding(backbind)
-        self.vte.set_delete_binding(delbind)
-
-        if not self.custom_font_size:
-            try:
-                if self.config['use_system_font'] == True:
-                    font = self.config.get_system_mono_font()
-                else:
-                    font = self.config['font']
-                self.set_font(Pango.FontDescription(font))
-            except:
-                pass
-        self.vte.set_allow_bold(self.config['allow_bold'])
-        if hasattr(self.vte,'set_cell_height_scale'): 
-            self.vte.set_cell_height_scale(self.config['line_height'])
-        if hasattr(self.vte, 'set_bold_is_bright'):
-            self.vte.set_bold_is_bright(self.config['bold_is_bright'])
+                scrollback_lines = self.config['scrollback_lines']
+            self.vte.set_scrollback_lines(scrollback_lines)
+        if changed('scroll_on_keystroke', 'scroll_on_output'):
+            self.vte.set_scroll_on_keystroke(self.config['scroll_on_keystroke'])
+            self.vte.set_scroll_on_output(self.config['scroll_on_output'])
+
+        if changed('scrollbar_position'):
+            if self.config['scrollbar_position'] in ['disabled', 'hidden']:
+                self.scrollbar.hide()
+            else:
+                self.scrollbar.show()
+                if self.config['scrollbar_position'] == 'left':
+                    self.terminalbox.reorder_child(self.scrollbar, 0)
+                elif self.config['scrollbar_position'] == 'right':
+                    self.terminalbox.reorder_child(self.vte, 0)
+
+        if changed('rewrap_on_resize'):
+            self.vte.set_rewrap_on_resize(self.config['rewrap_on_resize'])
+
+        if keys is None or any(key.startswith('title') or key == 'show_titlebar'
+                               for key in keys):
+            self.titlebar.update()
+        self.vte.queue_draw()
 
+    def reconfigure_colors(self, resources):
+        """Apply the colour settings and the profile style class"""
         if self.config['use_theme_colors']:
             self.fgcolor_active = self.vte.get_style_context().get_color(Gtk.StateType.NORMAL)  # VERIFY FOR GTK3: do these really take the theme colors?
             self.bgcolor = self.vte.get_style_context().get_background_color(Gtk.StateType.NORMAL)
+            if self.config['background_type'] == 'transparent' or self.config['background_type'] == 'image':
+                self.bgcolor.alpha = self.config['background_darkness']
+            else:
+                self.bgcolor.alpha = 1
         else:
-            self.fgcolor_active = Gdk.RGBA()
-            self.fgcolor_active.parse(self.config['foreground_color'])
-            self.bgcolor = Gdk.RGBA()
-            self.bgcolor.parse(self.config['background_color'])
-
-        if self.config['background_type'] == 'transparent' or self.config['background_type'] == 'image':
-            self.bgcolor.alpha = self.config['background_darkness']
-        else:
-            self.bgcolor.alpha = 1
+            # These are shared with every terminal on our profile
+            self.fgcolor_active = resources.fgcolor
+            self.bgcolor = resources.bgcolor
 
-        colors = self.config['palette'].split(':')
-        self.palette_active = []
-
-        for color in colors:
-            if color:
-                newcolor = Gdk.RGBA()
-                newcolor.parse(color)
-                self.palette_active.append(newcolor)
-        self.vte.set_colors(self.fgcolor_active, self.bgcolor,
-                                self.palette_active)
+        self.palette_active = resources.palette
+        self.vte.set_dim_colors((self.fgcolor_active, self.bgcolor,
+                                 self.palette_active),
+                                float(self.config['inactive_color_offset']),
+                                resources)
 
         if self.terminator.last_focused_term == self:
             self.vte.dim(False)
@@ -787,60 +856,10 @@ class Terminal(Gtk.VBox):
         munged_profile = "".join([c if c.isalnum() else "-" for c in self.get_profile()])
         css_class_name = "terminator-profile-%s" % (munged_profile)
         terminal_box_style_context.add_class(css_class_name)
-        self.set_cursor_color()
-        self.vte.set_cursor_shape(getattr(Vte.CursorShape,
-                                          self.config['cursor_shape'].upper()));
-
-        if self.config['cursor_blink'] == True:
-            self.vte.set_cursor_blink_mode(Vte.CursorBlinkMode.ON)
-        else:
-            self.vte.set_cursor_blink_mode(Vte.CursorBlinkMode.OFF)
-
-        if self.config['force_no_bell'] == True:
-            self.vte.set_audible_bell(False)
-            self.cnxids.remove_signal(self.vte, 'bell')
-        else:
-            self.vte.set_audible_bell(self.config['audible_bell'])
-            self.cnxids.remove_signal(self.vte, 'bell')
-            if self.config['urgent_bell'] == True or \
-               self.config['icon_bell'] == True or \
-               self.config['visible_bell'] == True:
-                try:
-                    self.cnxids.new(self.vte, 'bell', self.on_bell)
-                except TypeError:
-                    err('bell signal unavailable with this version of VTE')
-
-        if self.config['scrollback_infinite'] == True:
-            scrollback_lines = -1
-        else:
-            scrollback_lines = self.config['scrollback_lines']
-        self.vte.set_scrollback_lines(scrollback_lines)
-        self.vte.set_scroll_on_keystroke(self.config['scroll_on_keystroke'])
-        self.vte.set_scroll_on_output(self.config['scroll_on_output'])
-
-        if self.config['scrollbar_position'] in ['disabled', 'hidden']:
-            self.scrollbar.hide()
-        else:
-            self.scrollbar.show()
-            if self.config['scrollbar_position'] == 'left':
-                self.terminalbox.reorder_child(self.scrollbar, 0)
-            elif self.config['scrollbar_position'] == 'right':
-                self.terminalbox.reorder_child(self.vte, 0)
-
-        
-        self.vte.set_rewrap_on_resize(self.config['rewrap_on_resize'])
-
-        self.titlebar.update()
-        self.vte.queue_draw()
 
     def set_cursor_color(self):
         """Set the cursor color appropriately"""
-        if self.config['cursor_color_fg']:
-            self.vte.set_color_cursor(None)
-        else:
-            cursor_color = Gdk.RGBA()
-            cursor_color.parse(self.config['cursor_color'])
-            self.vte.set_color_cursor(cursor_color)
+        self.vte.set_color_cursor(ProfileCache().get(self.config).cursor_color)
 
     def get_window_title(self):
         """Return the window title"""
@@ -915,7 +934,7 @@ class Terminal(Gtk.VBox):
 
         if mapping and mapping not in ['close_window',
                                        'full_screen']:
-            dbg('Terminal::on_keypress: lookup found: %r' % mapping)
+            dbg('Terminal::on_keypress: lookup found: %r', mapping)
             # handle the case where user has re-bound copy to ctrl+<key>
             # we only copy if there is a selection otherwise let it fall through
             # to ^<key>
@@ -929,17 +948,11 @@ class Terminal(Gtk.VBox):
                 getattr(self, "key_" + mapping)()
                 return(True)
 
-        # FIXME: This is all clearly wrong. We should be doing this better
-        #         maybe we can emit the key event and let Terminator() care?
         groupsend = self.terminator.groupsend
         groupsend_type = self.terminator.groupsend_type
         window_focussed = self.vte.get_toplevel().get_property('has-toplevel-focus')
         if groupsend != groupsend_type['off'] and window_focussed and self.vte.is_focus():
-            if self.group and groupsend == groupsend_type['group']:
-                self.terminator.group_emit(self, self.group, 'key-press-event',
-                        event)
-            if groupsend == groupsend_type['all']:
-                self.terminator.all_emit(self, 'key-press-event', event)
+            self.terminator.broadcast_key(self, event)
 
         return(False)
 
@@ -1309,6 +1322,7 @@ class Terminal(Gtk.VBox):
     def on_window_focus_out(self):
         """Update our UI when the window loses focus"""
         self.titlebar.update('window-focus-out')
+        self.terminator.titlebar_changed(self)
 
     def scrollbar_jump(self, position):
         """Move the scrollbar to a particular row"""
@@ -1324,6 +1338,41 @@ class Terminal(Gtk.VBox):
         """A child widget is done editing a label, return focus to VTE"""
         self.vte.grab_focus()
 
+    def deferred_on_window_title_changed(self, _vte):
+        """Programs can change the title many times a second, so pass title
+        changes on at most title_update_rate times a second. Whatever the
+        title is when we do is the one used"""
+        if self.pending_title_change == True:
+            return
+        self.pending_title_change = True
+        delay = 0
+        rate = self.config['title_update_rate']
+        if rate > 0:
+            delay = self.last_title_change + 1.0 / rate - monotonic()
+        if delay > 0:
+            self.title_change_source = GObject.timeout_add(
+                int(delay * 1000) + 1, self.do_deferred_on_window_title_changed)
+        else:
+            self.title_change_source = GObject.idle_add(
+                self.do_deferred_on_window_title_changed)
+
+    def do_deferred_on_window_title_changed(self):
+        self.pending_title_change = False
+        self.title_change_source = None
+        self.last_title_change = monotonic()
+        title = self.get_window_title()
+        if title != self.last_title:
+            self.last_title = title
+            self.emit('title-change', title)
+        return(False)
+
+    def on_size_allocate(self, _widget, _allocation):
+        """We have moved or changed size, so our Window's idea of where its
+        terminals are is out of date"""
+        window = self.get_toplevel()
+        if Factory().isinstance(window, 'Window'):
+            window.invalidate_navigation()
+
     def deferred_on_vte_size_allocate(self, widget, allocation):
         # widget & allocation are not used in on_vte_size_allocate, so we
         # can use the on_vte_size_allocate instead of duplicating the code
@@ -1429,7 +1478,10 @@ class Terminal(Gtk.VBox):
         if cwd is not None:
             self.cwd = cwd
 
-    def spawn_child(self, widget=None, respawn=False, debugserver=False):
+    def spawn_child(self, widget=None, respawn=False, debugserver=False,
+                    pooled=False):
+        """Start our child process. If pooled is True and nothing special
+        was asked for, a pre-spawned shell from the ShellPool may be used"""
         args = []
         shell = None
         command = None
@@ -1438,9 +1490,6 @@ class Terminal(Gtk.VBox):
             dbg('still laying out, refusing to spawn a child')
             return
 
-        if respawn == False:
-            self.vte.grab_focus()
-
         options = self.config.options_get()
         if options and options.command:
             command = options.command
@@ -1481,6 +1530,9 @@ class Terminal(Gtk.VBox):
             if command is not None:
                 args += ['-c', command]
 
+        if respawn == False:
+            self.vte.grab_focus()
+
         if shell is None:
             self.vte.feed(_('Unable to find a shell'))
             return(-1)
@@ -1494,7 +1546,6 @@ class Terminal(Gtk.VBox):
         envv.append('TERM=%s' % self.config['term'])
         envv.append('COLORTERM=%s' % self.config['colorterm'])
         envv.append('PWD=%s' % self.cwd)
-        envv.append('TERMINATOR_UUID=%s' % self.uuid.urn)
         if self.terminator.dbus_name:
             envv.append('TERMINATOR_DBUS_NAME=%s' % self.terminator.dbus_name)
         if self.terminator.dbus_path:
@@ -1502,21 +1553,84 @@ class Terminal(Gtk.VBox):
 
         dbg('Forking shell: "%s" with args: %s' % (shell, args))
         args.insert(0, shell)
-        result,  self.pid = self.vte.spawn_sync(Vte.PtyFlags.DEFAULT,
-                                       self.cwd,
-                                       args,
-                                       envv,
-                                       GLib.SpawnFlags.FILE_AND_ARGV_ZERO,
-                                       None,
-                                       None,
-                                       None)
         self.command = shell
 
+        if pooled and command is None and not respawn and not debugserver:
+            pool = ShellPool()
+            pooledshell = pool.take(self.cwd, args, envv)
+            pool.fill(self.cwd, args, envv)
+            if pooledshell is not None and \
+               self.adopt_pooled_shell(pooledshell):
+                return
+
+        envv.append('TERMINATOR_UUID=%s' % self.uuid.urn)
+        if not hasattr(self.vte, 'spawn_async'):
+            result, self.pid = self.vte.spawn_sync(Vte.PtyFlags.DEFAULT,
+                                                   self.cwd,
+                                                   args,
+                                                   envv,
+                                                   GLib.SpawnFlags.FILE_AND_ARGV_ZERO,
+                                                   None,
+                                                   None,
+                                                   None)
+            self.on_spawn_complete(self.vte, self.pid, None)
+            return
+
+        self.spawning = True
+        self.vte.spawn_async(Vte.PtyFlags.DEFAULT,
+                             self.cwd,
+                             args,
+                             envv,
+                             GLib.SpawnFlags.FILE_AND_ARGV_ZERO,
+                             None,
+                             None,
+                             -1,
+                             None,
+                             self.on_spawn_complete,
+                             None)
+
+    def on_spawn_complete(self, _vte, pid, error, *_args):
+        """Our child process has been started, or failed to start"""
+        self.spawning = False
+        if self.closed:
+            # We were closed before the child started, so hang it up
+            if error is None and pid > 0:
+                dbg('Terminal::on_spawn_complete: closed, killing %d' % pid)
+                try:
+                    os.kill(pid, signal.SIGHUP)
+                except OSError as ex:
+                    dbg('os.kill failed: %s' % ex)
+            return
+        if error is None and pid > 0:
+            self.pid = pid
+        else:
+            # Never keep a failed pid around, close() would signal it
+            self.pid = None
         self.titlebar.update()
 
-        if self.pid == -1:
-            self.vte.feed(_('Unable to start shell:') + shell)
-            return(-1)
+        if self.pid is None:
+            dbg('Terminal::on_spawn_complete: failed: %s' % error)
+            self.vte.feed(_('Unable to start shell:') + self.command)
+
+    def adopt_pooled_shell(self, pooledshell):
+        """Display a shell which was started in advance by the ShellPool. It
+        was told its TERMINATOR_UUID before we existed, so take that UUID.
+        Returns False if the shell isn't usable, so the caller spawns one"""
+        if pooledshell.pid is None or pooledshell.pid <= 0:
+            dbg('Terminal::adopt_pooled_shell: pooled shell has no pid')
+            if pooledshell.pty is not None:
+                pooledshell.pty.close()
+            return(False)
+        self.terminator.reindex_terminal(self, pooledshell.uuid)
+        self.vte.set_pty(pooledshell.pty)
+        self.vte.watch_child(pooledshell.pid)
+        self.pid = pooledshell.pid
+        self.titlebar.update()
+
+        if self.vte.has_focus():
+            # Focus was taken with our old UUID, so record the new one
+            self.on_vte_focus_in(self.vte, None)
+        return(True)
 
     def prepare_url(self, urlmatch):
         """Prepare a URL from a VTE match"""
@@ -1538,7 +1652,7 @@ class Terminal(Gtk.VBox):
 
                 for urlplugin in plugins:
                     if match == self.matches[urlplugin.handler_name]:
-                        newurl = urlplugin.callback(url)
+                        newurl = registry.call(urlplugin, 'callback', url)
                         if newurl is not None:
                             dbg('Terminal::prepare_url: URL prepared by \
 %s plugin' % urlplugin.handler_name)
@@ -1586,6 +1700,19 @@ class Terminal(Gtk.VBox):
                 term.vte.paste_clipboard()
         self.vte.grab_focus()
 
+    def paste_to_group(self, text=None):
+        """Paste text, or the clipboard, into every terminal we are
+        broadcasting to, in chunks"""
+        if text is None:
+            self.clipboard.request_text(self.on_paste_to_group_text, None)
+            return
+        BulkPaste(text, self.terminator.get_target_terms(self)).start()
+
+    def on_paste_to_group_text(self, _clipboard, text, _data):
+        """The clipboard contents for paste_to_group() have arrived"""
+        if text:
+            self.paste_to_group(text)
+
     def feed(self, text):
         """Feed the supplied text to VTE"""
         self.vte.feed_child(text)
@@ -1614,12 +1741,10 @@ class Terminal(Gtk.VBox):
 
     def zoom_orig(self):
         """Restore original font size"""
-        if self.config['use_system_font'] == True:
-            font = self.config.get_system_mono_font()
-        else:
-            font = self.config['font']
-        dbg("Terminal::zoom_orig: restoring font to: %s" % font)
-        self.set_font(Pango.FontDescription(font))
+        resources = ProfileCache().get(self.config)
+        dbg("Terminal::zoom_orig: restoring font to: %s" % resources.fontname)
+        if resources.font is not None:
+            self.set_font(resources.font)
         self.custom_font_size = None
 
     def set_font(self, fontdesc):
@@ -1767,6 +1892,9 @@ class Terminal(Gtk.VBox):
     def key_paste(self):
         self.paste_clipboard()
 
+    def key_paste_to_group(self):
+        self.paste_to_group()
+
     def key_toggle_scrollbar(self):
         self.do_scrollbar_toggle()
 
@@ -6,15 +6,16 @@ import copy
 import os
 import gi
 gi.require_version('Vte', '2.91')
-from gi.repository import Gtk, Gdk, Vte
+from gi.repository import Gtk, Gdk, Vte, GObject
 from gi.repository.GLib import GError
 
 from . import borg
 from .borg import Borg
 from .config import Config
 from .keybindings import Keybindings
-from .util import dbg, err, enumerate_descendants
+from .util import dbg, err
 from .factory import Factory
+from .outputwatch import OutputWatch
 from .version import APP_NAME, APP_VERSION
 
 try:
@@ -22,6 +23,20 @@ try:
 except ImportError:
     dbg("could not import X11 gir module")
 
+try:
+    unichr
+except NameError:
+    unichr = chr
+
+# Config keys which affect the application-wide CSS
+CSS_CONFIG_KEYS = frozenset(['use_theme_colors', 'background_color',
+                             'background_type', 'background_darkness',
+                             'background_image', 'handle_size',
+                             'extra_styling'])
+# Config keys which affect Notebook.configure()
+NOTEBOOK_CONFIG_KEYS = frozenset(['scroll_tabbar', 'tab_position',
+                                  'hide_tabbar'])
+
 
 def eventkey2gdkevent(eventkey):  # FIXME FOR GTK3: is there a simpler way of casting from specific EventKey to generic (union) GdkEvent?
     gdkevent = Gdk.Event.new(eventkey.type)
@@ -37,6 +52,70 @@ def eventkey2gdkevent(eventkey):  # FIXME FOR GTK3: is there a simpler way of ca
     gdkevent.key.is_modifier = eventkey.is_modifier
     return gdkevent
 
+# Modifiers which make VTE send something other than the typed character
+KEYTEXT_MODIFIERS = (Gdk.ModifierType.CONTROL_MASK |
+                     Gdk.ModifierType.MOD1_MASK |
+                     Gdk.ModifierType.SUPER_MASK |
+                     Gdk.ModifierType.HYPER_MASK |
+                     Gdk.ModifierType.META_MASK)
+
+def eventkey2bytes(eventkey):
+    """Return the UTF-8 text of a plain printable keystroke, or None if the
+    key needs VTE to translate it (modifiers, cursor keys, keypad, etc.)"""
+    if eventkey.is_modifier or eventkey.state & KEYTEXT_MODIFIERS:
+        return(None)
+    # The keypad can be switched to application mode, let VTE handle it
+    if Gdk.KEY_KP_Space <= eventkey.keyval <= Gdk.KEY_KP_9:
+        return(None)
+    codepoint = Gdk.keyval_to_unicode(eventkey.keyval)
+    if codepoint < 0x20 or codepoint == 0x7f:
+        return(None)
+    return(unichr(codepoint).encode('utf-8'))
+
+def wind_layout(layout):
+    """Wind the flat objects of a layout, which each name their parent, into
+    a hierarchy from the windows down. Every object is visited once. Returns
+    the windows, and the names of any objects whose parent doesn't exist,
+    keyed by that parent"""
+    hierarchy = {}
+    objects = {}
+    children = {}
+    for obj in layout:
+        if layout[obj]['type'].lower() == 'window':
+            hierarchy[obj] = {}
+            hierarchy[obj]['type'] = 'Window'
+            hierarchy[obj]['children'] = {}
+
+            # Copy any additional keys
+            for objkey in list(layout[obj].keys()):
+                if layout[obj][objkey] != '' and objkey not in hierarchy[obj]:
+                    hierarchy[obj][objkey] = layout[obj][objkey]
+
+            objects[obj] = hierarchy[obj]
+        elif 'parent' not in layout[obj]:
+            err('Invalid object: %s' % obj)
+        else:
+            children.setdefault(layout[obj]['parent'], []).append(obj)
+
+    pending = list(hierarchy.keys())
+    while pending:
+        parent = pending.pop()
+        for obj in children.pop(parent, []):
+            childobj = {}
+            childobj['type'] = layout[obj]['type']
+            childobj['children'] = {}
+
+            # Copy over any additional object keys
+            for objkey in list(layout[obj].keys()):
+                if objkey not in childobj:
+                    childobj[objkey] = layout[obj][objkey]
+
+            objects[parent]['children'][obj] = childobj
+            objects[obj] = childobj
+            pending.append(obj)
+
+    return(hierarchy, children)
+
 class Terminator(Borg):
     """master object for the application"""
 
@@ -44,7 +123,10 @@ class Terminator(Borg):
     launcher_windows = None
     windowtitle = None
     terminals = None
+    terminals_by_uuid = None
+    windows_by_uuid = None
     groups = None
+    group_members = None
     config = None
     keybindings = None
     style_providers = None
@@ -64,9 +146,18 @@ class Terminator(Borg):
     groupsend = None
     groupsend_type = {'all':0, 'group':1, 'off':2}
 
+    titlebar_focus = None
+    titlebar_groupsend = None
+    stale_titlebars = None
+
     cur_gtk_theme_name = None
     gtk_settings = None
 
+    pending_reconfigure = None
+    forced_reconfigure = None
+    config_snapshot = None
+    config_snapshot_generation = None
+
     def __init__(self):
         """Class initialiser"""
 
@@ -82,8 +173,16 @@ class Terminator(Borg):
             self.launcher_windows = []
         if not self.terminals:
             self.terminals = []
+        if not self.terminals_by_uuid:
+            self.terminals_by_uuid = {}
+        if not self.windows_by_uuid:
+            self.windows_by_uuid = {}
         if not self.groups:
             self.groups = []
+        if not self.group_members:
+            self.group_members = {}
+        if self.stale_titlebars is None:
+            self.stale_titlebars = set()
         if not self.config:
             self.config = Config()
         if self.groupsend == None:
@@ -95,6 +194,10 @@ class Terminator(Borg):
             self.style_providers = []
         if not self.doing_layout:
             self.doing_layout = False
+        if not self.pending_reconfigure:
+            self.pending_reconfigure = False
+        if not self.forced_reconfigure:
+            self.forced_reconfigure = False
         self.connect_signals()
 
     def connect_signals(self):
@@ -126,6 +229,8 @@ class Terminator(Borg):
             dbg('Terminator::register_window: registering %s:%s' % (id(window),
                 type(window)))
             self.windows.append(window)
+            if getattr(window, 'uuid', None) is not None:
+                self.windows_by_uuid[window.uuid.urn] = window
 
     def deregister_window(self, window):
         """de-register a window widget"""
@@ -133,6 +238,7 @@ class Terminator(Borg):
                 (id(window), type(window)))
         if window in self.windows:
             self.windows.remove(window)
+            self.unindex_uuid(self.windows_by_uuid, window)
         else:
             err('%s is not in registered window list' % window)
 
@@ -168,12 +274,25 @@ class Terminator(Borg):
             dbg('Terminator::register_terminal: registering %s:%s' %
                     (id(terminal), type(terminal)))
             self.terminals.append(terminal)
+            if getattr(terminal, 'uuid', None) is not None:
+                self.terminals_by_uuid[terminal.uuid.urn] = terminal
+            self.group_members.setdefault(terminal.group, []).append(terminal)
+            self.stale_titlebars.add(terminal)
 
     def deregister_terminal(self, terminal):
         """De-register a terminal widget"""
         dbg('Terminator::deregister_terminal: de-registering %s:%s' %
                 (id(terminal), type(terminal)))
         self.terminals.remove(terminal)
+        self.unindex_uuid(self.terminals_by_uuid, terminal)
+        members = self.group_members.get(terminal.group)
+        if members and terminal in members:
+            members.remove(terminal)
+            if not members:
+                del(self.group_members[terminal.group])
+        self.stale_titlebars.discard(terminal)
+        if self.titlebar_focus == terminal:
+            self.titlebar_focus = None
 
         if len(self.terminals) == 0:
             dbg('no terminals remain, destroying all windows')
@@ -183,23 +302,46 @@ class Terminator(Borg):
             dbg('Terminator::deregister_terminal: %d terminals remain' %
                     len(self.terminals))
 
+    def reindex_terminal(self, terminal, uuid):
+        """Give a terminal a new UUID and keep our index of them in step"""
+        self.unindex_uuid(self.terminals_by_uuid, terminal)
+        terminal.uuid = uuid
+        if terminal in self.terminals:
+            self.terminals_by_uuid[uuid.urn] = terminal
+
+    def unindex_uuid(self, index, widget):
+        """Remove a widget from one of our UUID indexes"""
+        uuid = getattr(widget, 'uuid', None)
+        if uuid is not None and index.get(uuid.urn) is widget:
+            del(index[uuid.urn])
+            return
+        for urn, indexed in list(index.items()):
+            if indexed is widget:
+                del(index[urn])
+
+    def find_by_uuid(self, index, widgets, uuid):
+        """Look up a UUID in one of our indexes. UUIDs can be assigned after
+        a widget is registered (e.g. by a layout), so on a miss the index is
+        rebuilt from the list of widgets"""
+        widget = index.get(uuid)
+        if widget is not None and getattr(widget, 'uuid', None) is not None \
+           and widget.uuid.urn == uuid:
+            return(widget)
+
+        dbg('Terminator::find_by_uuid: %s not indexed, rebuilding', uuid)
+        index.clear()
+        for widget in widgets:
+            if getattr(widget, 'uuid', None) is not None:
+                index[widget.uuid.urn] = widget
+        return(index.get(uuid))
+
     def find_terminal_by_uuid(self, uuid):
-        """Search our terminals for one matching the supplied UUID"""
-        dbg('searching self.terminals for: %s' % uuid)
-        for terminal in self.terminals:
-            dbg('checking: %s (%s)' % (terminal.uuid.urn, terminal))
-            if terminal.uuid.urn == uuid:
-                return terminal
-        return None
+        """Find the terminal matching the supplied UUID"""
+        return(self.find_by_uuid(self.terminals_by_uuid, self.terminals, uuid))
 
     def find_window_by_uuid(self, uuid):
-        """Search our terminals for one matching the supplied UUID"""
-        dbg('searching self.terminals for: %s' % uuid)
-        for window in self.windows:
-            dbg('checking: %s (%s)' % (window.uuid.urn, window))
-            if window.uuid.urn == uuid:
-                return window
-        return None
+        """Find the window matching the supplied UUID"""
+        return(self.find_by_uuid(self.windows_by_uuid, self.windows, uuid))
 
     def new_window(self, cwd=None, profile=None):
         """Create a window with a Terminal in it"""
@@ -219,7 +361,6 @@ class Terminator(Borg):
     def create_layout(self, layoutname):
         """Create all the parts necessary to satisfy the specified layout"""
         layout = None
-        objects = {}
 
         self.doing_layout = True
         self.last_active_window = None
@@ -232,50 +373,10 @@ class Terminator(Borg):
             self.new_window()
             return
 
-        # Wind the flat objects into a hierarchy
-        hierarchy = {}
-        count = 0
-        # Loop over the layout until we have consumed it, or hit 1000 loops.
-        # This is a stupid artificial limit, but it's safe.
-        while len(layout) > 0 and count < 1000:
-            count = count + 1
-            if count == 1000:
-                err('hit maximum loop boundary. THIS IS VERY LIKELY A BUG')
-            for obj in list(layout.keys()):
-                if layout[obj]['type'].lower() == 'window':
-                    hierarchy[obj] = {}
-                    hierarchy[obj]['type'] = 'Window'
-                    hierarchy[obj]['children'] = {}
-
-                    # Copy any additional keys
-                    for objkey in list(layout[obj].keys()):
-                        if layout[obj][objkey] != '' and objkey not in hierarchy[obj]:
-                            hierarchy[obj][objkey] = layout[obj][objkey]
-
-                    objects[obj] = hierarchy[obj]
-                    del(layout[obj])
-                else:
-                    # Now examine children to see if their parents exist yet
-                    if 'parent' not in layout[obj]:
-                        err('Invalid object: %s' % obj)
-                        del(layout[obj])
-                        continue
-                    if layout[obj]['parent'] in objects:
-                        # Our parent has been created, add ourselves
-                        childobj = {}
-                        childobj['type'] = layout[obj]['type']
-                        childobj['children'] = {}
-
-                        # Copy over any additional object keys
-                        for objkey in list(layout[obj].keys()):
-                            if objkey not in childobj:
-                                childobj[objkey] = layout[obj][objkey]
-
-                        objects[layout[obj]['parent']]['children'][obj] = childobj
-                        objects[obj] = childobj
-                        del(layout[obj])
-
-        layout = hierarchy
+        layout, orphans = wind_layout(layout)
+        for parent in orphans:
+            err('Invalid objects, parent %s does not exist: %s' %
+                    (parent, orphans[parent]))
 
         for windef in layout:
             if layout[windef]['type'] != 'Window':
@@ -311,6 +412,19 @@ class Terminator(Borg):
 
         self.layoutname = layoutname
 
+    def find_tab(self, widget):
+        """Return the Notebook a widget is in and the page containing it,
+        or (None, None) if it isn't in a tab"""
+        maker = Factory()
+        page = widget
+        parent = widget.get_parent()
+        while parent is not None and not maker.isinstance(parent, 'Window'):
+            if maker.isinstance(parent, 'Notebook'):
+                return(parent, page)
+            page = parent
+            parent = parent.get_parent()
+        return(None, None)
+
     def layout_done(self):
         """Layout operations have finished, record that fact"""
         self.doing_layout = False
@@ -325,8 +439,16 @@ class Terminator(Borg):
             window_last_active_term_mapping[window] = copy.copy(source.last_active_term)
 
         for terminal in self.terminals:
-            if not terminal.pid:
-                terminal.spawn_child()
+            if terminal.pid or terminal.spawning:
+                continue
+            # Terminals in tabs that aren't showing are started when their
+            # tab is first shown
+            notebook, page = self.find_tab(terminal)
+            if notebook is not None and \
+               notebook.page_num(page) != notebook.get_current_page():
+                notebook.defer_spawn(page)
+                continue
+            terminal.spawn_child()
 
         for window in self.windows:
             if not window.is_child_notebook():
@@ -375,11 +497,105 @@ class Terminator(Borg):
         new_gtk_theme_name = settings.get_property(prop.name)
         if new_gtk_theme_name != self.cur_gtk_theme_name:
             self.cur_gtk_theme_name = new_gtk_theme_name
+            self.queue_reconfigure(force=True)
+
+    def queue_reconfigure(self, force=False):
+        """Schedule a reconfigure for when the main loop is idle. Any further
+        calls before then are merged into the same pass. Unless force is set,
+        only the config keys which have changed since the last reconfigure are
+        reapplied"""
+        if force:
+            self.forced_reconfigure = True
+        if self.pending_reconfigure:
+            return
+        self.pending_reconfigure = True
+        GObject.idle_add(self.do_deferred_reconfigure)
+
+    def do_deferred_reconfigure(self):
+        """Run a reconfigure that was queued by queue_reconfigure()"""
+        self.pending_reconfigure = False
+        if self.forced_reconfigure or self.config_snapshot is None:
+            self.forced_reconfigure = False
             self.reconfigure()
+            return(False)
+
+        if self.config.base.generation == self.config_snapshot_generation:
+            dbg('Terminator::do_deferred_reconfigure: config unchanged')
+            return(False)
+
+        snapshot = self.snapshot_config()
+        changed = {}
+        for profile in snapshot:
+            # A profile which has just come into use has all its keys applied
+            before = self.config_snapshot.get(profile, {})
+            after = snapshot[profile]
+            keys = set([key for key in set(before) | set(after) if key not in
+                        before or key not in after or before[key] != after[key]])
+            if keys:
+                changed[profile] = keys
+        self.config_snapshot = snapshot
+
+        if changed:
+            self.reconfigure(changed)
+        else:
+            dbg('Terminator::do_deferred_reconfigure: nothing changed')
+        return(False)
+
+    def snapshot_config(self):
+        """Take a copy of the resolved configuration of each profile that a
+        terminal is using, so we can later tell which keys have changed"""
+        base = self.config.base
+        self.config_snapshot_generation = base.generation
+        profiles = set([terminal.get_profile() for terminal in self.terminals])
+        profiles.add('default')
+        snapshot = {}
+        for profile in profiles:
+            if profile in base.profiles:
+                snapshot[profile] = copy.deepcopy(base.get_resolved(profile))
+        return(snapshot)
+
+    def reconfigure(self, changed=None):
+        """Update configuration for the whole application. If changed is
+        given, it maps profile names to the config keys that need to be
+        reapplied, otherwise everything is reapplied"""
+        if changed is None:
+            self.config_snapshot = self.snapshot_config()
+            self.reconfigure_css()
+        else:
+            for keys in changed.values():
+                if not keys.isdisjoint(CSS_CONFIG_KEYS):
+                    self.reconfigure_css()
+                    break
+
+        # Titlebar colours may have changed, so the next focus change has to
+        # update every titlebar
+        self.titlebar_focus = None
+
+        OutputWatch().reconfigure()
+
+        # Cause all the terminals to reconfigure
+        for terminal in self.terminals:
+            if changed is None:
+                terminal.reconfigure()
+            elif terminal.get_profile() in changed:
+                terminal.reconfigure(keys=changed[terminal.get_profile()])
 
-    def reconfigure(self):
-        """Update configuration for the whole application"""
+        # Reparse our keybindings
+        if changed is None or any('keybindings' in keys
+                                  for keys in changed.values()):
+            self.keybindings.configure(self.config['keybindings'])
 
+        # Update tab position if appropriate
+        if changed is None or any(not keys.isdisjoint(NOTEBOOK_CONFIG_KEYS)
+                                  for keys in changed.values()):
+            maker = Factory()
+            for window in self.windows:
+                child = window.get_child()
+                if maker.isinstance(child, 'Notebook'):
+                    child.configure()
+
+    def reconfigure_css(self):
+        """Rebuild and apply our CSS style providers"""
         if self.style_providers != []:
             for style_provider in self.style_providers:
                 Gtk.StyleContext.remove_provider_for_screen(
@@ -505,20 +721,6 @@ class Terminator(Borg):
                 self.style_providers[idx],
                 Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION+idx)
 
-        # Cause all the terminals to reconfigure
-        for terminal in self.terminals:
-            terminal.reconfigure()
-
-        # Reparse our keybindings
-        self.keybindings.configure(self.config['keybindings'])
-
-        # Update tab position if appropriate
-        maker = Factory()
-        for window in self.windows:
-            child = window.get_child()
-            if maker.isinstance(child, 'Notebook'):
-                child.configure()
-
     def on_css_parsing_error(self, provider, section, error, user_data=None):
         """Report CSS parsing issues"""
         file_path = section.get_file().get_path()
@@ -534,26 +736,40 @@ class Terminator(Borg):
             dbg('Terminator::create_group: registering group %s' % name)
             self.groups.append(name)
 
+    def set_terminal_group(self, terminal, group):
+        """Move a terminal to a different group, keeping the index of group
+        members up to date"""
+        members = self.group_members.get(terminal.group)
+        if members and terminal in members:
+            members.remove(terminal)
+            if not members:
+                del(self.group_members[terminal.group])
+        terminal.group = group
+        if terminal in self.terminals:
+            self.group_members.setdefault(group, []).append(terminal)
+        if terminal == self.titlebar_focus:
+            # Every member of both groups looks different now
+            self.titlebar_focus = None
+        else:
+            self.stale_titlebars.add(terminal)
+
+    def get_group_terms(self, group):
+        """Return the terminals in a group"""
+        return(list(self.group_members.get(group, [])))
+
     def closegroupedterms(self, group):
         """Close all terminals in a group"""
-        for terminal in self.terminals[:]:
-            if terminal.group == group:
-                terminal.close()
+        for terminal in self.get_group_terms(group):
+            terminal.close()
 
     def group_hoover(self):
         """Clean out unused groups"""
 
         if self.config['autoclean_groups']:
-            inuse = []
             todestroy = []
 
-            for terminal in self.terminals:
-                if terminal.group:
-                    if not terminal.group in inuse:
-                        inuse.append(terminal.group)
-
             for group in self.groups:
-                if not group in inuse:
+                if not group in self.group_members:
                     todestroy.append(group)
 
             dbg('Terminator::group_hoover: %d groups, hoovering %d' %
@@ -561,19 +777,46 @@ class Terminator(Borg):
             for group in todestroy:
                 self.groups.remove(group)
 
+    def broadcast_key(self, terminal, event):
+        """Send a keystroke typed in terminal on to every terminal we are
+        currently broadcasting to"""
+        if self.groupsend == self.groupsend_type['all']:
+            targets = self.terminals
+        elif self.groupsend == self.groupsend_type['group'] and terminal.group:
+            targets = self.group_members.get(terminal.group, [])
+        else:
+            return
+        if len(targets) < 2:
+            return
+
+        data = None
+        if self.config['broadcast_feed_child']:
+            data = eventkey2bytes(event)
+        if data:
+            for term in targets:
+                if term is not terminal:
+                    term.vte.feed_child(data)
+        else:
+            gdkevent = eventkey2gdkevent(event)
+            for term in targets:
+                if term is not terminal:
+                    term.vte.emit('key-press-event', gdkevent)
+
     def group_emit(self, terminal, group, type, event):
         """Emit to each terminal in a group"""
-        dbg('Terminator::group_emit: emitting a keystroke for group %s' %
+        dbg('Terminator::group_emit: emitting a keystroke for group %s',
                 group)
-        for term in self.terminals:
-            if term != terminal and term.group == group:
-                term.vte.emit(type, eventkey2gdkevent(event))
+        gdkevent = eventkey2gdkevent(event)
+        for term in self.group_members.get(group, []):
+            if term != terminal:
+                term.vte.emit(type, gdkevent)
 
     def all_emit(self, terminal, type, event):
         """Emit to all terminals"""
+        gdkevent = eventkey2gdkevent(event)
         for term in self.terminals:
             if term != terminal:
-                term.vte.emit(type, eventkey2gdkevent(event))
+                term.vte.emit(type, gdkevent)
 
     def do_enumerate(self, widget, pad):
         """Insert the number of each terminal in a group, into that terminal"""
@@ -582,21 +825,23 @@ class Terminator(Borg):
         else:
             numstr = '%d'
 
-        terminals = []
+        # Terminals are numbered through each window in turn
+        offsets = {}
+        offset = 0
         for window in self.windows:
-            containers, win_terminals = enumerate_descendants(window)
-            terminals.extend(win_terminals)
+            offsets[window] = offset
+            offset += len(window.get_descendants()[1])
 
         for term in self.get_target_terms(widget):
-            idx = terminals.index(term)
+            window = term.get_toplevel()
+            if window not in offsets:
+                continue
+            idx = offsets[window] + window.get_terminal_index(term)
             term.feed(numstr % (idx + 1))
 
     def get_sibling_terms(self, widget):
-        termset = []
-        for term in self.terminals:
-            if term.group == widget.group:
-                termset.append(term)
-        return(termset)
+        """Get the terminals in the same group as widget"""
+        return(self.get_group_terms(widget.group))
 
     def get_target_terms(self, widget):
         """Get the terminals we should currently be broadcasting to"""
@@ -615,11 +860,33 @@ class Terminator(Borg):
         return(None)
 
     def focus_changed(self, widget):
-        """We just moved focus to a new terminal"""
-        for terminal in self.terminals:
+        """We just moved focus to a new terminal. Only the titlebars which
+        look different because of that are updated: the old and new focused
+        terminals, their group members, and any marked stale since. A change
+        of broadcast mode updates them all"""
+        previous = self.titlebar_focus
+        if widget is None or previous is None or \
+           self.titlebar_groupsend != self.groupsend:
+            targets = self.terminals
+        else:
+            targets = set([previous, widget])
+            for terminal in [previous, widget]:
+                if terminal.group:
+                    targets.update(self.group_members.get(terminal.group, []))
+            targets.update(self.stale_titlebars)
+
+        for terminal in targets:
             terminal.titlebar.update(widget)
+        self.titlebar_focus = widget
+        self.titlebar_groupsend = self.groupsend
+        self.stale_titlebars.clear()
         return
 
+    def titlebar_changed(self, terminal):
+        """A terminal's titlebar no longer shows the focus state, so it must
+        be updated on the next focus change"""
+        self.stale_titlebars.add(terminal)
+
     def focus_left(self, widget):
         self.last_focused_term=widget
 
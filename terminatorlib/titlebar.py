@@ -14,6 +14,15 @@ from .terminator import Terminator
 from .editablelabel import EditableLabel
 from .translation import _
 
+# Title fonts by description, shared between every titlebar
+TITLE_FONTS = {}
+
+def get_title_font(font):
+    """Return a Pango.FontDescription for a font description string"""
+    if font not in TITLE_FONTS:
+        TITLE_FONTS[font] = Pango.FontDescription(font)
+    return(TITLE_FONTS[font])
+
 # pylint: disable-msg=R0904
 # pylint: disable-msg=W0613
 class Titlebar(Gtk.EventBox):
@@ -31,6 +40,8 @@ class Titlebar(Gtk.EventBox):
     grouplabel = None
     groupentry = None
     bellicon = None
+    rendered_font = None
+    rendered_colors = None
 
     __gsignals__ = {
             'clicked': (GObject.SignalFlags.RUN_LAST, None, ()),
@@ -102,82 +113,87 @@ class Titlebar(Gtk.EventBox):
         self.ebox.connect('button-press-event', func)
 
     def update(self, other=None):
-        """Update our contents"""
-        default_bg = False
+        """Update our contents. Only what has changed since we last rendered
+        is passed on to the widgets"""
         if self.config['title_hide_sizetext']:
             self.label.set_text("%s" % self.termtext)
         else:
             self.label.set_text("%s %s" % (self.termtext, self.sizetext))
 
         if (not self.config['title_use_system_font']) and self.config['title_font']:
-            title_font = Pango.FontDescription(self.config['title_font'])
+            font = self.config['title_font']
         else:
-            title_font = Pango.FontDescription(self.config.get_system_prop_font())
-        self.label.modify_font(title_font)
-        self.grouplabel.modify_font(title_font)
+            font = self.config.get_system_prop_font()
+        if font != self.rendered_font:
+            title_font = get_title_font(font)
+            self.label.modify_font(title_font)
+            self.grouplabel.modify_font(title_font)
+            self.rendered_font = font
 
         if other:
-            term = self.terminal
-            terminator = self.terminator
-            if other == 'window-focus-out':
+            state = self.get_color_state(other)
+            if state != self.rendered_colors:
+                (title_fg, title_bg, group_fg, group_bg, icon) = state
+                self.label.modify_fg(Gtk.StateType.NORMAL,
+                        Gdk.color_parse(title_fg))
+                self.grouplabel.modify_fg(Gtk.StateType.NORMAL,
+                        Gdk.color_parse(group_fg))
+                self.modify_bg(Gtk.StateType.NORMAL, 
+                        Gdk.color_parse(title_bg))
+                self.ebox.modify_bg(Gtk.StateType.NORMAL,
+                        Gdk.color_parse(group_bg))
+                self.set_from_icon_name(icon, Gtk.IconSize.MENU)
+                self.rendered_colors = state
+            if self.get_visible() != self.get_desired_visibility():
+                self.update_visibility()
+
+    def get_color_state(self, other):
+        """Return the colours and group icon we should have when other is the
+        focused terminal, or is 'window-focus-out', as a tuple of
+        (title_fg, title_bg, group_fg, group_bg, icon)"""
+        term = self.terminal
+        terminator = self.terminator
+        if other == 'window-focus-out':
+            title_fg = self.config['title_inactive_fg_color']
+            title_bg = self.config['title_inactive_bg_color']
+            icon = '_receive_off'
+            group_fg = self.config['title_inactive_fg_color']
+            group_bg = self.config['title_inactive_bg_color']
+        elif term != other and term.group and term.group == other.group:
+            if terminator.groupsend == terminator.groupsend_type['off']:
+                title_fg = self.config['title_inactive_fg_color']
+                title_bg = self.config['title_inactive_bg_color']
+                icon = '_receive_off'
+            else:
+                title_fg = self.config['title_receive_fg_color']
+                title_bg = self.config['title_receive_bg_color']
+                icon = '_receive_on'
+            group_fg = self.config['title_receive_fg_color']
+            group_bg = self.config['title_receive_bg_color']
+        elif term != other and not term.group or term.group != other.group:
+            if terminator.groupsend == terminator.groupsend_type['all']:
+                title_fg = self.config['title_receive_fg_color']
+                title_bg = self.config['title_receive_bg_color']
+                icon = '_receive_on'
+            else:
                 title_fg = self.config['title_inactive_fg_color']
                 title_bg = self.config['title_inactive_bg_color']
                 icon = '_receive_off'
-                default_bg = True
-                group_fg = self.config['title_inactive_fg_color']
-                group_bg = self.config['title_inactive_bg_color']
-            elif term != other and term.group and term.group == other.group:
-                if terminator.groupsend == terminator.groupsend_type['off']:
-                    title_fg = self.config['title_inactive_fg_color']
-                    title_bg = self.config['title_inactive_bg_color']
-                    icon = '_receive_off'
-                    default_bg = True
-                else:
-                    title_fg = self.config['title_receive_fg_color']
-                    title_bg = self.config['title_receive_bg_color']
-                    icon = '_receive_on'
-                group_fg = self.config['title_receive_fg_color']
-                group_bg = self.config['title_receive_bg_color']
-            elif term != other and not term.group or term.group != other.group:
-                if terminator.groupsend == terminator.groupsend_type['all']:
-                    title_fg = self.config['title_receive_fg_color']
-                    title_bg = self.config['title_receive_bg_color']
-                    icon = '_receive_on'
-                else:
-                    title_fg = self.config['title_inactive_fg_color']
-                    title_bg = self.config['title_inactive_bg_color']
-                    icon = '_receive_off'
-                    default_bg = True
-                group_fg = self.config['title_inactive_fg_color']
-                group_bg = self.config['title_inactive_bg_color']
+            group_fg = self.config['title_inactive_fg_color']
+            group_bg = self.config['title_inactive_bg_color']
+        else:
+            # We're the active terminal
+            title_fg = self.config['title_transmit_fg_color']
+            title_bg = self.config['title_transmit_bg_color']
+            if terminator.groupsend == terminator.groupsend_type['all']:
+                icon = '_active_broadcast_all'
+            elif terminator.groupsend == terminator.groupsend_type['group']:
+                icon = '_active_broadcast_group'
             else:
-                # We're the active terminal
-                title_fg = self.config['title_transmit_fg_color']
-                title_bg = self.config['title_transmit_bg_color']
-                if terminator.groupsend == terminator.groupsend_type['all']:
-                    icon = '_active_broadcast_all'
-                elif terminator.groupsend == terminator.groupsend_type['group']:
-                    icon = '_active_broadcast_group'
-                else:
-                    icon = '_active_broadcast_off'
-                group_fg = self.config['title_transmit_fg_color']
-                group_bg = self.config['title_transmit_bg_color']
-
-            self.label.modify_fg(Gtk.StateType.NORMAL,
-                    Gdk.color_parse(title_fg))
-            self.grouplabel.modify_fg(Gtk.StateType.NORMAL,
-                    Gdk.color_parse(group_fg))
-            self.modify_bg(Gtk.StateType.NORMAL, 
-                    Gdk.color_parse(title_bg))
-            if not self.get_desired_visibility():
-                if default_bg == True:
-                    color = term.get_style_context().get_background_color(Gtk.StateType.NORMAL)  # VERIFY FOR GTK3
-                else:
-                    color = Gdk.color_parse(title_bg)
-            self.update_visibility()
-            self.ebox.modify_bg(Gtk.StateType.NORMAL,
-                    Gdk.color_parse(group_bg))
-            self.set_from_icon_name(icon, Gtk.IconSize.MENU)
+                icon = '_active_broadcast_off'
+            group_fg = self.config['title_transmit_fg_color']
+            group_bg = self.config['title_transmit_bg_color']
+        return((title_fg, title_bg, group_fg, group_bg, icon))
 
     def update_visibility(self):
         """Make the titlebar be visible or not"""
@@ -197,7 +213,7 @@ class Titlebar(Gtk.EventBox):
             dbg('implicit desired visibility')
             return(True)
         else:
-            dbg('configured visibility: %s' % self.config['show_titlebar'])
+            dbg('configured visibility: %s', self.config['show_titlebar'])
             return(self.config['show_titlebar'])
 
     def set_from_icon_name(self, name, size = Gtk.IconSize.MENU):
@@ -314,7 +330,7 @@ class Titlebar(Gtk.EventBox):
 
     def set_custom_string(self, string):
         """Set a custom string"""
-        self.label.set_text(string)
+        self.label.set_text(string, force=True)
         self.label.set_custom()
 
 GObject.type_register(Titlebar)
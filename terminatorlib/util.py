@@ -19,11 +19,12 @@ from __future__ import print_function
 
 import sys
 import cairo
+import collections
 import os
 import pwd
-import inspect
 import uuid
 import subprocess
+import time
 import gi
 
 
@@ -43,32 +44,50 @@ DEBUGCLASSES = []
 # list of methods to show debugging for. empty list means show all methods
 DEBUGMETHODS = []
 
-def dbg(log = ""):
-    """Print a message if debugging is enabled"""
-    if DEBUG:
-        stackitem = inspect.stack()[1]
-        parent_frame = stackitem[0]
-        method = parent_frame.f_code.co_name
-        names, varargs, keywords, local_vars = inspect.getargvalues(parent_frame)
-        try:
-            self_name = names[0]
-            classname = local_vars[self_name].__class__.__name__
-        except IndexError:
-            classname = "noclass"
-        if DEBUGFILES:
-            line = stackitem[2]
-            filename = parent_frame.f_code.co_filename
-            extra = " (%s:%s)" % (filename, line)
+# cache of (method, name of first argument) for each code object seen by dbg()
+DBGCACHE = {}
+
+# Clocks for measuring intervals, time.monotonic and time.perf_counter are
+# Python 3 only
+monotonic = getattr(time, 'monotonic', time.time)
+timer = getattr(time, 'perf_counter', time.time)
+
+def dbg(log = "", *args):
+    """Print a message if debugging is enabled. Any extra arguments are
+    %-formatted into log, but only once we know the message will be shown"""
+    if not DEBUG:
+        return
+    parent_frame = sys._getframe(1)
+    code = parent_frame.f_code
+    try:
+        method, self_name = DBGCACHE[code]
+    except KeyError:
+        if code.co_argcount > 0:
+            self_name = code.co_varnames[0]
         else:
-            extra = ""
-        if DEBUGCLASSES != [] and classname not in DEBUGCLASSES:
-            return
-        if DEBUGMETHODS != [] and method not in DEBUGMETHODS:
-            return
-        try:
-            print("%s::%s: %s%s" % (classname, method, log, extra), file=sys.stderr)
-        except IOError:
-            pass
+            self_name = None
+        method = code.co_name
+        DBGCACHE[code] = (method, self_name)
+
+    if DEBUGMETHODS != [] and method not in DEBUGMETHODS:
+        return
+    if self_name is None:
+        classname = "noclass"
+    else:
+        classname = parent_frame.f_locals.get(self_name).__class__.__name__
+    if DEBUGCLASSES != [] and classname not in DEBUGCLASSES:
+        return
+
+    if args:
+        log = log % args
+    if DEBUGFILES:
+        extra = " (%s:%s)" % (code.co_filename, parent_frame.f_lineno)
+    else:
+        extra = ""
+    try:
+        print("%s::%s: %s%s" % (classname, method, log, extra), file=sys.stderr)
+    except IOError:
+        pass
 
 def err(log = ""):
     """Print an error message"""
@@ -292,7 +311,7 @@ def enumerate_descendants(parent):
     # back to Container?
     from .factory import Factory
 
-    containerstmp = []
+    containerstmp = collections.deque()
     containers = []
     terminals = []
     maker = Factory()
@@ -308,7 +327,7 @@ def enumerate_descendants(parent):
             terminals.append(descendant)
 
         while len(containerstmp) > 0:
-            child = containerstmp.pop(0)
+            child = containerstmp.popleft()
             for descendant in child.get_children():
                 if maker.isinstance(descendant, 'Container'):
                     containerstmp.append(descendant)
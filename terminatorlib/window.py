@@ -2,7 +2,6 @@
 # GPL v2 only
 """window.py - class for the main Terminator window"""
 
-import copy
 import time
 import uuid
 import gi
@@ -35,6 +34,7 @@ hide_window shortcut will be unavailable')
 # pylint: disable-msg=R0904
 class Window(Container, Gtk.Window):
     """Class implementing a top-level Terminator window"""
+    terminator_type = 'Window'
 
     terminator = None
     title = None
@@ -50,6 +50,10 @@ class Window(Container, Gtk.Window):
     preventHide = None
 
     zoom_data = None
+    descendants = None
+    terminal_positions = None
+    nav_layout = None
+    nav_neighbours = None
 
     term_zoomed = False
     __gproperties__ = {
@@ -408,6 +412,7 @@ class Window(Container, Gtk.Window):
         """Add a widget to the window by way of Gtk.Window.add()"""
         maker = Factory()
         Gtk.Window.add(self, widget)
+        self.invalidate_descendants()
         if maker.isinstance(widget, 'Terminal'):
             signals = {'close-term': self.closeterm,
                        'title-change': self.title.set_title,
@@ -425,19 +430,14 @@ class Window(Container, Gtk.Window):
                        'tab-new': [self.tab_new, widget],
                        'navigate': self.navigate_terminal}
 
-            for signal in signals:
-                args = []
-                handler = signals[signal]
-                if isinstance(handler, list):
-                    args = handler[1:]
-                    handler = handler[0]
-                self.connect_child(widget, signal, handler, *args)
+            self.connect_children(widget, signals)
 
             widget.grab_focus()
 
     def remove(self, widget):
         """Remove our child widget by way of Gtk.Window.remove()"""
         Gtk.Window.remove(self, widget)
+        self.invalidate_descendants()
         self.disconnect_child(widget)
         return(True)
 
@@ -479,7 +479,7 @@ class Window(Container, Gtk.Window):
             sibling.set_cwd(cwd)
             if self.config['always_split_with_profile']:
                 sibling.force_set_profile(None, widget.get_profile())
-            sibling.spawn_child()
+            sibling.spawn_child(pooled=True)
             if widget.group and self.config['split_to_group']:
                 sibling.set_group(None, widget.group)
         elif self.config['always_split_with_profile']:
@@ -592,11 +592,90 @@ class Window(Container, Gtk.Window):
             terminals.update(child.get_visible_terminals())
         elif maker.isinstance(child, 'Terminal'):
             terminals[child] = child.get_allocation()
+        elif maker.isinstance(child, 'TabPlaceholder'):
+            # The tab's Terminal hasn't been made yet
+            pass
         else:
             err('Unknown child type %s' % type(child))
 
         return(terminals)
 
+    def get_descendants(self):
+        """Return tuples of our containers and terminals, as
+        enumerate_descendants() would. They are kept until the widgets
+        beneath us change"""
+        if self.descendants is None:
+            containers, terminals = util.enumerate_descendants(self)
+            self.descendants = (tuple(containers), tuple(terminals))
+            self.terminal_positions = dict([(terminal, index) for
+                                            (index, terminal) in
+                                            enumerate(terminals)])
+        return(self.descendants)
+
+    def get_terminal_index(self, terminal):
+        """Return the position of a terminal in get_descendants(), or None"""
+        self.get_descendants()
+        return(self.terminal_positions.get(terminal))
+
+    def invalidate_descendants(self):
+        """The widgets beneath us have changed"""
+        self.descendants = None
+        self.terminal_positions = None
+        self.invalidate_navigation()
+
+    def get_nav_layout(self):
+        """Return get_visible_terminals(), which is kept until a terminal
+        moves or changes size, or a different tab is shown"""
+        if self.nav_layout is None:
+            self.nav_layout = self.get_visible_terminals()
+            self.nav_neighbours = {}
+        return(self.nav_layout)
+
+    def invalidate_navigation(self):
+        """Our visible terminals have moved, changed size or changed"""
+        self.nav_layout = None
+        self.nav_neighbours = None
+
+    def find_neighbour(self, terminal, direction):
+        """Return the visible terminal next to terminal in direction, or None
+        if there isn't one. Answers are remembered until the layout changes"""
+        layout = self.get_nav_layout()
+        key = (terminal, direction)
+        if key in self.nav_neighbours:
+            return(self.nav_neighbours[key])
+
+        allocation = layout.get(terminal)
+        if allocation is None:
+            allocation = terminal.get_allocation()
+        # Get the co-ordinate of the appropriate edge for this direction
+        edge, p1, p2 = util.get_edge(allocation, direction)
+        # Find all visible terminals which are, in their entirity, in the
+        # direction we want to move, and are at least partially spanning
+        # p1 to p2, and how far away each of them is
+        offsets = {}
+        for term, rect in layout.items():
+            if util.get_nav_possible(edge, rect, direction, p1, p2):
+                offsets[term] = util.get_nav_offset(edge, rect, direction)
+
+        neighbour = None
+        if offsets:
+            # The winning terminals are all of those the smallest distance
+            # away. Break an n-way tie using the cursor position
+            nearest = min(offsets.values())
+            winners = [term for term in offsets if offsets[term] == nearest]
+            neighbour = winners[0]
+            if len(winners) > 1:
+                cursor_x = allocation.x + allocation.width / 2
+                cursor_y = allocation.y + allocation.height / 2
+                for term in winners:
+                    if util.get_nav_tiebreak(direction, cursor_x, cursor_y,
+                                             layout[term]):
+                        neighbour = term
+                        break
+
+        self.nav_neighbours[key] = neighbour
+        return(neighbour)
+
     def get_focussed_terminal(self):
         """Find which terminal we want to have focus"""
         terminals = self.get_visible_terminals()
@@ -794,9 +873,9 @@ class Window(Container, Gtk.Window):
 
     def navigate_terminal(self, terminal, direction):
         """Navigate around terminals"""
-        _containers, terminals = util.enumerate_descendants(self)
-        visibles = self.get_visible_terminals()
-        current = terminals.index(terminal)
+        _containers, terminals = self.get_descendants()
+        visibles = self.get_nav_layout()
+        current = self.get_terminal_index(terminal)
         length = len(terminals)
         next = None
 
@@ -804,8 +883,7 @@ class Window(Container, Gtk.Window):
             return
 
         if direction in ['next', 'prev']:
-            tmpterms = copy.copy(terminals)
-            tmpterms = tmpterms[current+1:]
+            tmpterms = list(terminals[current+1:])
             tmpterms.extend(terminals[0:current])
 
             if direction == 'next':
@@ -815,50 +893,13 @@ class Window(Container, Gtk.Window):
             while len(tmpterms) > 0:
                 tmpitem = tmpterms.pop()
                 if tmpitem in visibles:
-                    next = terminals.index(tmpitem)
+                    next = self.get_terminal_index(tmpitem)
                     break
         elif direction in ['left', 'right', 'up', 'down']:
-            layout = self.get_visible_terminals()
-            allocation = terminal.get_allocation()
-            possibles = []
-
-            # Get the co-ordinate of the appropriate edge for this direction
-            edge, p1, p2 = util.get_edge(allocation, direction)
-            # Find all visible terminals which are, in their entirity, in the
-            # direction we want to move, and are at least partially spanning
-            # p1 to p2
-            for term in layout:
-                rect = layout[term]
-                if util.get_nav_possible(edge, rect, direction, p1, p2):
-                    possibles.append(term)
-
-            if len(possibles) == 0:
+            neighbour = self.find_neighbour(terminal, direction)
+            if neighbour is None:
                 return
-
-            # Find out how far away each of the possible terminals is, then
-            # find the smallest distance. The winning terminals are all of
-            # those who are that distance away.
-            offsets = {}
-            for term in possibles:
-                rect = layout[term]
-                offsets[term] = util.get_nav_offset(edge, rect, direction)
-            keys = list(offsets.values())
-            keys.sort()
-            winners = [k for k, v in offsets.items() if v == keys[0]]
-            next = terminals.index(winners[0])
-
-            if len(winners) > 1:
-                # Break an n-way tie using the cursor position
-                term_alloc = terminal.get_allocation()
-                cursor_x = term_alloc.x + term_alloc.width / 2
-                cursor_y = term_alloc.y + term_alloc.height / 2
-
-                for term in winners:
-                    rect = layout[term]
-                    if util.get_nav_tiebreak(direction, cursor_x, cursor_y,
-                            rect):
-                        next = terminals.index(term)
-                        break;
+            next = self.get_terminal_index(neighbour)
         else:
             err('Unknown navigation direction: %s' % direction)
 
@@ -917,7 +958,7 @@ class WindowTitle(object):
 
     def set_title(self, widget, text):
         """Set the title"""
-        if not self.forced:
+        if not self.forced and text != self.text:
             self.text = text
             self.update()
 
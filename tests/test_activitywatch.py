@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""test_activitywatch.py - Test the timer wheel and notification batching
+of the activity watch plugins"""
+
+import pytest
+
+
+class Clock:
+    """A monotonic clock which only moves when told to"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return(self.now)
+
+
+class StubGObject:
+    """Records the sources added instead of running them"""
+    def __init__(self):
+        self.sources = []
+
+    def timeout_add(self, interval, callback, *args):
+        self.sources.append((interval, callback))
+        return(len(self.sources))
+
+    def idle_add(self, callback, *args):
+        return(self.timeout_add(0, callback))
+
+
+class StubNotification:
+    def __init__(self, body):
+        self.bodies = [body]
+        self.shown = 0
+
+    def update(self, _summary, body, _icon):
+        self.bodies.append(body)
+
+    def show(self):
+        self.shown += 1
+
+
+class StubNotify:
+    class Notification:
+        @staticmethod
+        def new(_summary, body, _icon):
+            return(StubNotification(body))
+
+    @staticmethod
+    def init(_name):
+        pass
+
+
+class StubVte:
+    def __init__(self):
+        self.handlers = {}
+
+    def connect(self, signal, handler, *args):
+        self.handlers[len(self.handlers) + 1] = (signal, handler, args)
+        return(len(self.handlers))
+
+    def disconnect(self, handler):
+        del(self.handlers[handler])
+
+    def destroy(self):
+        for signal, handler, args in list(self.handlers.values()):
+            if signal == 'destroy':
+                handler(self, *args)
+
+    def get_cursor_position(self):
+        return((0, 0))
+
+    def has_focus(self):
+        return(False)
+
+
+class StubTerminal:
+    def __init__(self, title):
+        self.title = title
+        self.vte = StubVte()
+
+    def get_vte(self):
+        return(self.vte)
+
+    def get_window_title(self):
+        return(self.title)
+
+
+@pytest.fixture
+def activitywatch(monkeypatch):
+    """The plugin module, with its clock, main loop and notifications
+    replaced by stubs"""
+    from terminatorlib.plugins import activitywatch
+
+    monkeypatch.setattr(activitywatch, 'monotonic', Clock())
+    monkeypatch.setattr(activitywatch, 'GObject', StubGObject())
+    monkeypatch.setattr(activitywatch, 'Notify', StubNotify, raising=False)
+    return(activitywatch)
+
+
+def test_timer_wheel(activitywatch):
+    """Terminals are reported once they have been quiet for the period"""
+    clock = activitywatch.monotonic
+    quiet = []
+    wheel = activitywatch.TimerWheel(10, 2, quiet.extend)
+    wheel.touch('a')
+    wheel.touch('b')
+    # One timer serves every terminal
+    assert activitywatch.GObject.sources == [(2000, wheel.on_tick)]
+
+    clock.now += 6
+    wheel.touch('b')
+    clock.now += 6
+    assert wheel.on_tick()
+    assert quiet == ['a']
+
+    clock.now += 6
+    assert not wheel.on_tick()
+    assert quiet == ['a', 'b']
+    assert wheel.source is None
+    assert wheel.slots == {}
+
+
+def test_timer_wheel_reports_once(activitywatch):
+    """A quiet terminal isn't reported again until it is active again"""
+    clock = activitywatch.monotonic
+    quiet = []
+    wheel = activitywatch.TimerWheel(10, 2, quiet.extend)
+    wheel.touch('a')
+    clock.now += 12
+    wheel.on_tick()
+    clock.now += 12
+    wheel.on_tick()
+    assert quiet == ['a']
+
+    wheel.touch('a')
+    clock.now += 12
+    wheel.on_tick()
+    assert quiet == ['a', 'a']
+
+
+def test_timer_wheel_remove(activitywatch):
+    """Removed terminals are forgotten"""
+    clock = activitywatch.monotonic
+    quiet = []
+    wheel = activitywatch.TimerWheel(10, 2, quiet.extend)
+    wheel.touch('a')
+    wheel.remove('a')
+    wheel.remove('b')
+    assert wheel.slots == {}
+    assert wheel.last_activities == {}
+    clock.now += 12
+    wheel.on_tick()
+    assert quiet == []
+
+
+def test_notification_batch(activitywatch):
+    """Terminals are batched into one notification, which is reused"""
+    batch = activitywatch.NotificationBatch('Activity in: %s')
+    one = StubTerminal('one')
+    two = StubTerminal('two')
+    batch.add(one)
+    batch.add(two)
+    batch.add(one)
+    assert len(activitywatch.GObject.sources) == 1
+
+    batch.show()
+    assert batch.notification.bodies == ['Activity in: one, two']
+
+    batch.add(two)
+    batch.add(one)
+    batch.discard(one)
+    batch.show()
+    assert batch.notification.bodies == ['Activity in: one, two',
+                                         'Activity in: two']
+    assert batch.notification.shown == 2
+
+    # Nothing pending, nothing shown
+    batch.show()
+    assert batch.notification.shown == 2
+
+
+def test_destroyed_terminals_are_forgotten(activitywatch):
+    """Closing a watched terminal drops everything kept about it"""
+    activity = activitywatch.ActivityWatch()
+    inactivity = activitywatch.InactivityWatch()
+    terminal = StubTerminal('one')
+    activity.watch(None, terminal)
+    inactivity.watch(None, terminal)
+    activity.notify(terminal, None)
+    inactivity.reset_timer(terminal, None)
+
+    terminal.vte.destroy()
+    assert terminal not in activity.watches
+    assert terminal not in activity.last_notifies
+    assert activity.notifications.pending == []
+    assert terminal not in inactivity.watches
+    assert inactivity.wheel.last_activities == {}
+
+
+def test_unwatch(activitywatch):
+    """Unwatching disconnects from the terminal"""
+    activity = activitywatch.ActivityWatch()
+    terminal = StubTerminal('one')
+    activity.watch(None, terminal)
+    activity.unwatch(None, terminal)
+    assert terminal.vte.handlers == {}
+    assert activity.watches == {}
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""test_descendants.py - Test the index a Window keeps of the containers and
+terminals beneath it, and when it is thrown away"""
+
+
+def method(cls, name):
+    """Return a method of cls as a plain function, so it can be called on a
+    stub"""
+    function = getattr(cls, name)
+    return(getattr(function, '__func__', function))
+
+
+class StubWidget:
+    """A Terminal, or a Container holding other widgets"""
+    def __init__(self, kind, *children):
+        self.terminator_type = kind
+        self.children = list(children)
+        self.toplevel = self
+        for child in children:
+            child.set_toplevel(self)
+
+    def set_toplevel(self, toplevel):
+        self.toplevel = toplevel
+        for child in self.children:
+            child.set_toplevel(toplevel)
+
+    def get_children(self):
+        return(self.children)
+
+    def get_toplevel(self):
+        return(self.toplevel)
+
+    def descendants_changed(self):
+        from terminatorlib.container import Container
+
+        return(method(Container, 'descendants_changed')(self))
+
+
+class StubWindow(StubWidget):
+    """The parts of a Window that keep its index of descendants"""
+    def __init__(self, *children):
+        self.descendants = None
+        self.terminal_positions = None
+        self.nav_layout = None
+        self.nav_neighbours = None
+        self.enumerations = 0
+        StubWidget.__init__(self, 'Window', *children)
+
+    def get_children(self):
+        self.enumerations += 1
+        return(self.children)
+
+    def get_descendants(self):
+        from terminatorlib.window import Window
+
+        return(method(Window, 'get_descendants')(self))
+
+    def get_terminal_index(self, terminal):
+        from terminatorlib.window import Window
+
+        return(method(Window, 'get_terminal_index')(self, terminal))
+
+    def invalidate_descendants(self):
+        from terminatorlib.window import Window
+
+        return(method(Window, 'invalidate_descendants')(self))
+
+    def invalidate_navigation(self):
+        from terminatorlib.window import Window
+
+        return(method(Window, 'invalidate_navigation')(self))
+
+
+def make_window():
+    """A window holding a pane, with a terminal on one side and a notebook of
+    two terminals on the other"""
+    terminals = [StubWidget('Terminal') for _ in range(3)]
+    notebook = StubWidget('Notebook', terminals[1], terminals[2])
+    paned = StubWidget('HPaned', terminals[0], notebook)
+    return(StubWindow(paned), paned, notebook, terminals)
+
+
+def test_get_descendants():
+    """Descendants are listed as enumerate_descendants() lists them, and only
+    walked once"""
+    from terminatorlib.util import enumerate_descendants
+
+    window, paned, notebook, terminals = make_window()
+    containers, expected = enumerate_descendants(window)
+    assert window.get_descendants() == (tuple(containers), tuple(expected))
+    assert window.get_descendants() == ((paned, notebook), tuple(terminals))
+
+    window.enumerations = 0
+    window.get_descendants()
+    window.get_terminal_index(terminals[0])
+    assert window.enumerations == 0
+
+
+def test_get_terminal_index():
+    """Terminals are found by their position, and unknown ones aren't"""
+    window, _paned, _notebook, terminals = make_window()
+    assert [window.get_terminal_index(terminal) for terminal in terminals] \
+        == [0, 1, 2]
+    assert window.get_terminal_index(StubWidget('Terminal')) is None
+
+
+def test_invalidate_descendants():
+    """Once the widgets change the index is rebuilt, and the navigation
+    layout is thrown away with it"""
+    window, _paned, notebook, terminals = make_window()
+    window.get_descendants()
+    window.nav_layout = window.nav_neighbours = {}
+
+    notebook.children.reverse()
+    assert window.get_terminal_index(terminals[2]) == 2
+    window.invalidate_descendants()
+    assert window.nav_layout is None
+    assert window.nav_neighbours is None
+    assert window.get_terminal_index(terminals[2]) == 1
+    assert window.get_descendants()[1] == (terminals[0], terminals[2],
+                                           terminals[1])
+
+
+def test_descendants_changed():
+    """A container tells its Window when its children change, and one which
+    isn't in a Window yet has no one to tell"""
+    window, _paned, notebook, terminals = make_window()
+    window.get_descendants()
+    new = StubWidget('Terminal')
+    notebook.children.append(new)
+    notebook.descendants_changed()
+    assert window.descendants is None
+    assert window.get_terminal_index(new) == 3
+
+    orphan = StubWidget('VPaned', StubWidget('Terminal'))
+    orphan.descendants_changed()
+    assert window.descendants is not None
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""test_eventkey2bytes.py - Test which keystrokes are broadcast as plain
+text and which are left for VTE to translate"""
+
+import pytest
+import gi
+
+gi.require_version("Gdk", "3.0")
+from gi.repository import Gdk
+
+
+class KeyEvent:
+    """The parts of a Gdk.EventKey that eventkey2bytes looks at"""
+    def __init__(self, keyval, state=0, is_modifier=False):
+        self.keyval = keyval
+        self.state = Gdk.ModifierType(state)
+        self.is_modifier = is_modifier
+
+
+@pytest.mark.parametrize(
+    "keyval,state,expected",
+    [
+        (Gdk.KEY_a, 0, b"a"),
+        (Gdk.KEY_A, Gdk.ModifierType.SHIFT_MASK, b"A"),
+        (Gdk.KEY_a, Gdk.ModifierType.LOCK_MASK, b"a"),
+        (Gdk.KEY_eacute, 0, u"\u00e9".encode("utf-8")),
+        (Gdk.KEY_a, Gdk.ModifierType.CONTROL_MASK, None),
+        (Gdk.KEY_a, Gdk.ModifierType.MOD1_MASK, None),
+        (Gdk.KEY_a, Gdk.ModifierType.SUPER_MASK, None),
+        (Gdk.KEY_Return, 0, None),
+        (Gdk.KEY_BackSpace, 0, None),
+        (Gdk.KEY_Delete, 0, None),
+        (Gdk.KEY_Left, 0, None),
+        (Gdk.KEY_KP_5, 0, None),
+    ],
+)
+def test_eventkey2bytes(keyval, state, expected):
+    """Plain printable keys become UTF-8, everything else is left to VTE"""
+    from terminatorlib.terminator import eventkey2bytes
+
+    assert eventkey2bytes(KeyEvent(keyval, state)) == expected
+
+
+def test_modifier_key_is_left_to_vte():
+    """Pressing a modifier on its own sends nothing"""
+    from terminatorlib.terminator import eventkey2bytes
+
+    event = KeyEvent(Gdk.KEY_Control_L, is_modifier=True)
+    assert eventkey2bytes(event) is None
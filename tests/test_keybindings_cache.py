@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""test_keybindings_cache.py - Test the cache of translated key events in
+Keybindings.lookup"""
+
+import pytest
+import gi
+
+gi.require_version("Gdk", "3.0")
+from gi.repository import Gdk
+
+KEYCODE_T = 28
+KEYCODE_W = 25
+
+
+class StubKeymap:
+    """Translates hardware keycodes to keyvals, using up Shift for upper case
+    like a US layout does, and counts how often it is asked to"""
+    keyvals = {KEYCODE_T: (Gdk.KEY_t, Gdk.KEY_T),
+               KEYCODE_W: (Gdk.KEY_w, Gdk.KEY_W)}
+
+    def __init__(self):
+        self.translations = 0
+
+    def translate_keyboard_state(self, keycode, state, group):
+        self.translations += 1
+        if state & Gdk.ModifierType.SHIFT_MASK:
+            return((True, self.keyvals[keycode][1], group, 1,
+                    Gdk.ModifierType.SHIFT_MASK))
+        return((True, self.keyvals[keycode][0], group, 0,
+                Gdk.ModifierType(0)))
+
+
+class KeyEvent:
+    """The parts of a Gdk.EventKey that lookup uses"""
+    def __init__(self, keycode, state=0, group=0):
+        self.hardware_keycode = keycode
+        self.state = Gdk.ModifierType(state)
+        self.group = group
+
+    def get_state(self):
+        return(self.state)
+
+
+@pytest.fixture
+def keybindings():
+    """Keybindings with a couple of bindings and a stub keymap"""
+    from terminatorlib.keybindings import Keybindings
+
+    keybindings = Keybindings()
+    keybindings.configure({'new_tab': '<Shift><Control>t',
+                           'close_term': '<Shift><Control>w',
+                           'go_next': '<Control>t'})
+    keybindings.keymap = StubKeymap()
+    return(keybindings)
+
+
+SHIFT_CONTROL = Gdk.ModifierType.SHIFT_MASK | Gdk.ModifierType.CONTROL_MASK
+
+
+def test_lookup(keybindings):
+    """Key presses are mapped to their actions"""
+    assert keybindings.lookup(KeyEvent(KEYCODE_T, SHIFT_CONTROL)) == 'new_tab'
+    assert keybindings.lookup(
+        KeyEvent(KEYCODE_T, Gdk.ModifierType.CONTROL_MASK)) == 'go_next'
+    assert keybindings.lookup(KeyEvent(KEYCODE_W, SHIFT_CONTROL)) == \
+        'close_term'
+    assert keybindings.lookup(KeyEvent(KEYCODE_W)) is None
+
+
+def test_repeated_keys_are_cached(keybindings):
+    """Pressing the same key again doesn't translate it again, whether or
+    not Caps Lock is on"""
+    event = KeyEvent(KEYCODE_T, SHIFT_CONTROL)
+    assert keybindings.lookup(event) == 'new_tab'
+    assert keybindings.lookup(event) == 'new_tab'
+    caps_lock = SHIFT_CONTROL | Gdk.ModifierType.LOCK_MASK
+    assert keybindings.lookup(KeyEvent(KEYCODE_T, caps_lock)) == 'new_tab'
+    assert keybindings.keymap.translations == 1
+
+    # Unbound keys are cached too
+    assert keybindings.lookup(KeyEvent(KEYCODE_W)) is None
+    assert keybindings.lookup(KeyEvent(KEYCODE_W)) is None
+    assert keybindings.keymap.translations == 2
+
+
+def test_cache_is_keyed_on_state_and_group(keybindings):
+    """A different modifier state or keyboard group is translated afresh"""
+    keybindings.lookup(KeyEvent(KEYCODE_T, SHIFT_CONTROL))
+    keybindings.lookup(KeyEvent(KEYCODE_T, Gdk.ModifierType.CONTROL_MASK))
+    keybindings.lookup(KeyEvent(KEYCODE_T, SHIFT_CONTROL, group=1))
+    assert keybindings.keymap.translations == 3
+
+
+def test_cache_is_cleared(keybindings):
+    """Changing the bindings or the keyboard layout empties the cache"""
+    from terminatorlib import keybindings as module
+
+    event = KeyEvent(KEYCODE_T, SHIFT_CONTROL)
+    keybindings.lookup(event)
+    module.on_keys_changed(keybindings.keymap)
+    keybindings.lookup(event)
+    assert keybindings.keymap.translations == 2
+
+    keybindings.configure({'close_term': '<Shift><Control>t'})
+    assert keybindings.lookup(event) == 'close_term'
+    assert keybindings.keymap.translations == 3
+
+
+def test_cache_size_is_limited(keybindings, monkeypatch):
+    """The cache is emptied once it is full"""
+    from terminatorlib import keybindings as module
+
+    monkeypatch.setattr(module, 'CACHE_SIZE', 2)
+    keybindings.lookup(KeyEvent(KEYCODE_T))
+    keybindings.lookup(KeyEvent(KEYCODE_W))
+    keybindings.lookup(KeyEvent(KEYCODE_T, SHIFT_CONTROL))
+    assert len(keybindings._cache) == 1
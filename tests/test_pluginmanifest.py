@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""test_pluginmanifest.py - Test reading plugins without importing them"""
+
+import json
+import os
+
+import pytest
+
+PLUGIN = '''
+import terminatorlib.plugin as plugin
+
+try:
+    from gi.repository import Notify
+    AVAILABLE = ['Menu', 'Handler']
+except ImportError:
+    AVAILABLE = ['Menu']
+
+class Base(plugin.MenuItem):
+    pass
+
+class Menu(Base):
+    pass
+
+class Handler(plugin.URLHandler):
+    capabilities = ['url_handler', 'extra']
+'''
+
+
+def write_plugin(plugindir, name, source):
+    """Write a plugin file and return its path"""
+    path = os.path.join(str(plugindir), name)
+    with open(path, 'w') as pluginfile:
+        pluginfile.write(source)
+    return(path)
+
+
+def test_scan_source(tmpdir):
+    """Classes and capabilities are read from every AVAILABLE branch and
+    from base classes"""
+    from terminatorlib.pluginmanifest import scan_source
+
+    path = write_plugin(tmpdir, 'test.py', PLUGIN)
+    assert scan_source(path) == {
+        'available': ['Menu', 'Handler'],
+        'capabilities': {'Menu': ['terminal_menu'],
+                         'Handler': ['url_handler', 'extra']}}
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        # AVAILABLE is worked out at import time
+        "AVAILABLE = [name for name in ['A']]\nclass A(object): pass\n",
+        # Capabilities come from a class defined elsewhere
+        "from elsewhere import Base\nAVAILABLE = ['A']\nclass A(Base): pass\n",
+        # Not a string literal
+        "AVAILABLE = [1]\n",
+        # Not Python
+        "AVAILABLE = [\n",
+    ],
+)
+def test_scan_source_needs_import(tmpdir, source):
+    """Plugins which can't be read statically return None"""
+    from terminatorlib.pluginmanifest import scan_source
+
+    path = write_plugin(tmpdir, 'test.py', source)
+    assert scan_source(path) is None
+
+
+def test_save_and_load(tmpdir):
+    """A saved manifest is loaded again, and is written atomically"""
+    from terminatorlib.pluginmanifest import PluginManifest, MANIFEST_VERSION
+
+    filename = os.path.join(str(tmpdir), 'config', 'plugins.json')
+    manifest = PluginManifest(filename)
+    assert manifest.entries == {}
+    manifest.entries = {'/plugins/a.py': {'available': ['A']}}
+    manifest.save()
+
+    assert os.listdir(os.path.dirname(filename)) == ['plugins.json']
+    assert PluginManifest(filename).entries == manifest.entries
+
+    with open(filename, 'w') as manifestfile:
+        json.dump({'version': MANIFEST_VERSION + 1, 'plugins': {'x': {}}},
+                  manifestfile)
+    assert PluginManifest(filename).entries == {}
+
+    with open(filename, 'w') as manifestfile:
+        manifestfile.write('{')
+    assert PluginManifest(filename).entries == {}
+
+
+def test_scan(tmpdir):
+    """Only new and changed plugins are read, and ones which can't be read
+    statically are handed to the importer"""
+    from terminatorlib.pluginmanifest import PluginManifest
+
+    plugindir = tmpdir.mkdir('plugins')
+    static = write_plugin(plugindir, 'static.py', PLUGIN)
+    dynamic = write_plugin(plugindir, 'dynamic.py',
+                           "AVAILABLE = ['Dyn'] + []\n")
+    write_plugin(plugindir, '__init__.py', '')
+    write_plugin(plugindir, 'notes.txt', '')
+
+    imported = []
+    def importer(path):
+        imported.append(path)
+        return({'available': ['Dyn'], 'capabilities': {'Dyn': []}})
+
+    filename = os.path.join(str(tmpdir), 'plugins.json')
+    manifest = PluginManifest(filename)
+    plugins = manifest.scan([str(plugindir)], importer)
+    assert plugins == {'Menu': static, 'Handler': static, 'Dyn': dynamic}
+    assert imported == [dynamic]
+    assert manifest.get_capabilities(static, 'Handler') == ['url_handler',
+                                                            'extra']
+
+    # Nothing has changed, so nothing is read again
+    manifest = PluginManifest(filename)
+    assert manifest.scan([str(plugindir)], importer) == plugins
+    assert imported == [dynamic]
+
+    # Removed plugins are forgotten
+    os.remove(dynamic)
+    assert manifest.scan([str(plugindir)], importer) == {'Menu': static,
+                                                          'Handler': static}
+    assert dynamic not in PluginManifest(filename).entries
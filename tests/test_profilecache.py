@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""test_profilecache.py - Test when ProfileCache shares and rebuilds the
+resources of a profile"""
+
+import pytest
+
+
+@pytest.fixture
+def config():
+    """A Config on the default profile which uses a fixed font"""
+    from terminatorlib.config import Config
+
+    config = Config()
+    config.set_profile('default')
+    use_system_font = config['use_system_font']
+    font = config['font']
+    config['use_system_font'] = False
+    config['font'] = 'Mono 10'
+    yield config
+    config['use_system_font'] = use_system_font
+    config['font'] = font
+
+
+def test_resources_are_shared(config):
+    """Every terminal on a profile gets the same resources"""
+    from terminatorlib.config import Config
+    from terminatorlib.profilecache import ProfileCache
+
+    other = Config()
+    other.set_profile('default')
+    assert ProfileCache().get(config) is ProfileCache().get(other)
+
+
+def test_config_change_rebuilds_resources(config):
+    """Resources are parsed again once the config has changed"""
+    from terminatorlib.profilecache import ProfileCache
+
+    before = ProfileCache().get(config)
+    config['scrollback_lines'] = config['scrollback_lines']
+    assert ProfileCache().get(config) is not before
+    assert ProfileCache().get(config) is ProfileCache().get(config)
+
+
+def test_profiles_have_their_own_resources(config):
+    """Each profile has its own resources"""
+    from terminatorlib.config import Config
+    from terminatorlib.profilecache import ProfileCache
+
+    config.add_profile('test_profilecache')
+    try:
+        other = Config('test_profilecache')
+        assert other.get_profile() == 'test_profilecache'
+        assert ProfileCache().get(config) is not ProfileCache().get(other)
+        assert ProfileCache().get(config).fontname == 'Mono 10'
+    finally:
+        config.del_profile('test_profilecache')
+
+
+def test_font_change_rebuilds_resources(config):
+    """Resources are parsed again for a new font"""
+    from terminatorlib.profilecache import ProfileCache
+
+    before = ProfileCache().get(config)
+    config['font'] = 'Mono 12'
+    after = ProfileCache().get(config)
+    assert after is not before
+    assert after.fontname == 'Mono 12'
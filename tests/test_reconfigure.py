@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""test_reconfigure.py - Test that queued reconfigures only reapply the
+config keys which have changed"""
+
+import pytest
+
+
+@pytest.fixture
+def terminator(monkeypatch):
+    """A Terminator whose reconfigure() records what it was asked to do"""
+    from terminatorlib.terminator import Terminator
+
+    terminator = Terminator()
+    calls = []
+    monkeypatch.setattr(terminator, 'reconfigure',
+                        lambda changed=None: calls.append(changed))
+    terminator.calls = calls
+    terminator.config_snapshot = terminator.snapshot_config()
+    yield terminator
+    del(terminator.calls)
+
+
+def test_changed_key_is_reapplied(terminator):
+    """Only the key which was changed is passed on"""
+    from terminatorlib.config import Config
+
+    config = Config()
+    scrollback = config['scrollback_lines']
+    config['scrollback_lines'] = scrollback + 1
+    try:
+        terminator.do_deferred_reconfigure()
+    finally:
+        config['scrollback_lines'] = scrollback
+
+    assert terminator.calls == [{'default': set(['scrollback_lines'])}]
+
+
+def test_unchanged_config_is_skipped(terminator):
+    """A reconfigure with nothing changed doesn't reconfigure anything"""
+    terminator.do_deferred_reconfigure()
+
+    assert terminator.calls == []
+
+
+def test_key_set_to_same_value_is_skipped(terminator):
+    """Setting a key to the value it already has changes nothing"""
+    from terminatorlib.config import Config
+
+    config = Config()
+    config['scrollback_lines'] = config['scrollback_lines']
+    terminator.do_deferred_reconfigure()
+
+    assert terminator.calls == []
+
+
+def test_forced_reconfigure_reapplies_everything(terminator):
+    """A forced reconfigure reapplies every key"""
+    terminator.forced_reconfigure = True
+    terminator.do_deferred_reconfigure()
+
+    assert terminator.calls == [None]
+    assert not terminator.forced_reconfigure
@@ -26,6 +26,21 @@ False
 >>> list(widget.signals.values())
 ['test3']
 >>> signalman.remove_widget(widget)
+>>> sorted(signalman.new_batch(widget, {'test4': handler,
+...                                     'test5': [handler, 'arg']}).values())
+[4, 5]
+>>> signalman.census()
+{'TestWidget': 2}
+>>> signalman.remove_signals(widget, ['test4', 'test5'])
+>>> widget in signalman.cnxids
+False
+>>> list(widget.signals.values())
+[]
+>>> signalman.new(widget, 'test6', handler)
+6
+>>> del(widget)
+>>> len(signalman.cnxids)
+0
 >>>
 
 """
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""test_tabplaceholder.py - Test the placeholders used for lazy tabs"""
+
+import uuid
+
+
+class StubNotebook:
+    """The parts of a Notebook that materialise() uses"""
+    def __init__(self, terminator):
+        self.terminator = terminator
+        self.last_active_term = {}
+        self.tabs = []
+
+    def get_child_metadata(self, widget):
+        return({'tabnum': 0})
+
+    def remove(self, widget):
+        self.tabs.remove(widget)
+
+    def newtab(self, widget=None, metadata=None):
+        self.tabs.append(widget)
+
+
+def materialise(notebook, placeholder):
+    """Call Notebook.materialise on a StubNotebook"""
+    from terminatorlib.notebook import Notebook
+
+    method = getattr(Notebook.materialise, '__func__', Notebook.materialise)
+    return(method(notebook, placeholder))
+
+
+def test_layout_without_uuid():
+    """A placeholder for a hand written layout, which has no UUIDs, still
+    has a UUID and saves it"""
+    from terminatorlib.tabplaceholder import TabPlaceholder
+
+    placeholder = TabPlaceholder({'type': 'Terminal', 'profile': 'default'})
+    assert isinstance(placeholder.uuid, uuid.UUID)
+
+    layout = {}
+    assert placeholder.describe_layout(0, 'child0', layout, 1) == 1
+    assert layout['terminal0']['uuid'] == placeholder.uuid
+    assert layout['terminal0']['parent'] == 'child0'
+    assert layout['terminal0']['profile'] == 'default'
+
+
+def test_layout_with_uuid():
+    """A placeholder keeps the UUID from its layout"""
+    from terminatorlib.tabplaceholder import TabPlaceholder
+
+    urn = 'urn:uuid:2a4c6e80-1b3d-4f5a-8c7e-9d0f1a2b3c4d'
+    placeholder = TabPlaceholder({'type': 'Terminal', 'uuid': urn})
+    assert placeholder.uuid.urn == urn
+
+
+def test_materialise_layout_without_uuid(monkeypatch):
+    """The Terminal made for a placeholder takes its UUID and last active
+    entry, and can be found by that UUID"""
+    from terminatorlib.tabplaceholder import TabPlaceholder
+    from terminatorlib.terminal import Terminal
+    from terminatorlib.terminator import Terminator
+
+    spawned = []
+    monkeypatch.setattr(Terminal, 'spawn_child',
+                        lambda self, *args, **kwargs: spawned.append(self))
+    terminator = Terminator()
+    notebook = StubNotebook(terminator)
+    placeholder = TabPlaceholder({'type': 'Terminal'})
+    notebook.tabs.append(placeholder)
+    notebook.last_active_term[placeholder] = placeholder.uuid
+
+    terminal = materialise(notebook, placeholder)
+    try:
+        assert terminal.uuid == placeholder.uuid
+        assert notebook.tabs == [terminal]
+        assert notebook.last_active_term == {terminal: placeholder.uuid}
+        assert spawned == [terminal]
+        assert terminator.find_terminal_by_uuid(placeholder.uuid.urn) \
+            is terminal
+    finally:
+        terminator.deregister_terminal(terminal)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# Terminator by Chris Jones <cmsj@tenshu.net>
+# GPL v2 only
+"""test_wind_layout.py - Test winding a flat layout into a hierarchy"""
+
+
+def test_objects_are_wound_under_their_parents():
+    """Objects end up under their parents, in any order in the layout"""
+    from terminatorlib.terminator import wind_layout
+
+    layout = {'terminal2': {'type': 'Terminal', 'parent': 'child1',
+                            'order': 1},
+              'child1': {'type': 'HPaned', 'parent': 'window0'},
+              'terminal1': {'type': 'Terminal', 'parent': 'child1',
+                            'order': 0, 'profile': 'default'},
+              'window0': {'type': 'Window', 'parent': '', 'size': [80, 24]}}
+    hierarchy, orphans = wind_layout(layout)
+
+    assert orphans == {}
+    assert list(hierarchy.keys()) == ['window0']
+    window = hierarchy['window0']
+    assert window['type'] == 'Window'
+    assert window['size'] == [80, 24]
+    # Empty values are not copied to windows
+    assert 'parent' not in window
+    paned = window['children']['child1']
+    assert paned['type'] == 'HPaned'
+    assert sorted(paned['children'].keys()) == ['terminal1', 'terminal2']
+    assert paned['children']['terminal1']['profile'] == 'default'
+    assert paned['children']['terminal1']['children'] == {}
+
+
+def test_several_windows():
+    """Each window gets its own children"""
+    from terminatorlib.terminator import wind_layout
+
+    layout = {'window0': {'type': 'Window', 'parent': ''},
+              'window1': {'type': 'Window', 'parent': ''},
+              'terminal0': {'type': 'Terminal', 'parent': 'window0'},
+              'terminal1': {'type': 'Terminal', 'parent': 'window1'}}
+    hierarchy, orphans = wind_layout(layout)
+
+    assert orphans == {}
+    assert list(hierarchy['window0']['children'].keys()) == ['terminal0']
+    assert list(hierarchy['window1']['children'].keys()) == ['terminal1']
+
+
+def test_objects_with_missing_parents_are_reported():
+    """Objects whose parent doesn't exist are returned, not dropped"""
+    from terminatorlib.terminator import wind_layout
+
+    layout = {'window0': {'type': 'Window', 'parent': ''},
+              'terminal0': {'type': 'Terminal', 'parent': 'window0'},
+              'terminal1': {'type': 'Terminal', 'parent': 'child9'},
+              'terminal2': {'type': 'Terminal'}}
+    hierarchy, orphans = wind_layout(layout)
+
+    assert orphans == {'child9': ['terminal1']}
+    assert list(hierarchy['window0']['children'].keys()) == ['terminal0']
+
+
+def test_deep_layout():
+    """A deep chain of panes is wound without rescanning the layout"""
+    from terminatorlib.terminator import wind_layout
+
+    depth = 2000
+    layout = {'window0': {'type': 'Window', 'parent': ''}}
+    parent = 'window0'
+    for index in range(depth):
+        layout['child%d' % index] = {'type': 'VPaned', 'parent': parent}
+        parent = 'child%d' % index
+    hierarchy, orphans = wind_layout(layout)
+
+    assert orphans == {}
+    node = hierarchy['window0']
+    for index in range(depth):
+        node = node['children']['child%d' % index]
+    assert node['children'] == {}